@@ -0,0 +1,55 @@
+"""Cost of the list/tuple extensions of :mod:`fatools.core_ext.builtin` on
+large lists.
+
+Times `uniq`, `group_by` (sorted and with ``sort=False``), `pluck` and
+`sorted_by` over lists of records similar to residues, one million elements
+by default.
+
+Usage: python benchmarks/bench_builtin.py [size]
+"""
+
+from __future__ import print_function
+
+import random
+import sys
+import timeit
+from collections import namedtuple
+
+from fatools.core_ext import builtin
+
+builtin.extend_list()
+
+Record = namedtuple('Record', 'chain resnum name')
+
+NAMES = ('ALA', 'ASP', 'GLU', 'GLY', 'LYS', 'PHE', 'SER', 'TYR')
+
+
+def make_records(size, seed=0):
+    rnd = random.Random(seed)
+    return [Record(rnd.choice('ABCD'), rnd.randint(1, size // 10 or 1),
+                   rnd.choice(NAMES))
+            for _ in range(size)]
+
+
+def bench(func, repeat=3):
+    return min(timeit.repeat(func, repeat=repeat, number=1))
+
+
+def main(size=1000000):
+    records = make_records(size)
+    resnums = [record.resnum for record in records]
+    cases = (
+        ('uniq', lambda: resnums.uniq()),
+        ('group_by', lambda: records.group_by('chain')),
+        ('group_by sort=False', lambda: records.group_by('chain', sort=False)),
+        ('pluck', lambda: records.pluck('resnum')),
+        ('sorted_by', lambda: records.sorted_by('chain', 'resnum')),
+    )
+    print('{} elements'.format(size))
+    print('{:<20} {:>10}'.format('operation', 'time'))
+    for name, func in cases:
+        print('{:<20} {:>8.3f} s'.format(name, bench(func)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""Per-call cost of the memoized inflection functions.
+
+Compares the cached functions in :mod:`fatools.utils.inflection` against the
+original (uncached) implementations, exposed as ``__wrapped__``, over a small
+vocabulary similar to the one found in Macromodel energy terms and atom
+collection attributes.
+
+Usage: python benchmarks/bench_inflection.py [number]
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+from fatools.utils import inflection
+
+VOCABULARY = (
+    'Stretch', 'Bend', 'Torsion', 'Improper Torsion', 'Van der Waals',
+    'Electrostatic', 'Explicit Hydrogen Bonds', 'Solvation SA',
+    'Solvation GB', 'Total Energy', 'resnums', 'pdbnames', 'indexes',
+    'elements', 'chains', 'InteractionEnergyResult')
+
+FUNCTIONS = ('underscore', 'singularize', 'pluralize', 'camelize', 'titleize')
+
+
+def bench(func, number):
+    words = VOCABULARY
+    timer = timeit.Timer(lambda: [func(word) for word in words])
+    best = min(timer.repeat(repeat=3, number=number))
+    return best / (number * len(words)) * 1e6  # usec per call
+
+
+def main(number=2000):
+    print('{:<12} {:>12} {:>12} {:>8}'.format(
+        'function', 'uncached', 'cached', 'speedup'))
+    for name in FUNCTIONS:
+        func = getattr(inflection, name)
+        uncached = bench(func.__wrapped__, number)
+        cached = bench(func, number)
+        print('{:<12} {:>9.2f} us {:>9.2f} us {:>7.1f}x'.format(
+            name, uncached, cached, uncached / cached))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
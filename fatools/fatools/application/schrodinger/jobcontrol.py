@@ -1,9 +1,12 @@
+import abc
+import csv
 import glob
 import logging
 import os
 import StringIO
+from collections import OrderedDict
 
-from schrodinger.job.queue import JobControlJob, JobDJ, NOLIMIT
+from schrodinger.job.queue import JobControlJob, JobDJ, NOLIMIT, SubprocessJob
 from fatools.jobcontrol import Job, JobQueue, JobStatus
 from fatools.utils.func import update_dict
 from fatools.utils.kernel import redirect_stream
@@ -11,6 +14,9 @@ from fatools.utils.kernel import redirect_stream
 logging.disable(logging.ERROR)  # avoids message printed by JodDJ
 _null_stream = StringIO.StringIO()  # used to redirect JobDJ undesired output
 
+# errors of reading a missing, truncated or malformed job output
+JOB_OUTPUT_ERRORS = (EnvironmentError, csv.Error, KeyError, ValueError)
+
 
 class SchrodingerJob(Job):
     def _clean_failed_output(self):
@@ -20,7 +26,7 @@ class SchrodingerJob(Job):
 
     def _update(self):
         """Force update from internal JobDJ job object."""
-        self.id = self._dj_job._job_id
+        self.id = getattr(self._dj_job, '_job_id', None) or ''
         if self._dj_job.state == 'active':
             self._state = JobStatus.started
         elif self._dj_job.state == 'done':
@@ -55,7 +61,60 @@ class SchrodingerJobQueue(JobQueue):
             hosts=[('localhost', self.max_simultaneous_jobs)],
             max_failures=NOLIMIT)  # avoids stop on job failure
         for job in self.jobs:
-            dj_job = JobControlJob(list(job.cmd.args))
+            if getattr(job.cmd, 'uses_jobcontrol', True):
+                dj_job = JobControlJob(list(job.cmd.args))
+            else:  # plain scripts are run as subprocesses
+                dj_job = SubprocessJob(list(job.cmd.args))
             dj_job._wrapper = job
             job._dj_job = dj_job
             self.job_dj.addJob(dj_job)
+
+
+class SchrodingerJobRunner(object):
+    """Run one job per input file through a :class:`SchrodingerJobQueue`.
+
+    Subclasses create the command for each input file and read the output of
+    every job as soon as it finishes, so results are available while the
+    remaining jobs are still running.
+
+    A job whose output cannot be read (see `JOB_OUTPUT_ERRORS`) does not
+    halt the others; the error is kept in `failed_outputs` by job name, so
+    callers can check it once `run` returns.
+
+    """
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, files, cpu=1, cpu_per_job=1, jobname=None,
+                 notify=None, recipient=None):
+        self.files = tuple(files)
+        self.cpu, self.cpu_per_job = cpu, cpu_per_job
+        self.jobname = jobname or self.__class__.__name__
+        self._notify, self._recipient = notify, recipient
+        self.failed_outputs = OrderedDict()
+
+    def run(self):
+        """Run all jobs and wait for them to finish."""
+        queue = SchrodingerJobQueue(
+            self.jobname, self.cpu, self.cpu_per_job,
+            notify=self._notify, recipient=self._recipient,
+            on_job_done=self._handle_job_done)
+        for filepath in self.files:
+            cmd = self._create_cmd(filepath)
+            if cmd is not None:  # None means nothing to be done for the file
+                queue.add_job(cmd)
+        if queue.njobs > 0:
+            queue.run_and_wait()
+
+    @abc.abstractmethod
+    def _create_cmd(self, filepath):
+        return NotImplemented
+
+    def _handle_job_done(self, job):
+        try:
+            self._read_job_output(job)
+        except JOB_OUTPUT_ERRORS as err:  # do not halt the queue
+            self.failed_outputs[job.name] = err
+
+    @abc.abstractmethod
+    def _read_job_output(self, job):
+        return NotImplemented
@@ -1,8 +1,11 @@
 from schrodinger import structure
-from schrodinger.structutils import analyze
 from schrodinger.application.macromodel.utils import SbcUtil
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.asl import evaluate_asl
 from fatools.application.schrodinger.macromodel.input import (
-    ConfSearchInput, EmbraceMinimizationInput, EnergyInput, RRHOEntropy)
+    ConfSearchInput, EmbraceMinimizationInput, EnergyInput)
+from fatools.application.schrodinger.macromodel.RRHO.runner import (
+    RRHOEntropyRunner)
 
 from fatools.application.schrodinger.macromodel.output import (
     EnergyListingResult, InteractionEnergyResult)
@@ -32,12 +35,12 @@ class MmodMMGBSA():
             self.write_mbae_files(f)
         return(self.joblist_mbaemini, self.joblist_confsearch, self.readfiles, self.poseviewer_files)
 
-    def calculate_entropyRRHO(self):
-        for poseviewer in self.poseviewer_files:
-            print(poseviewer)
-            entropy = RRHOEntropy(poseviewer)
-            entropy.run()
-            entropy.read_outfiles()
+    def calculate_entropyRRHO(self, cpu=1, outfile='RRHO_scoring_terms.csv',
+                              cache=None):
+        runner = RRHOEntropyRunner(
+            self.poseviewer_files, cpu=cpu, radius=self.radius,
+            outfile=outfile, cache=cache)
+        return runner.run()
 
     def calculate_scoring_function(self, readfile_list):
         job_energy = self._launchComFile(self.energy_listing)
@@ -106,7 +109,7 @@ class MmodMMGBSA():
         for st in reader:
             title = st.title
             name = title.split('_')[0]
-            indices = analyze.evaluate_asl(st, '(ligand)')
+            indices = evaluate_asl(st, '(ligand)')
             ligand = st.extract(indices, True)
             ligand._setTitle(name + '_ligand')
             writer.append(ligand)
@@ -133,22 +136,22 @@ class MmodMMGBSA():
         reader = structure.StructureReader(infile)
         for st in reader:
             struc = (st.title).split("_")
-            protein_atoms = analyze.evaluate_asl(st, "protein")
+            protein_atoms = evaluate_asl(st, "protein")
             protein = st.extract(protein_atoms)
             protein._setTitle(struc[0] + '_protein')
-            metal_atoms = analyze.evaluate_asl(st, "metals")
+            metal_atoms = evaluate_asl(st, "metals")
             if (metal_atoms):
                 metals = st.extract(metal_atoms)
                 protein = protein.merge(metals)
                 protein._setTitle(struc[0] + '_protein')
 
-            water_molecules = analyze.evaluate_asl(st, "water")
+            water_molecules = evaluate_asl(st, "water")
             if (water_molecules):
                 water = st.extract(water_molecules)
                 protein = protein.merge(water)
                 protein._setTitle(struc[0] + '_protein')
 
-            indices = analyze.evaluate_asl(st, '(ligand)')
+            indices = evaluate_asl(st, '(ligand)')
             ligand = st.extract(indices, True)
             ligand._setTitle(struc[0] + '_ligand')
             mae_infile = struc[0] + '.mae'
@@ -182,10 +185,13 @@ class MmodMMGBSA():
         print("Ligando mas grande: ", largest_lig_st)
         st = st.merge(largest_lig_st)
 
-        binding_site_atoms = analyze.evaluate_asl(
-            st, "fillres (all and within %s ligand) and not ligand" % self.radius)
-        nearby_atoms = analyze.evaluate_asl(
-            st, "not (ligand or fillres (all and within %s ligand))" % (self.radius))
+        # both shells derive from the same two selections
+        ligand_atoms = set(evaluate_asl(st, "ligand"))
+        shell_atoms = set(get_structure_arrays(st).within(
+            ligand_atoms, self.radius, fillres=True).tolist())
+        binding_site_atoms = sorted(shell_atoms - ligand_atoms)
+        nearby_atoms = sorted(set(range(1, st.atom_total + 1)) -
+                              ligand_atoms - shell_atoms)
         # nearby_atoms = analyze.evaluate_asl(
         #     st, "not (ligand or fillres (all and within %s ligand)) and fillres within %s ligand" % (radius, radius*4))
         name_file = infile.split('.')
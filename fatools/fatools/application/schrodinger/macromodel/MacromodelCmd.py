@@ -30,6 +30,9 @@ class MacromodelWithInputCmd(MacromodelCmd, CmdWithInputFiles):
 class PrimeMMGBSAWithInputCmd(PrimeMMGBSACmd, CmdWithInputFiles):
     jobname = CmdOption('-jobname', type=str, allow_none=True)
     host = CpuHostOption('-rflexdist 1')
+    flexdist = CmdOption('-flexdist', allow_none=True, greater_than=0)
+    njobs = CmdOption('-NJOBS', allow_none=True, only_integer=True,
+                      greater_than=0)
 
     def _after_initialize(self):
         if self.jobname is None:
@@ -47,3 +50,40 @@ class RunMacromodelCmd(MacromodelWithInputCmd):
 
 class RunPrimeMMGBSA(PrimeMMGBSAWithInputCmd):
     program = 'prime_mmgbsa'
+
+
+class RunRRHOEntropyCmd(CmdWithInputFiles):
+    """Calculate RRHO entropy terms through ``rrho_entropy.py``.
+
+    The script is not a job control program, so it is launched as a plain
+    subprocess (see :attr:`uses_jobcontrol`).
+
+    """
+    csv = CmdOption('-csv', type=str, allow_none=True)
+    radius = CmdOption('-r', allow_none=True, greater_than=0)
+
+    jobname = property(lambda self: os.path.splitext(self.filenames[0])[0])
+    program = property(lambda self: ' '.join(self._program_args))
+    uses_jobcontrol = False
+
+    @property
+    def args(self):
+        # built as a list, since paths may contain whitespace
+        args = list(self._program_args)
+        for name in self._sorted_fields():
+            alias, value = self._fields[name].alias, getattr(self, name)
+            if value is None or value is False:
+                continue
+            args.append(alias)
+            if value is not True:
+                args.append(self._format_option_value(name, value))
+        return args + list(self.input_files)
+
+    @property
+    def _program_args(self):
+        run = os.path.join(os.environ.get('SCHRODINGER', ''), 'run')
+        return [run, 'rrho_entropy.py']
+
+    def _after_initialize(self):
+        if self.csv is None:
+            self.csv = self.jobname + '_entropyRRHO.csv'
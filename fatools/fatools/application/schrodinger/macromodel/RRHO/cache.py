@@ -0,0 +1,156 @@
+"""Content-addressed cache of RRHO entropy results.
+
+Results are keyed by a canonical hash of the atomic elements, formal charges,
+coordinates and bonds (with their orders) of the input structures plus the
+radius passed to ``rrho_entropy.py`` (``-r`` option), so identical poses are
+never calculated twice, regardless of their file or title. Only the entropy
+terms are cached, results are reported under the titles of the structures
+being looked up. The cache can be persisted as a JSON file.
+"""
+
+import hashlib
+import json
+import os
+
+from fatools.application.schrodinger.macromodel.output import (
+    RRHO_ENTROPY_TERMS, RRHOEntropyResult)
+from schrodinger.structure import StructureReader
+
+RRHO_CACHE_COORD_PRECISION = 3  # decimal places
+
+
+def hash_coordinates(elements, coordinates, radius=None,
+                     precision=RRHO_CACHE_COORD_PRECISION,
+                     formal_charges=None, bonds=None):
+    """Return a canonical hash for the given atoms and radius.
+
+    Coordinates are rounded to `precision` decimal places, thus differences
+    due to file formatting are ignored. Bonds are hashed regardless of
+    their order or direction.
+
+    Parameters
+    ----------
+    elements : sequence of str
+        Element symbol of each atom.
+    coordinates : sequence of (float, float, float)
+        Cartesian coordinates of each atom.
+    radius : float, optional
+        Radius of the flexible region. Defaults to None (not given).
+    formal_charges : sequence of int, optional
+        Formal charge of each atom.
+    bonds : sequence of (int, int, int), optional
+        Atom indexes and order of each bond.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-1 digest.
+
+    """
+    digest = hashlib.sha1('radius={}\n'.format(_canonical_number(radius)))
+    _update_digest(digest, elements, coordinates, precision, formal_charges,
+                   bonds)
+    return digest.hexdigest()
+
+
+def hash_structure_file(filepath, radius=None,
+                        precision=RRHO_CACHE_COORD_PRECISION):
+    """Return a canonical hash for all the structures in the given file."""
+    return hash_structures(StructureReader(filepath), radius, precision)
+
+
+def hash_structures(structures, radius=None,
+                    precision=RRHO_CACHE_COORD_PRECISION):
+    """Return a canonical hash for all the given structures."""
+    digest = hashlib.sha1('radius={}\n'.format(_canonical_number(radius)))
+    for st in structures:
+        atoms = list(st.atom)
+        _update_digest(
+            digest, [atom.element for atom in atoms], st.getXYZ(), precision,
+            [atom.formal_charge for atom in atoms],
+            [(bond.atom1.index, bond.atom2.index, bond.order)
+             for bond in st.bond])
+    return digest.hexdigest()
+
+
+class RRHOEntropyCache(object):
+    """Map structure hashes to RRHO entropy results.
+
+    Parameters
+    ----------
+    filepath : str, optional
+        JSON file where the cache is persisted. It is read on creation if it
+        exists. Defaults to None (in-memory cache).
+
+    """
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self._entries = dict()
+        if filepath is not None and os.path.isfile(filepath):
+            with open(filepath) as f:
+                self._entries = json.load(f)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, titles):
+        """Return the cached results for `key` or None if missing.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the structures.
+        titles : sequence of str
+            Titles of the structures, which name the results.
+
+        """
+        rows = self._entries.get(key)
+        if rows is None or len(rows) != len(titles):
+            return None
+        return tuple(RRHOEntropyResult(title,
+                                       *[row[t] for t in RRHO_ENTROPY_TERMS])
+                     for title, row in zip(titles, rows))
+
+    def put(self, key, results):
+        """Store the results calculated for the structures under `key`."""
+        self._entries[key] = [
+            dict(zip(RRHO_ENTROPY_TERMS,
+                     (r.ts_translation, r.ts_rotation, r.ts_vibration,
+                      r.ts_total)))
+            for r in results]
+
+    def save(self):
+        if self.filepath is None:
+            return
+        tmpfile = self.filepath + '.tmp'
+        with open(tmpfile, 'w') as f:
+            json.dump(self._entries, f, indent=1, sort_keys=True)
+        os.rename(tmpfile, self.filepath)  # do not leave a truncated cache
+
+
+def _canonical_number(value, precision=RRHO_CACHE_COORD_PRECISION):
+    if value is None:
+        return 'none'
+    text = '{:.{}f}'.format(float(value), precision)
+    if text.startswith('-') and text.lstrip('-0.') == '':
+        text = text[1:]  # -0.000 -> 0.000
+    return text
+
+
+def _update_digest(digest, elements, coordinates, precision,
+                   formal_charges=None, bonds=None):
+    digest.update('natoms={}\n'.format(len(elements)))
+    for element, xyz in zip(elements, coordinates):
+        digest.update('{} {}\n'.format(element.strip(), ' '.join(
+            _canonical_number(x, precision) for x in xyz)))
+    if formal_charges is not None:
+        digest.update('charges={}\n'.format(
+            ' '.join(str(int(charge)) for charge in formal_charges)))
+    if bonds is not None:
+        bonds = sorted((min(i, j), max(i, j), int(order))
+                       for i, j, order in bonds)
+        digest.update('bonds={}\n'.format(
+            ' '.join('{}-{}:{}'.format(*bond) for bond in bonds)))
@@ -0,0 +1,114 @@
+"""Calculate RRHO entropy terms of several structures in parallel.
+
+Each input file is processed by ``rrho_entropy.py`` as an independent job of
+a :class:`SchrodingerJobQueue`, running as many of them simultaneously as
+the available cpus allow. Results of each job are added to a
+:class:`RRHOEntropyTable` as soon as it finishes.
+
+If a :class:`RRHOEntropyCache` is given, structures that were already
+calculated with the same radius are not submitted; their cached results are
+added to the table instead.
+"""
+
+import csv
+
+from fatools.application.schrodinger.jobcontrol import SchrodingerJobRunner
+from fatools.application.schrodinger.macromodel.MacromodelCmd import (
+    RunRRHOEntropyCmd)
+from fatools.application.schrodinger.macromodel.output import (
+    RRHO_ENTROPY_TERMS, read_rrho_entropy_csv)
+from fatools.application.schrodinger.macromodel.RRHO.cache import (
+    hash_structures)
+from schrodinger.structure import StructureReader
+
+
+class RRHOEntropyTable(object):
+    """Collect RRHO entropy results, optionally streaming them to a file.
+
+    If `outfile` is given, a CSV row is written (and flushed) for every
+    added result, so partial results are kept even if the run is halted.
+
+    """
+    headers = ('title',) + tuple(term.lower() for term in RRHO_ENTROPY_TERMS)
+
+    def __init__(self, outfile=None):
+        self._results = []
+        self._stream = None
+        if outfile is not None:
+            self._stream = open(outfile, 'wb')
+            self._csvwriter = csv.writer(self._stream)
+            self._csvwriter.writerow(self.headers)
+
+    def __getitem__(self, item):
+        return self._results[item]
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __len__(self):
+        return len(self._results)
+
+    def append(self, result):
+        self._results.append(result)
+        if self._stream is not None:
+            self._csvwriter.writerow(RRHOEntropyTable.row_for(result))
+            self._stream.flush()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def rows(self):
+        return tuple(RRHOEntropyTable.row_for(result)
+                     for result in self._results)
+
+    @staticmethod
+    def row_for(result):
+        return (result.name, result.ts_translation, result.ts_rotation,
+                result.ts_vibration, result.ts_total)
+
+
+class RRHOEntropyRunner(SchrodingerJobRunner):
+    def __init__(self, files, cpu=1, radius=None, outfile=None, cache=None,
+                 jobname='rrho-entropy', notify=None, recipient=None):
+        super(RRHOEntropyRunner, self).__init__(
+            files, cpu, 1, jobname, notify, recipient)
+        self.radius = radius
+        self.outfile = outfile
+        self.cache = cache
+        self._cache_keys = dict()  # jobname -> cache key
+
+    def run(self):
+        """Run all jobs, wait for them and return the results table."""
+        self.table = RRHOEntropyTable(self.outfile)
+        try:
+            super(RRHOEntropyRunner, self).run()
+        finally:
+            self.table.close()
+            if self.cache is not None:
+                self.cache.save()
+        return self.table
+
+    def _create_cmd(self, filepath):
+        cmd = RunRRHOEntropyCmd(filepath, radius=self.radius)
+        if self.cache is not None:
+            structures = list(StructureReader(filepath))
+            key = hash_structures(structures, self.radius)
+            cached_results = self.cache.get(
+                key, [st.title for st in structures])
+            if cached_results is not None:
+                self.table.extend(cached_results)
+                return None
+            self._cache_keys[cmd.jobname] = key
+        return cmd
+
+    def _read_job_output(self, job):
+        results = read_rrho_entropy_csv(job.cmd.csv)
+        if job.name in self._cache_keys:
+            self.cache.put(self._cache_keys[job.name], results)
+        self.table.extend(results)
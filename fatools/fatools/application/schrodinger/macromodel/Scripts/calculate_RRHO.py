@@ -1,48 +1,54 @@
-# import sys
-# sys.path.append('/home/luis/Desktop/FranciscoAdasme/fatools')
-# from fatools.application.schrodinger.macromodel.Scripts.RRHO import (
-# RRHOEntropy)
-from RRHO import RRHOEntropy
+"""Calculate RRHO entropy terms for every .mae file in the cwd.
+
+Usage: $SCHRODINGER/run calculate_RRHO.py [-cpu COUNT] [-r RADIUS]
+                                          [-cache FILE]
+"""
+
+from __future__ import print_function
+
+import argparse
 import glob
-import os
-import csv
-
-
-poseviewer_files = list()
-directory = os.getcwd()
-# os.chdir("/home/luis/Desktop/FranciscoAdasme/fatools/fatools/application/schrodinger/macromodel/Scripts")
-os.chdir(directory)
-for file in glob.glob("*.mae"):
-    poseviewer_files.append(file)
-poseviewer_files.sort()
-print("poseviewer_files : ", poseviewer_files)
-
-
-def write_csvfile(title, tds_trans, tds_rot, tds_vib, tds_total):
-    with open('RRHO_scoring_terms.csv', 'a+') as csvfile:
-        spamwriter = csv.writer(
-            csvfile, delimiter=' ',
-            quotechar='|',
-            quoting=csv.QUOTE_MINIMAL)
-        spamwriter.writerow([title, tds_trans, tds_rot, tds_vib, tds_total])
-
-
-def write_csvfile_title():
-    with open('RRHO_scoring_terms.csv', 'w') as csvfile:
-        spamwriter = csv.writer(
-            csvfile, delimiter=' ',
-            quotechar='|',
-            quoting=csv.QUOTE_MINIMAL)
-        spamwriter.writerow(
-            ['title', 'tds_trans', 'tds_rot', 'tds_vib', 'tds_total'])
-
-write_csvfile_title()
-for f in poseviewer_files:
-    print f
-    rrho = RRHOEntropy(f, radius=7)
-    rrho.run()
-    rrho.read_outfile()
-    print('Title: ', rrho.title)
-    write_csvfile(
-        rrho.title, rrho.tds_trans, rrho.tds_rot, rrho.tds_vib, rrho.tds_total)
-print('All jobs complete [Ok]')
+import sys
+
+from fatools.application.schrodinger.macromodel.RRHO.cache import (
+    RRHOEntropyCache)
+from fatools.application.schrodinger.macromodel.RRHO.runner import (
+    RRHOEntropyRunner)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-cpu', metavar='COUNT', type=int, default=1,
+        help='Number of structures processed simultaneously (%(default)s).')
+    parser.add_argument(
+        '-r', dest='radius', type=float, default=7,
+        help='Radius of the flexible region around the ligand '
+             '(%(default)s).')
+    parser.add_argument(
+        '-o', dest='outfile', default='RRHO_scoring_terms.csv',
+        help='Output CSV file (%(default)s).')
+    parser.add_argument(
+        '-cache', metavar='FILE', dest='cache',
+        help='JSON file where calculated results are cached. Structures '
+             'already found in the cache (same elements, formal charges, '
+             'bonds and coordinates, and same radius) are not calculated '
+             'again. Disabled by default.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    opts = parse_args()
+    poseviewer_files = sorted(glob.glob('*.mae'))
+    print('poseviewer_files : ', poseviewer_files)
+
+    cache = RRHOEntropyCache(opts.cache) if opts.cache is not None else None
+    runner = RRHOEntropyRunner(poseviewer_files, cpu=opts.cpu,
+                               radius=opts.radius, outfile=opts.outfile,
+                               cache=cache)
+    table = runner.run()
+    for jobname, err in runner.failed_outputs.items():
+        print('Cannot read output of job {}: {}'.format(jobname, err),
+              file=sys.stderr)
+    print('All jobs complete [Ok]: {} result(s) written to {}'.format(
+        len(table), opts.outfile))
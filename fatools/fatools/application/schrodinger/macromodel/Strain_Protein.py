@@ -3,6 +3,7 @@ from schrodinger.structutils import analyze
 from schrodinger.application.macromodel.utils import SbcUtil
 from fatools.application.schrodinger.macromodel.input import (
     EmbraceMinimizationInput, EnergyInput)
+from fatools.structutils.arrays import get_structure_arrays
 
 from fatools.application.schrodinger.macromodel.output import (
     InteractionEnergyResult, EnergyListingProteinResult)
@@ -145,10 +146,12 @@ class StrainProtein():
                 largest_lig_st = lig_st
         st = st.merge(largest_lig_st)
 
-        binding_site_atoms = analyze.evaluate_asl(
-            st, "fillres (all and within %s ligand) and not ligand" % radius)
-        nearby_atoms = analyze.evaluate_asl(
-            st, "not (ligand or fillres (all and within %s ligand))" % (radius))
+        ligand_atoms = set(analyze.evaluate_asl(st, "ligand"))
+        shell_atoms = set(get_structure_arrays(st).within(
+            ligand_atoms, radius, fillres=True).tolist())
+        binding_site_atoms = sorted(shell_atoms - ligand_atoms)
+        nearby_atoms = sorted(set(range(1, st.atom_total + 1)) -
+                              ligand_atoms - shell_atoms)
         # nearby_atoms = analyze.evaluate_asl(
         #     st, "not (ligand or fillres (all and within %s ligand)) and fillres within %s ligand" % (radius, radius*4))
         name_file = infile.split('.')
@@ -172,10 +175,12 @@ class StrainProtein():
                 largest_lig_st = lig_st
         st = st.merge(largest_lig_st)
 
-        binding_site_atoms = analyze.evaluate_asl(
-            st, "fillres (all and within %s ligand) and not ligand" % radius)
-        nearby_atoms = analyze.evaluate_asl(
-            st, "not (ligand or fillres (all and within %s ligand))" % (radius))
+        ligand_atoms = set(analyze.evaluate_asl(st, "ligand"))
+        shell_atoms = set(get_structure_arrays(st).within(
+            ligand_atoms, radius, fillres=True).tolist())
+        binding_site_atoms = sorted(shell_atoms - ligand_atoms)
+        nearby_atoms = sorted(set(range(1, st.atom_total + 1)) -
+                              ligand_atoms - shell_atoms)
         # nearby_atoms = analyze.evaluate_asl(
         #     st, "not (ligand or fillres (all and within %s ligand)) and fillres within %s ligand" % (radius, radius*4))
         name_file = infile.split('.')
@@ -1,5 +1,4 @@
 import os
-from subprocess import call
 
 from fatools.utils.func import update_dict
 from fatools.utils.schemable import FieldInfo, Schema
@@ -108,20 +107,6 @@ class EnergyInput(MacromodelInput):
         super(EnergyInput, self).__init__(**kwargs)
 
 
-class RRHOEntropy:
-
-    def __init__(self, infile, out_cvsfile=None, radius=None):
-        if(out_cvsfile is None):
-            self.out_cvsfile = os.path.splitext(infile)[0] + '_entropyRRHO.csv'
-        self.command = "$SCHRODINGER/run rrho_entropy.py {} -csv {}".format(
-            infile, self.out_cvsfile)
-        if(radius is not None):
-            r = " -r {}".format(str(radius))
-            self.command = self.command + r
-
-    def run(self):
-        call(self.command, shell=True)
-
 # ifile = EnergyInput(use_substructure_file=False)
 # ifile.write(in_file='input.in', maefile='1SQA.mae', outfile='salida.mae')
 
@@ -334,6 +334,19 @@ class RRHOEntropyResult(Parseable):
         return RRHOEntropyParser(cls)
 
 
+RRHO_ENTROPY_TERMS = ('TdS_trans', 'TdS_rot', 'TdS_vib', 'TdS_total')
+
+
+def read_rrho_entropy_csv(csv_file):
+    """Return one RRHOEntropyResult per structure listed in the csv file."""
+    with open(csv_file, 'rb') as csvfile:
+        return tuple(
+            RRHOEntropyResult(
+                row['Title'],
+                *[float(row[term]) for term in RRHO_ENTROPY_TERMS])
+            for row in csv.DictReader(csvfile))
+
+
 class RRHOEntropyParser(TextParser):
 
     def construct(self, ligands):
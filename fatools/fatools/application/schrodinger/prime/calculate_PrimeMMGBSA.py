@@ -1,48 +1,46 @@
-# import sys
-# sys.path.append('/home/luis/Desktop/FranciscoAdasme/fatools')
-# from fatools.application.schrodinger.macromodel.Scripts.RRHO import (
-# RRHOEntropy)
-from PrimeMMGBSA import PrimeMMGBSA
+"""Calculate Prime MMGBSA binding energies for every .mae file in the cwd.
+
+Usage: $SCHRODINGER/run calculate_PrimeMMGBSA.py [-cpu COUNT] [-NJOBS COUNT]
+"""
+
+from __future__ import print_function
+
+import argparse
 import glob
-import os
-import csv
-
-
-poseviewer_files = list()
-directory = os.getcwd()
-# os.chdir("/home/luis/Desktop/FranciscoAdasme/fatools/fatools/application/schrodinger/macromodel/Scripts")
-os.chdir(directory)
-for file in glob.glob("*.mae"):
-    poseviewer_files.append(file)
-poseviewer_files.sort()
-print("poseviewer_files : ", poseviewer_files)
-
-
-def write_csvfile(title, strain_protein, strain_ligand, mmgbsa_solvation):
-    with open('PrimeMMGBSA_scoring_terms.csv', 'a+') as csvfile:
-        spamwriter = csv.writer(
-            csvfile, delimiter=' ',
-            quotechar='|',
-            quoting=csv.QUOTE_MINIMAL)
-        spamwriter.writerow([title, strain_protein, strain_ligand, mmgbsa_solvation])
-
-
-def write_csvfile_title():
-    with open('PrimeMMGBSA_scoring_terms.csv', 'w') as csvfile:
-        spamwriter = csv.writer(
-            csvfile, delimiter=' ',
-            quotechar='|',
-            quoting=csv.QUOTE_MINIMAL)
-        spamwriter.writerow(
-            ['title', 'strain_protein', 'strain_ligand', 'mmgbsa_solvation'])
-
-write_csvfile_title()
-for f in poseviewer_files:
-    print f
-    prime = PrimeMMGBSA(f)
-    prime.run_job()
-    prime.read_outfile()
-    print('Title: ', prime.title)
-    write_csvfile(
-        prime.title, prime.strain_protein, prime.strain_ligand, prime.mmgbsa_solvation)
-print('All jobs complete [Ok]')
+import sys
+
+from fatools.application.schrodinger.prime.runner import PrimeMMGBSARunner
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-cpu', metavar='COUNT', type=int, default=1,
+        help='Number of available cores to be used (%(default)s).')
+    parser.add_argument(
+        '-NJOBS', metavar='COUNT', type=int, default=None, dest='njobs',
+        help='Split each multi-pose file into this number of subjobs.')
+    parser.add_argument(
+        '-flexdist', metavar='DIST', type=float, default=7,
+        help='Residues within this distance from the ligand are '
+             'flexible (%(default)s).')
+    parser.add_argument(
+        '-o', dest='outfile', default='PrimeMMGBSA_scoring_terms.csv',
+        help='Output CSV file (%(default)s).')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    opts = parse_args()
+    poseviewer_files = sorted(glob.glob('*.mae'))
+    print('poseviewer_files : ', poseviewer_files)
+
+    runner = PrimeMMGBSARunner(
+        poseviewer_files, cpu=opts.cpu, njobs=opts.njobs,
+        flexdist=opts.flexdist)
+    table = runner.run()
+    table.write_csv(opts.outfile)
+    for jobname, err in runner.failed_outputs.items():
+        print('Cannot read output of job {}: {}'.format(jobname, err),
+              file=sys.stderr)
+    print('{} result(s) written to {}'.format(len(table), opts.outfile))
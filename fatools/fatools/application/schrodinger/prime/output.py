@@ -0,0 +1,145 @@
+"""Parsing of Prime MMGBSA output (``<jobname>-out.csv``) files.
+
+Every ``r_psp_*`` column written by ``prime_mmgbsa`` is ingested and
+converted according to the Maestro property type prefix (``r_`` for real,
+``i_`` for integer, ``b_`` for boolean and ``s_`` for string values).
+"""
+
+import csv
+from collections import OrderedDict
+
+PRIME_MMGBSA_ALIASES = {
+    'r_psp_Rec_Strain_Energy': 'strain_protein',
+    'r_psp_Lig_Strain_Energy': 'strain_ligand',
+    'r_psp_MMGBSA_dG_Bind_Solv_GB': 'mmgbsa_solvation',
+    'r_psp_MMGBSA_dG_Bind': 'mmgbsa_dg_bind'}
+PRIME_MMGBSA_TERM_PREFIX = 'r_psp_'
+
+_PROPERTY_CONVERTERS = dict(
+    b=lambda value: value.strip().lower() in ('1', 'true', 'yes'),
+    i=int,
+    r=float,
+    s=str)
+
+
+def convert_property_value(name, value):
+    """Convert a raw string value according to the Maestro property type.
+
+    Empty values are returned as None, and values of unknown or malformed
+    properties are returned unchanged.
+
+    Examples
+    --------
+    >>> convert_property_value('r_psp_MMGBSA_dG_Bind', '-45.2')
+    -45.2
+    >>> convert_property_value('i_psp_Prime_MMGBSA_ligand_number', '2')
+    2
+    >>> convert_property_value('r_psp_Lig_Strain_Energy', '') is None
+    True
+
+    """
+    if value is None or value.strip() == '':
+        return None
+    converter = _PROPERTY_CONVERTERS.get(name.split('_', 1)[0])
+    if converter is None:
+        return value
+    try:
+        return converter(value)
+    except ValueError:
+        return value
+
+
+class PrimeMMGBSAResult(object):
+    def __init__(self, title, terms):
+        self.title = title
+        self._terms = OrderedDict(terms)
+
+    terms = property(lambda self: self._terms.copy())
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            return super(PrimeMMGBSAResult, self).__getattribute__(name)
+        for term, alias in PRIME_MMGBSA_ALIASES.items():
+            if name == alias:
+                return self._terms.get(term)
+        return super(PrimeMMGBSAResult, self).__getattribute__(name)
+
+    def __getitem__(self, term):
+        return self._terms[term]
+
+    def __repr__(self):
+        return 'PrimeMMGBSAResult({!r})'.format(self.title)
+
+
+class PrimeMMGBSATable(object):
+    """Aggregate Prime MMGBSA results of several jobs into one table.
+
+    Columns are the union of all the ``r_psp_*`` terms found so far in the
+    order they were first seen. Missing values are stored as None.
+
+    """
+    def __init__(self, results=()):
+        self._terms = []
+        self._results = []
+        self.extend(results)
+
+    terms = property(lambda self: tuple(self._terms))
+
+    def __getitem__(self, item):
+        return self._results[item]
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __len__(self):
+        return len(self._results)
+
+    def append(self, result):
+        for term in result.terms:
+            if term not in self._terms:
+                self._terms.append(term)
+        self._results.append(result)
+
+    def column(self, term):
+        """Return the values of the given term for every result."""
+        return tuple(result.terms.get(term) for result in self._results)
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def rows(self):
+        for result in self._results:
+            terms = result.terms
+            yield (result.title,) + tuple(terms.get(term)
+                                          for term in self._terms)
+
+    def write_csv(self, filepath):
+        with open(filepath, 'wb') as csvfile:
+            csvwriter = csv.writer(csvfile)
+            csvwriter.writerow(('title',) + self.terms)
+            for row in self.rows():
+                csvwriter.writerow(['' if value is None else value
+                                    for value in row])
+
+
+def read_prime_mmgbsa_csv(filepath):
+    """Return one :class:`PrimeMMGBSAResult` per row of a ``-out.csv`` file.
+
+    Only the title and the ``r_psp_*`` columns are kept.
+
+    """
+    with open(filepath, 'rb') as csvfile:
+        return parse_prime_mmgbsa_csv(csvfile)
+
+
+def parse_prime_mmgbsa_csv(stream):
+    reader = csv.DictReader(stream)
+    results = []
+    for row in reader:
+        title = row.get('title', row.get('s_m_title', ''))
+        terms = [(name, convert_property_value(name, row[name]))
+                 for name in reader.fieldnames
+                 if name.startswith(PRIME_MMGBSA_TERM_PREFIX)]
+        results.append(PrimeMMGBSAResult(title, terms))
+    return tuple(results)
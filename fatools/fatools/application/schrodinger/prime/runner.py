@@ -0,0 +1,39 @@
+"""Run Prime MMGBSA on several pose files through a job queue.
+
+All input files are submitted at once to a :class:`SchrodingerJobQueue`, so
+as many jobs as the available cpus allow run simultaneously. Multi-pose
+files can be split across several subjobs by ``prime_mmgbsa`` itself via the
+`njobs` argument (``-NJOBS`` option). The ``<jobname>-out.csv`` file of each
+job is read as soon as the job finishes, and its terms are added to a single
+:class:`PrimeMMGBSATable`.
+"""
+
+from fatools.application.schrodinger.jobcontrol import SchrodingerJobRunner
+from fatools.application.schrodinger.macromodel.MacromodelCmd import (
+    RunPrimeMMGBSA)
+from fatools.application.schrodinger.prime.output import (
+    PrimeMMGBSATable, read_prime_mmgbsa_csv)
+
+
+class PrimeMMGBSARunner(SchrodingerJobRunner):
+    def __init__(self, files, cpu=1, njobs=None, flexdist=None,
+                 jobname='prime-mmgbsa', notify=None, recipient=None):
+        # every job runs `njobs` subjobs at once, but at least one job must
+        # fit in the available cpus
+        cpu_per_job = max(1, min(njobs or 1, cpu))
+        super(PrimeMMGBSARunner, self).__init__(
+            files, cpu, cpu_per_job, jobname, notify, recipient)
+        self.njobs, self.flexdist = njobs, flexdist
+        self.table = PrimeMMGBSATable()
+
+    def run(self):
+        """Run all jobs, wait for them and return the aggregated table."""
+        super(PrimeMMGBSARunner, self).run()
+        return self.table
+
+    def _create_cmd(self, filepath):
+        return RunPrimeMMGBSA(filepath, njobs=self.njobs,
+                              flexdist=self.flexdist)
+
+    def _read_job_output(self, job):
+        self.table.extend(read_prime_mmgbsa_csv(job.name + '-out.csv'))
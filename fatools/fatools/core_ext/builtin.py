@@ -1,6 +1,8 @@
-from itertools import groupby
+from itertools import groupby, izip
 
-from fatools.utils.kernel import getter, extend_class, isiterable
+from fatools.utils.kernel import (InvalidArgumentError, KeypathGetter,
+                                  MultiKeypathGetter, getter, extend_class,
+                                  isiterable)
 from fatools.utils.func import compact, exclude, flatten, transform_values
 
 
@@ -62,7 +64,7 @@ def _extend_iterable(cls):
 
     @extend_class(cls, name='pluck')
     def _iterable_pluck(self, *attrs):
-        return tuple(map(getter(*attrs), self))
+        return tuple(getter(*attrs).map(self))
 
     @extend_class(cls, name='flatten')
     def _iterable_flatten(self):
@@ -73,16 +75,36 @@ def _extend_iterable(cls):
         return tuple(self)
 
     @extend_class(cls, name='group_by')
-    def _iterable_group_by(self, key, *more_keys):
-        if isinstance(key, (str, int)):
-            if more_keys:
-                key = getter(key, *more_keys)
-            else:
-                key = getter(key)
-        elif isiterable(key, of_type=(str, int)):
-            key = getter(*key)
-        return cls((key, cls(group))
-                   for key, group in groupby(self.sorted(key), key))
+    def _iterable_group_by(self, key, *more_keys, **kwargs):
+        """Group the elements by the given key(s).
+
+        Groups are sorted by key, unless ``sort=False`` is given; in that
+        case, elements are grouped in a single pass using a dict and
+        groups keep the order of first appearance, so keys only need to be
+        hashable.
+
+        Raises
+        ------
+        InvalidArgumentError
+            If any option other than `sort` is given.
+
+        """
+        sort = kwargs.pop('sort', True)
+        if kwargs:
+            name = sorted(kwargs)[0]
+            raise InvalidArgumentError(name, kwargs[name])
+        keys = _map_key(_key_getter(key, more_keys), self)
+        if not sort:
+            groups, order = dict(), []
+            for k, ele in izip(keys, self):
+                group = groups.get(k)
+                if group is None:
+                    group = groups[k] = []
+                    order.append(k)
+                group.append(ele)
+            return cls((k, cls(groups[k])) for k in order)
+        return cls((k, cls(self[i] for i in idxs))
+                   for k, idxs in groupby(_argsort(keys), keys.__getitem__))
 
     @extend_class(cls, name='map')
     def _iterable_map(self, func):
@@ -94,11 +116,11 @@ def _extend_iterable(cls):
 
     @extend_class(cls, name='sorted')
     def _iterable_sorted(self, key=None, cmp=None, reverse=False):
-        if isinstance(key, str):
-            key = getter(key)
-        elif isiterable(key, of_type=(str, int)):
-            key = getter(*key)
-        return cls(sorted(self, cmp=cmp, key=key, reverse=reverse))
+        if key is None or cmp is not None:
+            key = _key_getter(key) if key is not None else None
+            return cls(sorted(self, cmp=cmp, key=key, reverse=reverse))
+        order = _argsort(_map_key(_key_getter(key), self), reverse)
+        return cls(map(self.__getitem__, order))
 
     @extend_class(cls, name='sorted_by')
     def _iterable_sorted_by(self, *keys, **kwargs):
@@ -106,4 +128,25 @@ def _extend_iterable(cls):
 
     @extend_class(cls, name='uniq')
     def _iterable_uniq(self):
-        return cls(set(self)).sorted(key=self.index)
+        seen = set()
+        seen_add = seen.add
+        return cls(ele for ele in self if not (ele in seen or seen_add(ele)))
+
+
+def _argsort(keys, reverse=False):
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+
+def _key_getter(key, more_keys=()):
+    if isinstance(key, (str, int)):
+        return getter(key, *more_keys)
+    elif isiterable(key, of_type=(str, int)):
+        return getter(*key)
+    return key
+
+
+def _map_key(key, items):
+    # keypath getters compute all keys at once through their fast path
+    if isinstance(key, (KeypathGetter, MultiKeypathGetter)):
+        return key.map(items)
+    return map(key, items)
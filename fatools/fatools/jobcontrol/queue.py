@@ -19,10 +19,11 @@ class JobQueue(object):
     __metaclass__ = abc.ABCMeta
 
     def __init__(self, name, cpu=1, cpu_per_job=1, job_class=Job,
-                 notify=None, recipient=None):
+                 notify=None, recipient=None, on_job_done=None):
         self._name = name
         self.total_cpu, self.cpu_per_job = cpu, cpu_per_job
         self._job_class = job_class
+        self._on_job_done = on_job_done  # called as soon as a job finishes
 
         self._setup_notification_level(notify, recipient)
 
@@ -55,7 +56,7 @@ class JobQueue(object):
 
     @property
     def max_simultaneous_jobs(self):
-        return int(self.total_cpu / self.cpu_per_job)
+        return max(1, int(self.total_cpu / self.cpu_per_job))
 
     @property
     def pending_jobs(self):
@@ -192,3 +193,5 @@ class JobQueue(object):
         self.table.addrow(
             self.job_count() + (str(job.state), job.name, job_time, job.id))
         send_notification_if_needed(self, job)
+        if job.state is JobStatus.finished and self._on_job_done is not None:
+            self._on_job_done(job)
@@ -4,10 +4,12 @@ from fatools.utils.text import glued
 
 
 class Ring(AtomCollection):
-    def __init__(self, st, atoms, centroid=None):
+    def __init__(self, st, atoms, centroid=None, normal=None):
         super(Ring, self).__init__(st, atoms)
-        self._centroid = tuple(centroid)
+        self._centroid = tuple(centroid) if centroid is not None else None
+        self._normal = tuple(normal) if normal is not None else None
     centroid = property(lambda self: self._centroid)
+    normal = property(lambda self: self._normal)
     chain = property(lambda self: self[0].chain)
     pdbcode = property(lambda self: self[0].pdbcode.strip())
     pdbres = property(lambda self: self[0].pdbres.strip())
@@ -1,6 +1,7 @@
 from fatools.application.schrodinger import wrap_atom
 from fatools.structure import Atom
-from schrodinger.structutils.analyze import find_ligands, evaluate_asl
+from fatools.structutils.asl import evaluate_asl
+from schrodinger.structutils.analyze import find_ligands
 
 
 # TODO add docstring
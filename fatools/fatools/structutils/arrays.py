@@ -0,0 +1,253 @@
+import zlib
+
+import numpy as np
+from fatools.structutils.asl import structure_identity, structure_reference
+from fatools.utils.caching import LRUCache
+from fatools.utils.geometry import CellList
+
+STRUCTURE_ARRAYS_CACHE_SIZE = 64
+
+
+class StructureArrays(object):
+    """Columnar snapshot of the atoms of a structure.
+
+    Per-atom properties are stored as NumPy arrays in atom order, so atom
+    indexes (which start at 1, as in Schrodinger structures) map to
+    position ``index - 1``. Searches read them with array operations
+    instead of going through atom wrappers one attribute at a time; atoms
+    only need to be wrapped for reporting.
+
+    Parameters
+    ----------
+    coords : array_like
+        Coordinates with shape (n, 3).
+    elements, chains, pdbnames : sequence of str
+        Element, chain name and PDB atom name of every atom.
+    resnums : sequence of int
+        Residue number of every atom.
+    vdw_radii : sequence of float
+        van der Waals radius of every atom.
+    formal_charges : sequence of int
+        Formal charge of every atom.
+    bonds : array_like
+        Atom indexes of every bond with shape (b, 2). The neighbors of an
+        atom are listed in this order.
+    inscodes : sequence of str, optional
+        Insertion code of every atom. Defaults to blanks.
+
+    """
+    def __init__(self, coords, elements, resnums, chains, pdbnames,
+                 vdw_radii, formal_charges, bonds, inscodes=None):
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        self.elements = np.asarray(elements, dtype=str)
+        self.resnums = np.asarray(resnums, dtype=int)
+        self.chains = np.asarray(chains, dtype=str)
+        self.pdbnames = np.asarray(pdbnames, dtype=str)
+        self.vdw_radii = np.asarray(vdw_radii, dtype=float)
+        self.formal_charges = np.asarray(formal_charges, dtype=int)
+        self.bonds = np.asarray(bonds, dtype=np.intp).reshape(-1, 2)
+        if inscodes is None:
+            inscodes = np.full(len(self.coords), ' ')
+        self.inscodes = np.asarray(inscodes, dtype=str)
+        self._neighbors = self._residue_ids = self._topology = None
+
+    atom_total = property(lambda self: len(self.coords))
+
+    def __len__(self):
+        return len(self.coords)
+
+    @classmethod
+    def from_structure(cls, st):
+        """Take a snapshot of a Schrodinger structure."""
+        atoms = list(st.atom)
+        return cls(st.getXYZ(),
+                   [atom.element for atom in atoms],
+                   [atom.resnum for atom in atoms],
+                   [atom.chain for atom in atoms],
+                   [atom.pdbname for atom in atoms],
+                   [atom.vdw_radius for atom in atoms],
+                   [atom.formal_charge for atom in atoms],
+                   [(bond.atom1.index, bond.atom2.index)
+                    for bond in st.bond],
+                   [atom.inscode for atom in atoms])
+
+    @property
+    def residue_ids(self):
+        """Residue of every atom as an integer, numbered in order of
+        appearance."""
+        if self._residue_ids is None:
+            keys = zip(self.chains.tolist(), self.resnums.tolist(),
+                       self.inscodes.tolist())
+            residue_ids = dict()
+            self._residue_ids = np.array(
+                [residue_ids.setdefault(key, len(residue_ids))
+                 for key in keys], dtype=np.intp)
+        return self._residue_ids
+
+    @property
+    def topology_checksum(self):
+        """Checksum of the elements, formal charges and bonds."""
+        if self._topology is None:
+            checksum = zlib.crc32(self.elements.tobytes())
+            checksum = zlib.crc32(self.formal_charges.tobytes(), checksum)
+            self._topology = zlib.crc32(self.bonds.tobytes(), checksum)
+        return self._topology
+
+    def bonded_atoms(self, atom_idx):
+        """Return the indexes of the atoms bonded to the given atom, in
+        bond order."""
+        indptr, neighbors = self._neighbor_lists()
+        return neighbors[indptr[atom_idx - 1]:indptr[atom_idx]]
+
+    def coordinates(self, atom_idxs):
+        """Return the coordinates of the given atoms, NaN for index 0 (the
+        padding of `neighbor_matrix`)."""
+        atom_idxs = np.asarray(atom_idxs, dtype=np.intp)
+        coords = self.coords[atom_idxs - 1]
+        coords[atom_idxs == 0] = np.nan
+        return coords
+
+    def degrees(self, atom_idxs=None):
+        """Return the number of bonds of the given atoms (all by
+        default)."""
+        degrees = np.diff(self._neighbor_lists()[0])
+        if atom_idxs is None:
+            return degrees
+        return degrees[np.asarray(atom_idxs, dtype=np.intp) - 1]
+
+    def neighbor_matrix(self, atom_idxs, max_neighbors=None):
+        """Return the atoms bonded to each of the given atoms.
+
+        Parameters
+        ----------
+        atom_idxs : sequence of int
+            Atom indexes.
+        max_neighbors : int, optional
+            Number of neighbors to return per atom. Defaults to the largest
+            number of bonds of the given atoms.
+
+        Returns
+        -------
+        numpy.ndarray
+            Atom indexes with shape (len(atom_idxs), max_neighbors), in bond
+            order and padded with 0.
+
+        """
+        atom_idxs = np.asarray(atom_idxs, dtype=np.intp).ravel()
+        indptr, neighbors = self._neighbor_lists()
+        starts, degrees = indptr[atom_idxs - 1], self.degrees(atom_idxs)
+        if max_neighbors is None:
+            max_neighbors = degrees.max() if len(degrees) else 0
+        matrix = np.zeros((len(atom_idxs), max_neighbors), dtype=np.intp)
+        rows = np.repeat(np.arange(len(atom_idxs)), degrees)
+        cols = np.arange(degrees.sum()) - np.repeat(
+            np.cumsum(degrees) - degrees, degrees)
+        kept = cols < max_neighbors
+        matrix[rows[kept], cols[kept]] = \
+            neighbors[np.repeat(starts, degrees)[kept] + cols[kept]]
+        return matrix
+
+    def refresh_coordinates(self, coords):
+        """Replace the coordinates, e.g., with the ones of a new pose."""
+        coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        if coords.shape != self.coords.shape:
+            raise ValueError('number of atoms does not match')
+        self.coords = coords
+
+    def within(self, atom_idxs, radius, fillres=False):
+        """Return the atoms within `radius` of any of the given atoms.
+
+        Same as the ASL expression ``within <radius> <atoms>`` (or
+        ``fillres within <radius> <atoms>`` with `fillres`), computed with
+        a cell list. The given atoms are included.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted atom indexes.
+
+        """
+        atom_idxs = np.asarray(sorted(atom_idxs), dtype=np.intp)
+        if not len(atom_idxs):
+            return atom_idxs
+        close_idxs = CellList(self.coords, radius).query_points(
+            self.coords[atom_idxs - 1])
+        mask = np.zeros(len(self), dtype=bool)
+        mask[close_idxs] = True
+        mask[atom_idxs - 1] = True
+        if fillres:
+            mask = np.in1d(self.residue_ids, self.residue_ids[mask])
+        return np.nonzero(mask)[0] + 1
+
+    def _neighbor_lists(self):
+        # CSR adjacency: neighbors of atom i at indptr[i - 1]:indptr[i]
+        if self._neighbors is None:
+            atoms = np.concatenate([self.bonds[:, 0], self.bonds[:, 1]])
+            neighbors = np.concatenate([self.bonds[:, 1], self.bonds[:, 0]])
+            bond_order = np.tile(np.arange(len(self.bonds)), 2)
+            order = np.lexsort((bond_order, atoms))
+            indptr = np.zeros(len(self) + 1, dtype=np.intp)
+            indptr[1:] = np.cumsum(np.bincount(atoms - 1,
+                                               minlength=len(self)))
+            self._neighbors = indptr, neighbors[order].astype(np.intp)
+        return self._neighbors
+
+
+class StructureArraysCache(object):
+    """Bounded cache of `StructureArrays` snapshots.
+
+    Snapshots are keyed by the structure identity (its handle) and the atom
+    and bond totals, and their coordinates are refreshed whenever the
+    checksum of the structure coordinates changes, so moving atoms (e.g.,
+    a new pose) does not rebuild the snapshot. As handles are reused once
+    a structure is freed, entries also hold a (weak) reference to their
+    structure and are rebuilt for any other structure object. Changes to
+    atom properties only (elements, charges, residues, ...) are not
+    detected, so `invalidate` the structure after editing them in place.
+
+    """
+    def __init__(self, maxsize=STRUCTURE_ARRAYS_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def get(self, st):
+        """Return the `StructureArrays` of `st`."""
+        if isinstance(st, StructureArrays):
+            return st
+        key = (structure_identity(st), st.atom_total, st.bond_total)
+        xyz = st.getXYZ(copy=False)
+        checksum = zlib.crc32(xyz.tobytes())
+        entry = self._cache.get(key)
+        if entry is None or entry[2]() is not st:
+            entry = self._cache[key] = [
+                StructureArrays.from_structure(st), checksum,
+                structure_reference(st)]
+        elif entry[1] != checksum:
+            entry[0].refresh_coordinates(xyz.copy())
+            entry[1] = checksum
+        return entry[0]
+
+    def info(self):
+        """Return the hit/miss statistics as a `CacheInfo`."""
+        return self._cache.info()
+
+    def invalidate(self, st):
+        """Discard the snapshot of the given structure."""
+        identity = structure_identity(st)
+        for key in [key for key in self._cache.keys()
+                    if key[0] == identity]:
+            self._cache.discard(key)
+
+
+STRUCTURE_ARRAYS_CACHE = StructureArraysCache()
+
+
+def get_structure_arrays(st):
+    """Return the `StructureArrays` of `st`, cached in
+    `STRUCTURE_ARRAYS_CACHE`."""
+    return STRUCTURE_ARRAYS_CACHE.get(st)
@@ -0,0 +1,86 @@
+import weakref
+import zlib
+
+from fatools.utils.caching import LRUCache
+from schrodinger.structutils import analyze
+
+ASL_CACHE_SIZE = 256
+
+
+class ASLCache(object):
+    """Bounded cache of ASL evaluation results.
+
+    Results are keyed by the structure identity (its handle), a
+    modification stamp and the ASL expression, and the least recently used
+    results are evicted first once `maxsize` is reached.
+
+    The modification stamp is made of the atom and bond totals and a
+    checksum of the coordinates, so adding or deleting atoms or bonds and
+    moving atoms (e.g., for ``within`` expressions) are detected. Changes to
+    atom properties only (names, residues, elements, ...) are not, so
+    `invalidate` the structure after editing them in place.
+
+    """
+    def __init__(self, maxsize=ASL_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def evaluate(self, st, asl):
+        """Return the indexes of the atoms of `st` matching `asl`."""
+        key = (structure_identity(st), structure_stamp(st), asl)
+        atom_idxs = self._cache.get(key)
+        if atom_idxs is None:
+            atom_idxs = tuple(analyze.evaluate_asl(st, asl))
+            self._cache[key] = atom_idxs
+        return list(atom_idxs)
+
+    def info(self):
+        """Return the hit/miss statistics as a `CacheInfo`."""
+        return self._cache.info()
+
+    def invalidate(self, st):
+        """Discard every cached result for the given structure."""
+        identity = structure_identity(st)
+        for key in [key for key in self._cache.keys()
+                    if key[0] == identity]:
+            self._cache.discard(key)
+
+
+ASL_CACHE = ASLCache()
+
+
+def evaluate_asl(st, asl):
+    """Evaluate `asl` on `st`, caching the result in `ASL_CACHE`.
+
+    Drop-in replacement for `schrodinger.structutils.analyze.evaluate_asl`.
+
+    """
+    return ASL_CACHE.evaluate(st, asl)
+
+
+def structure_identity(st):
+    return getattr(st, 'handle', None) or id(st)
+
+
+def structure_reference(st):
+    """Return a callable returning `st`, weak when possible.
+
+    Handles and ids are reused once a structure is freed, so caches keyed
+    by `structure_identity` keep this reference to check that an entry
+    still belongs to the very same structure object.
+
+    """
+    try:
+        return weakref.ref(st)
+    except TypeError:
+        return lambda: st
+
+
+def structure_stamp(st):
+    xyz = st.getXYZ(copy=False)
+    return st.atom_total, st.bond_total, zlib.crc32(xyz.tobytes())
@@ -1,4 +1,5 @@
-from fatools.structutils.interactions.criteria import InteractionCriteria
+from fatools.structutils.interactions.criteria import (
+    InteractionCriteria, InteractionCriteriaPreset)
 from fatools.structutils.interactions.finder import register_finder
 from fatools.structutils.interactions.hbond import (
     HBondCriteria, HydrogenBondCriteria, HBondInteraction,
@@ -15,9 +16,17 @@ from fatools.structutils.interactions.xbond import (
     XBondCriteria, HalogenBondCriteria, XBondInteraction,
     HalogenBondInteraction, XBondFinder, HalogenBondFinder,
     match_xbond)
+from fatools.structutils.interactions.context import ReceptorContext
 from fatools.structutils.interactions.utils import (
-    MultipleInteractionFinder, compact_interactions, curate_interactions,
-    find_interactions, gather_finders, remove_duplicate_interactions)
+    MultipleCriteriaFinder, MultipleInteractionFinder, compact_interactions,
+    curate_interactions, find_interactions, find_interactions_by_criteria,
+    find_interactions_many, gather_finders, map_interactions,
+    remove_duplicate_interactions)
 
 from fatools.structutils.interactions.fingerprints import (
-    InteractionFingerprint, InteractionFingerprintMatrix)
+    InteractionFingerprint, InteractionFingerprintMatrix,
+    InteractionFingerprintWriter)
+from fatools.structutils.interactions.frequency import (
+    ContactFrequency, ContactFrequencyAccumulator)
+from fatools.structutils.interactions.similarity import (
+    BitFingerprintMatrix, SimilarityHits)
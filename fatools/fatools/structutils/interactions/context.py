@@ -0,0 +1,101 @@
+import numpy as np
+from fatools.structutils import parse_atom_set
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.asl import evaluate_asl
+from fatools.structutils.interactions.groups import (RING_CACHE,
+                                                     atom_coordinates,
+                                                     find_charged_atoms)
+from fatools.utils.geometry import CellList
+
+RECEPTOR_POCKET_CUTOFF = 8.0
+
+
+class ReceptorContext(object):
+    """Receptor-side data shared by interaction searches.
+
+    When the same receptor is searched against many ligands (e.g., the
+    poses of a virtual screening), everything that depends only on the
+    receptor is computed once: the coordinates and residue of every atom,
+    a spatial index over them, the atom sets matched by the finders' ASL
+    expressions, the charged atoms and the aromatic rings.
+
+    Each search only considers the receptor pocket, i.e., the residues
+    with any atom within `cutoff` of the ligand. Whole residues are kept,
+    so rings and charged groups are never split.
+
+    Parameters
+    ----------
+    st : schrodinger.structure.Structure
+        Receptor structure.
+    atoms : str or list of int, optional
+        ASL expression or atom indexes of the receptor to consider. Defaults
+        to all atoms.
+    cutoff : float, optional
+        Distance from the ligand defining the receptor pocket. It must be
+        larger than the distance criteria of the finders in use.
+
+    """
+    def __init__(self, st, atoms=None, cutoff=RECEPTOR_POCKET_CUTOFF):
+        atom_idxs = parse_atom_set(st, atoms, default='all')
+        if not atom_idxs:
+            raise ValueError('atom set cannot be empty')
+        self._st = st
+        self._atom_idxs = np.array(sorted(atom_idxs), dtype=np.intp)
+        self._cutoff = cutoff
+        self._atom_sets = dict()
+        self._groups = dict()
+        arrays = get_structure_arrays(st)
+        self._residue_ids = arrays.residue_ids[self._atom_idxs - 1]
+        self._spatial_index = CellList(
+            arrays.coords[self._atom_idxs - 1], cutoff)
+    atom_indexes = property(lambda self: tuple(self._atom_idxs.tolist()))
+    cutoff = property(lambda self: self._cutoff)
+    structure = st = property(lambda self: self._st)
+
+    def atom_set(self, asl):
+        """Return the indexes of the receptor atoms matching `asl`.
+
+        The result is computed once per expression.
+
+        """
+        try:
+            return self._atom_sets[asl]
+        except KeyError:
+            atom_set = frozenset(evaluate_asl(self._st, asl)) & \
+                frozenset(self.atom_indexes)
+            self._atom_sets[asl] = atom_set
+            return atom_set
+
+    def aromatic_rings(self):
+        """Return the `RingGeometry` of the aromatic rings of the receptor.
+
+        Rings are perceived once and kept in `RING_CACHE`, and the result
+        is computed once.
+
+        """
+        key = 'aromatic_rings'
+        if key not in self._groups:
+            self._groups[key] = RING_CACHE.rings(self._st).subset(
+                self._atom_idxs.tolist())
+        return self._groups[key]
+
+    def charged_atoms(self, resonance=True):
+        """Return the `ChargedAtoms` of the receptor.
+
+        The result is computed once per `resonance` option.
+
+        """
+        key = ('charged_atoms', resonance)
+        if key not in self._groups:
+            self._groups[key] = find_charged_atoms(
+                self._st, self.atom_indexes, resonance)
+        return self._groups[key]
+
+    def pocket(self, st, atoms):
+        """Return the indexes of the receptor atoms in the pocket around
+        the given atoms of `st`."""
+        xyz = atom_coordinates(st, list(atoms))
+        close_idxs = self._spatial_index.query_points(xyz)
+        mask = np.in1d(self._residue_ids, self._residue_ids[close_idxs])
+        return frozenset(self._atom_idxs[mask].tolist())
+
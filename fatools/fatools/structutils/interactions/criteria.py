@@ -1,6 +1,8 @@
 import re
 
+import numpy as np
 from fatools.core_ext import builtin
+from fatools.utils.enum import Enum
 from fatools.utils.kernel import InvalidArgumentError, MissingArgumentError
 
 CRITERIA_OPTION_REGEX = re.compile(r'^(m(?:in|ax))_(.+)')
@@ -10,6 +12,9 @@ CRITERIA_OPTION_REGEX = re.compile(r'^(m(?:in|ax))_(.+)')
 class InteractionCriteria(object):
     def __init__(self, **kwargs):
         self._measures = InteractionCriteria._extract_options(kwargs)
+        self._bounds = tuple((measure, min_value, max_value)
+                             for measure, (min_value, max_value)
+                             in self._measures.items())
     measures = property(lambda self: self._measures.copy())
 
     def __getattr__(self, name):
@@ -26,14 +31,99 @@ class InteractionCriteria(object):
             return self._measures[measure][0 if prefix == 'min' else 1]
         return tuple(self._measures[item])
 
+    @classmethod
+    def envelope(cls, criteria):
+        """Return the loosest criteria matching whatever any of the given
+        criteria matches.
+
+        Only the measures constrained by all of them are kept, with the
+        smallest minimum and the largest maximum (a missing bound wins).
+
+        """
+        criteria = list(criteria)
+        if not criteria:
+            raise ValueError('cannot take the envelope of no criteria')
+        common = set.intersection(*[set(c._measures) for c in criteria])
+        measures = dict()
+        for measure in common:
+            mins, maxs = zip(*[c._measures[measure] for c in criteria])
+            measures[measure] = (None if None in mins else min(mins),
+                                 None if None in maxs else max(maxs))
+        return cls(**measures)
+
     def match_interaction(self, interaction):
         return self.match_measurements(**interaction.measurements)
 
+    def match_interactions(self, interactions):
+        """Vectorized `match_interaction` over a sequence of interactions.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the interactions matching the criteria.
+
+        """
+        measurements = [interaction.measurements
+                        for interaction in interactions]
+        if not self._measures:
+            return np.ones(len(measurements), dtype=bool)
+        for values in measurements:
+            self._check_measurements(values)
+        arrays = dict(
+            (measure, np.array(
+                [np.nan if values[measure] is None else values[measure]
+                 for values in measurements], dtype=float))
+            for measure in self._measures)
+        return self.match_arrays(arrays)
+
+    def match_arrays(self, measurements=None, **kwargs):
+        """Match arrays of measurements at once.
+
+        Vectorized counterpart of `match_measurements`: every measure is
+        checked with at most two NumPy comparisons over all the values, and
+        NaN values (undefined measurements) are not checked, as None is for
+        a single interaction.
+
+        Parameters
+        ----------
+        measurements : dict of array_like, optional
+            Values of every measure, e.g., ``dict(distance=distances)``.
+            Arrays must have the same (or broadcastable) shapes. Can be
+            given as keyword arguments too.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the values matching all the constraints. All
+            True if there are no constraints, or a NumPy True scalar if
+            there are no measurements either.
+
+        """
+        if measurements is None:
+            measurements = kwargs
+        elif kwargs:
+            measurements = dict(measurements, **kwargs)
+        self._check_measurements(measurements)
+        arrays = [np.asarray(measurements[measure], dtype=float)
+                  for measure, _, _ in self._bounds]
+        if not arrays:  # nothing to check, match whatever was given
+            arrays = [np.asarray(values) for values in measurements.values()]
+        if not arrays:
+            return np.True_
+        mask = np.ones(np.broadcast(*arrays).shape if len(arrays) > 1
+                       else arrays[0].shape, dtype=bool)
+        # NaN compares false both ways, so out-of-bounds tests skip it
+        with np.errstate(invalid='ignore'):
+            for values, (_, min_value, max_value) in zip(arrays,
+                                                         self._bounds):
+                if min_value is not None:
+                    mask &= ~(values < min_value)
+                if max_value is not None:
+                    mask &= ~(values > max_value)
+        return mask
+
     def match_measurements(self, **kwargs):
-        for measure in self._measures:
-            if measure not in kwargs:
-                err_template = 'missing required \'{name}\' measurement'
-                raise MissingArgumentError(measure, err_template)
+        self._check_measurements(kwargs)
         return all(self._match_constraints(measure, value)
                    for measure, value in kwargs.items()
                    if value is not None)
@@ -49,6 +139,12 @@ class InteractionCriteria(object):
                     measures[name][i] = new_value
         return self.__class__(**measures.transform_values(tuple))
 
+    def _check_measurements(self, measurements):
+        for measure in self._measures:
+            if measure not in measurements:
+                err_template = 'missing required \'{name}\' measurement'
+                raise MissingArgumentError(measure, err_template)
+
     @staticmethod
     def _extract_options(kwargs, default=None):
         opts = dict()
@@ -72,3 +168,26 @@ class InteractionCriteria(object):
         elif max_value is None:
             return value >= min_value
         return min_value <= value <= max_value
+
+
+class InteractionCriteriaPreset(Enum):
+    """Base enumeration of named `InteractionCriteria`.
+
+    Members can be used in place of their criteria to match measurements,
+    e.g., ``HydrogenBondCriteria.glide.match_arrays(distance=distances,
+    ...)``.
+
+    """
+    criteria = property(lambda self: self.value)
+
+    def match_arrays(self, measurements=None, **kwargs):
+        return self.value.match_arrays(measurements, **kwargs)
+
+    def match_interaction(self, interaction):
+        return self.value.match_interaction(interaction)
+
+    def match_interactions(self, interactions):
+        return self.value.match_interactions(interactions)
+
+    def match_measurements(self, **kwargs):
+        return self.value.match_measurements(**kwargs)
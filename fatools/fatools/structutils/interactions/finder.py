@@ -2,7 +2,9 @@ import abc
 from itertools import product
 
 from fatools.core_ext import builtin
-from fatools.structutils import parse_atom_set
+from fatools.structutils import get_atoms, parse_atom_set
+from fatools.structutils.asl import evaluate_asl
+from fatools.utils.geometry import find_neighbor_pairs
 from fatools.utils.kernel import getqualifier
 
 builtin.extend_list()
@@ -27,7 +29,31 @@ class InteractionFinder(object):
         if not as1 or not as2:
             raise ValueError('atom sets cannot be empty')
         interactions = self._search_interactions(st1, as1, st2, as2)
-        return self._sort_interactions(interactions).freeze()
+        return self._finish_search(interactions)
+
+    def search_context(self, receptor_ctx, st2, atoms2=None):
+        """Search interactions between a receptor context and a structure.
+
+        The receptor-side data precomputed by the `ReceptorContext` is
+        reused, and only the receptor pocket around the given atoms is
+        considered.
+
+        """
+        as2 = parse_atom_set(st2, atoms2, default='all')
+        if not as2:
+            raise ValueError('atom sets cannot be empty')
+        interactions = self._search_context(receptor_ctx, st2, as2)
+        return self._finish_search(interactions)
+
+    def _finish_search(self, interactions):
+        return self._sort_interactions(list(interactions)).freeze()
+
+    def _search_context(self, receptor_ctx, st2, as2):
+        as1 = receptor_ctx.pocket(st2, as2)
+        if not as1:
+            return ()
+        return self._search_interactions(
+            receptor_ctx.structure, sorted(as1), st2, as2)
 
     @abc.abstractmethod
     def _search_interactions(self, st1, as1, st2, as2):
@@ -36,13 +62,13 @@ class InteractionFinder(object):
     @classmethod
     def _setup_criteria(cls, criteria, constraints):
         if isinstance(criteria, cls.__criteria__):
-            return criteria.replace(**constraints)
+            criteria = criteria.value
         elif isinstance(criteria, str):
-            return cls.__criteria__[criteria].value
-        elif constraints:
-            return cls.__criteria__(**constraints)
-        # all criteria enums must have a default
-        return cls.__criteria__['default'].value
+            criteria = cls.__criteria__[criteria].value
+        elif criteria is None:
+            # all criteria enums must have a default
+            criteria = cls.__criteria__['default'].value
+        return criteria.replace(**constraints) if constraints else criteria
 
     def _sort_interactions(self, interactions):
         return interactions.sorted_by('residues[0]', 'atom_indexes')
@@ -54,15 +80,65 @@ class PairwiseInteractionFinder(InteractionFinder):
     def match(self, *args, **kwargs):
         return NotImplemented
 
-    def _search_interactions(self, st1, as1, st2, as2):
-        as1, as2 = self._setup_atom_sets(st1, as1, st2, as2)
+    def _search_atom_pairs(self, st1, atoms1, st2, atoms2):
+        """Search interactions by calling `match` on every candidate pair
+        of wrapped atoms.
+
+        This is the generic path for finders that only implement `match`;
+        the in-tree finders override `_search_atom_indexes` instead.
+
+        """
         return [self.__interaction__(st1, atom1, st2, atom2)
-                for atom1, atom2 in product(as1, as2)
+                for atom1, atom2 in self._candidate_pairs(atoms1, atoms2)
                 if self.match(atom1, atom2)]
 
-    @abc.abstractmethod
-    def _setup_atom_sets(st1, as1, st2, as2):
-        return NotImplemented
+    def _search_atom_indexes(self, st1, as1, st2, as2):
+        """Search interactions between sorted atom indexes already
+        restricted to `__atoms_asl__`.
+
+        Atoms are wrapped and paired by `_search_atom_pairs` by default.
+        Finders working on `StructureArrays` override this method instead,
+        so that only the atoms of the interactions found get wrapped.
+
+        """
+        return self._search_atom_pairs(st1, get_atoms(st1, as1),
+                                       st2, get_atoms(st2, as2))
+
+    def _search_context(self, receptor_ctx, st2, as2):
+        as1 = receptor_ctx.atom_set(self.__atoms_asl__) & \
+            receptor_ctx.pocket(st2, as2)
+        return self._search_atom_indexes(
+            receptor_ctx.structure, sorted(as1),
+            st2, self._setup_atom_indexes(st2, as2))
+
+    def _search_interactions(self, st1, as1, st2, as2):
+        return self._search_atom_indexes(
+            st1, self._setup_atom_indexes(st1, as1),
+            st2, self._setup_atom_indexes(st2, as2))
+
+    def _candidate_pairs(self, as1, as2):
+        """Return the atom pairs that may match the criteria.
+
+        When the criteria define a maximum distance, atoms farther apart
+        are discarded up front by a cell-list search so that `match` is
+        only called for nearby pairs. Otherwise, every pair is returned.
+
+        """
+        max_distance = getattr(self.criteria, 'max_distance', None)
+        if max_distance is None:
+            return product(as1, as2)
+        if not as1 or not as2:
+            return ()
+        idxs1, idxs2 = find_neighbor_pairs([a.xyz for a in as1],
+                                           [a.xyz for a in as2],
+                                           max_distance)
+        return [(as1[i], as2[j]) for i, j in zip(idxs1, idxs2)]
+
+    @classmethod
+    def _setup_atom_indexes(cls, st, atoms):
+        atoms = frozenset(evaluate_asl(st, cls.__atoms_asl__)) & \
+            frozenset(atoms)
+        return sorted(atoms)
 
 
 def register_finder(finder):
@@ -1,8 +1,7 @@
 import csv
-import re
-from collections import Counter
+import os
+from collections import Counter, namedtuple
 from functools import partial
-from itertools import product
 
 import matplotlib as mpl
 import matplotlib.gridspec as gridspec
@@ -66,7 +65,7 @@ class InteractionFingerprint(object):
         bins_desc = bins_desc or bins_desc_and_values.pluck(0).uniq()
         bins_desc_and_values_map = dict(
             (key, group.pluck(1))
-            for key, group in bins_desc_and_values.group_by('0'))
+            for key, group in bins_desc_and_values.group_by('0', sort=False))
         bins = list.with_capacity(len(bins_desc))
         for i, bin_desc in enumerate(bins_desc):
             if bin_desc in bins_desc_and_values_map:
@@ -101,11 +100,24 @@ class InteractionFingerprint(object):
 
 
 class InteractionFingerprintMatrix(object):
-    def __init__(self, interaction_matrix, labels=None):
+    """Interaction fingerprints of a set of poses.
+
+    Fingerprint values are stored as a float32 NumPy array with one row per
+    pose and one column per bin, where NaN marks the bins without an
+    interaction. For libraries with thousands of mostly empty bins, pass
+    ``sparse=True`` to keep the values as a `CSRMatrix` instead.
+
+    """
+    def __init__(self, interaction_matrix, labels=None, sparse=False):
         self._bins_desc = _gather_bins_desc(interaction_matrix)
-        ifp_encode = partial(InteractionFingerprint.encode_interactions,
-                             bins_desc=self._bins_desc)
-        self._fingerprints = interaction_matrix.map(ifp_encode).freeze()
+        shape = (len(interaction_matrix), len(self._bins_desc))
+        rows, cols, values = _encode_interaction_matrix(
+            interaction_matrix, self._bins_desc)
+        if sparse:
+            self._values = CSRMatrix.from_entries(rows, cols, values, shape)
+        else:
+            self._values = np.full(shape, np.nan, dtype=np.float32)
+            np.fmin.at(self._values, (rows, cols), values)
 
         if labels is not None:
             labels = labels.map(str.strip).freeze()
@@ -113,14 +125,23 @@ class InteractionFingerprintMatrix(object):
             self._label_width = max(width, IFP_LABEL_WIDTH)
         self._labels = labels
 
+    bins_desc = property(lambda self: self._bins_desc)
     labels = property(lambda self: self._labels)
     nbins = property(lambda self: len(self._bins_desc))
+    shape = property(lambda self: self._values.shape)
+    sparse = property(lambda self: isinstance(self._values, CSRMatrix))
 
     def __getitem__(self, item):
-        return self._fingerprints[item]
+        if isinstance(item, slice):
+            return tuple(self[i] for i in range(*item.indices(len(self))))
+        row = self._values.getrow(item) if self.sparse else self._values[item]
+        return InteractionFingerprint(self._bins_desc, _row_to_bins(row))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
 
     def __len__(self):
-        return len(self._fingerprints)
+        return self._values.shape[0]
 
     def __str__(self):
         return self._printable
@@ -129,46 +150,82 @@ class InteractionFingerprintMatrix(object):
     def description(self):
         return glued((self._printable_header, self._printable), '\n')
 
+    @property
+    def mask(self):
+        """Boolean array flagging the bins with an interaction."""
+        return ~np.isnan(self.values)
+
+    @property
+    def values(self):
+        """Dense float32 array of values, NaN for missing interactions."""
+        return self._values.toarray() if self.sparse else self._values
+
     def write_csv(self, filepath):
+        header = _format_csv_header(self._bins_desc)
+        is_clash = np.array(self._bins_desc.pluck(0)) == 'steric-clash'
+        cells = _format_csv_values(
+            *self._entries(), shape=self.shape, is_clash=is_clash)
+        if self.labels:
+            header = [[''] + row for row in header]
+            cells = np.column_stack([self.labels, cells])
         with open(filepath, 'wb') as csvfile:
             csvwriter = csv.writer(csvfile)
+            csvwriter.writerows(header)
+            csvwriter.writerows(cells.tolist())
+
+    def write_img(self, filepath, dpi=150, group_by='residue',
+                  tile_size=None):
+        """Draw the fingerprints as a heat map.
 
-            for line in self[0]._printable_header.split('\n'):
-                row = re.findall(r'.{%s}' % IFP_BIN_WIDTH, line).map(str.strip)
-                if self.labels:
-                    row.insert(0, '')
-                csvwriter.writerow(row)
-            for i, ifp in enumerate(self._fingerprints):
-                row = list(ifp._formatted_bins)
-                if self.labels:
-                    row.insert(0, self.labels[i])
-                csvwriter.writerow(row)
-
-    def write_img(self, filepath, dpi=150, group_by='residue'):
+        Each interaction is colored by its own scheme (`IFP_COLOR_SCHEMES`)
+        and the matrix is rendered as a single raster image. For very large
+        matrices, pass `tile_size` to split the poses into images of at
+        most that many rows, written to "<name>_<n><ext>" (n starting at 1)
+        and colored with the same normalization.
+
+        """
         if group_by == 'residue':
             writer = _PerResidueIFPImgWriter
         elif group_by == 'interaction':
             writer = _PerInteractionIFPImgWriter
         else:
             raise InvalidArgumentError('group_by', group_by)
-        writer.write(filepath, self, dpi)
+        matrix = self._normalized_matrix
+        labels = self.labels or [''] * len(self)
+        if not tile_size or tile_size >= len(self):
+            writer.write(filepath, self._bins_desc, matrix, labels, dpi)
+            return
+        root, ext = os.path.splitext(filepath)
+        for n, start in enumerate(range(0, len(self), tile_size), 1):
+            stop = start + tile_size
+            writer.write('{}_{}{}'.format(root, n, ext), self._bins_desc,
+                         matrix[start:stop], labels[start:stop], dpi)
+
+    @cached_property
+    def _interaction_ids(self):
+        # index of every bin's interaction in the sorted interaction names
+        inames = self._bins_desc.pluck(0)
+        names = sorted(set(inames))
+        return names, np.array([names.index(iname) for iname in inames],
+                               dtype=np.intp)
 
     @cached_property
     def _normalized_matrix(self):
         iranges = self._get_interaction_ranges()
-
-        matrix = list.with_capacity(len(self), self.nbins, repeated_value=-1)
-        for i, ifp in enumerate(self._fingerprints):
-            for j, value in tuple(enumerate(ifp._bins)).exclude(None, key=1):
-                iname = ifp._bins_desc[j][0]
-                minv, maxv = iranges[iname]
-                try:
-                    if iname == 'steric-clash':
-                        matrix[i][j] = (value - minv) / (maxv - minv)
-                    else:  # shorter distance is better
-                        matrix[i][j] = (value - maxv) / (minv - maxv)
-                except ZeroDivisionError:  # min and max values are the same
-                    matrix[i][j] = 1  # interaction only appears once
+        names, iids = self._interaction_ids
+        rows, cols, values = self._entries()
+        minv = np.array([iranges[name][0] for name in names])[iids[cols]]
+        maxv = np.array([iranges[name][1] for name in names])[iids[cols]]
+
+        # shorter distance is better, but larger overlap is worse
+        is_clash = (np.array(names) == 'steric-clash')[iids[cols]]
+        num = np.where(is_clash, values - minv, values - maxv)
+        den = np.where(is_clash, maxv - minv, minv - maxv)
+        same = den == 0  # interaction only appears once or always the same
+        normalized = np.where(same, 1, num / np.where(same, 1, den))
+
+        matrix = np.full(self.shape, -1, dtype=np.float32)
+        matrix[rows, cols] = normalized
         return matrix
 
     @cached_property
@@ -177,62 +234,201 @@ class InteractionFingerprintMatrix(object):
         if self.labels:  # add label at the start of each line
             pad_label = partial(pad, width=self._label_width)
             formatter = lambda i, ifp: pad_label(self.labels[i]) + str(ifp)
-        return glued(self._fingerprints.map_with_index(formatter), '\n')
+        return glued(list(self).map_with_index(formatter), '\n')
 
     @property
     def _printable_header(self):
-        headers = self._fingerprints[0]._printable_header.split('\n')
+        headers = self[0]._printable_header.split('\n')
         if self.labels:  # add spacing/title at the start of each header line
             for i in range(len(headers) - 1):
                 headers[i] = ' ' * self._label_width + headers[i]
             headers[-1] = pad('Entry', self._label_width) + headers[-1]
         return glued(headers, '\n')
 
+    def _entries(self):
+        """Return the rows, columns and values of the present bins."""
+        if self.sparse:
+            return self._values.entries()
+        rows, cols = np.nonzero(~np.isnan(self._values))
+        return rows, cols, self._values[rows, cols]
+
     def _get_interaction_ranges(self):
-        iranges = dict((i, []) for i in self._bins_desc.pluck(0).uniq())
-        for ifp in self._fingerprints:
-            for bin_desc, value in zip(ifp._bins_desc, ifp._bins):
-                iranges[bin_desc[0]].append(value)
-        for iname, values in iranges.items():
-            values = values.compact()  # remove None elements
-            iranges[iname] = (min(values), max(values))
-        return iranges
+        names, iids = self._interaction_ids
+        _, cols, values = self._entries()
+        minv = np.full(len(names), np.inf)
+        maxv = np.full(len(names), -np.inf)
+        np.minimum.at(minv, iids[cols], values)
+        np.maximum.at(maxv, iids[cols], values)
+        return dict((name, (minv[i], maxv[i]))
+                    for i, name in enumerate(names) if minv[i] <= maxv[i])
+
+
+class CSRMatrix(namedtuple('CSRMatrix', 'data indices indptr shape')):
+    """Compressed sparse row matrix of fingerprint values.
+
+    Only present bins are stored: the values of row ``i`` are
+    ``data[indptr[i]:indptr[i + 1]]`` at columns
+    ``indices[indptr[i]:indptr[i + 1]]``. Missing bins read as NaN.
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_entries(cls, rows, cols, values, shape):
+        """Build the matrix keeping the minimum of repeated entries."""
+        rows, cols = np.asarray(rows, np.intp), np.asarray(cols, np.intp)
+        values = np.asarray(values, np.float32)
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        if len(rows):
+            first = np.ones(len(rows), dtype=bool)
+            first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            starts = np.nonzero(first)[0]
+            values = np.minimum.reduceat(values, starts)
+            rows, cols = rows[starts], cols[starts]
+        indptr = np.zeros(shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(values, cols, indptr, tuple(shape))
+
+    def entries(self):
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return rows, self.indices, self.data
+
+    def getrow(self, i):
+        row = np.full(self.shape[1], np.nan, dtype=np.float32)
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        row[self.indices[start:stop]] = self.data[start:stop]
+        return row
+
+    def toarray(self):
+        matrix = np.full(self.shape, np.nan, dtype=np.float32)
+        rows, cols, values = self.entries()
+        matrix[rows, cols] = values
+        return matrix
+
+    def to_scipy(self):
+        """Return a ``scipy.sparse.csr_matrix`` (requires SciPy)."""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr), self.shape)
+
+
+class InteractionFingerprintWriter(object):
+    """Write interaction fingerprints to a CSV file one pose at a time.
+
+    The bins are fixed up front (e.g., the `bins_desc` of a reference
+    `InteractionFingerprintMatrix`), so each row is encoded and written as
+    soon as its interactions are found and memory use does not grow with
+    the number of poses. Interactions outside of these bins are ignored
+    and counted in `nskipped`. The output is the same as
+    `InteractionFingerprintMatrix.write_csv` for the same bins.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the CSV file.
+    bins_desc : list of tuple
+        Bins of the fingerprints as (interaction name, residue number,
+        residue code, fragment description).
+    labels : bool, optional
+        Whether every row starts with a label. Defaults to True.
+    append : bool, optional
+        If True and the file already exists, resume writing at its end.
+        Its header must match the bins.
+
+    """
+    def __init__(self, filepath, bins_desc, labels=True, append=False):
+        self._bins_desc = tuple(tuple(desc) for desc in bins_desc)
+        self._bin_idxs = dict(
+            (desc, j) for j, desc in enumerate(self._bins_desc))
+        self._is_clash = np.array(
+            [desc[0] == 'steric-clash' for desc in self._bins_desc])
+        self._labels = labels
+        self._nrows = self._nskipped = 0
+
+        header = _format_csv_header(self._bins_desc)
+        if labels:
+            header = [[''] + row for row in header]
+        if append and os.path.exists(filepath) and os.path.getsize(filepath):
+            self._nrows = _check_csv_header(filepath, header)
+            self._file = open(filepath, 'ab')
+            self._csvwriter = csv.writer(self._file)
+        else:
+            self._file = open(filepath, 'wb')
+            self._csvwriter = csv.writer(self._file)
+            self._csvwriter.writerows(header)
+
+    bins_desc = property(lambda self: self._bins_desc)
+    closed = property(lambda self: self._file.closed)
+    nrows = property(lambda self: self._nrows)
+    nskipped = property(lambda self: self._nskipped)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def flush(self):
+        self._file.flush()
+
+    def write(self, interactions, label=None):
+        """Encode the interactions of one pose and write them as a row."""
+        cols, values = [], []
+        for bin_desc, value in curate_interactions(interactions).map(
+                _encode_interaction):
+            j = self._bin_idxs.get(bin_desc)
+            if j is None:
+                self._nskipped += 1
+                continue
+            cols.append(j)
+            values.append(value)
+        # keep the minimum per bin, as InteractionFingerprintMatrix does
+        row = np.full(len(self._bin_idxs), np.nan, dtype=np.float32)
+        np.fmin.at(row, np.array(cols, dtype=np.intp),
+                   np.array(values, dtype=np.float32))
+        cols = np.flatnonzero(~np.isnan(row))
+        cells = _format_csv_values(
+            np.zeros(len(cols), dtype=np.intp), cols, row[cols],
+            shape=(1, len(self._bin_idxs)),
+            is_clash=self._is_clash)[0].tolist()
+        if self._labels:
+            cells.insert(0, str(label if label is not None else '').strip())
+        self._csvwriter.writerow(cells)
+        self._nrows += 1
+
+    def writerows(self, interaction_matrix, labels=None):
+        """Write the interactions of several poses."""
+        if labels is None:
+            labels = [None] * len(interaction_matrix)
+        for interactions, label in zip(interaction_matrix, labels):
+            self.write(interactions, label)
 
 
 class _PerInteractionIFPImgWriter(object):
     @staticmethod
-    def populate_subplot(ax, g_bins_desc, matrix, j_offset):
-        iname = g_bins_desc[0][0]
-        for i, j in product(range(len(matrix)), range(len(g_bins_desc))):
-            value = matrix[i][j + j_offset] * .8 + .2
-            color = IFP_COLOR_SCHEMES[iname](value)
-            rt = plt.Rectangle([j, i],
-                               width=1,
-                               height=1,
-                               facecolor=color,
-                               edgecolor=color)
-            ax.add_patch(rt)
+    def populate_subplot(ax, colors):
+        nrows, ncols = colors.shape[:2]
+        ax.imshow(colors, aspect='auto', interpolation='nearest',
+                  extent=(0, ncols, nrows, 0))
 
     @staticmethod
-    def setup_grid(ifp):
-        plt.subplots(figsize=(ifp.nbins, (len(ifp) + .5) * .35))
-        icounts = Counter(ifp._bins_desc.pluck(0).sorted())
-        ratios = [icounts[i] for i in ifp._bins_desc.pluck(0).uniq().sorted()]
-        return gridspec.GridSpec(1, len(ratios), width_ratios=ratios)
+    def setup_grid(bins_desc, nrows):
+        fig = plt.figure(figsize=(len(bins_desc), (nrows + .5) * .35))
+        icounts = Counter(bins_desc.pluck(0).sorted())
+        ratios = [icounts[i] for i in bins_desc.pluck(0).uniq().sorted()]
+        return fig, gridspec.GridSpec(1, len(ratios), width_ratios=ratios)
 
     @staticmethod
-    def setup_matrix(ifp):
-        bins_desc = ifp._bins_desc.sorted_by(0, 1)
-        columns = list.with_capacity(ifp.nbins)
-        for bin_desc, col in zip(ifp._bins_desc, zip(*ifp._normalized_matrix)):
-            j = bins_desc.index(bin_desc)
-            columns[j] = col
-        return bins_desc, np.array(zip(*columns))
+    def setup_matrix(bins_desc, matrix):
+        order = sorted(range(len(bins_desc)), key=lambda j: bins_desc[j][:2])
+        return bins_desc.sorted_by(0, 1), matrix[:, order]
 
     @staticmethod
     def setup_subplot(grid, gi, bins_desc):
         ax = plt.subplot(grid[gi])
-        ax.invert_yaxis()
 
         xlabels = ['{}{} {}'.format(rescode, resnum, frag)
                    for _, resnum, rescode, frag in bins_desc]
@@ -259,75 +455,144 @@ class _PerInteractionIFPImgWriter(object):
         return ax
 
     @staticmethod
-    def write(filepath, ifp, dpi=150):
-        all_bins_desc, matrix = _PerInteractionIFPImgWriter.setup_matrix(ifp)
-        grid, gi = _PerInteractionIFPImgWriter.setup_grid(ifp), 0
-        j_offset = 0
-        for iname, bins_desc in all_bins_desc.group_by(0):
-            ax = _PerInteractionIFPImgWriter.setup_subplot(grid, gi, bins_desc)
-            if gi == 0:
-                plt.yticks(np.arange(0.5, len(ifp) + 0.5), ifp.labels)
+    def write(filepath, bins_desc, matrix, labels, dpi=150):
+        all_bins_desc, matrix = _PerInteractionIFPImgWriter.setup_matrix(
+            bins_desc, matrix)
+        colors = _ifp_colors(matrix, all_bins_desc.pluck(0))
+        fig, grid = _PerInteractionIFPImgWriter.setup_grid(
+            bins_desc, len(matrix))
+        gi, j_offset = 0, 0
+        for iname, g_bins_desc in all_bins_desc.group_by(0):
+            ax = _PerInteractionIFPImgWriter.setup_subplot(
+                grid, gi, g_bins_desc)
             _PerInteractionIFPImgWriter.populate_subplot(
-                ax, bins_desc, matrix, j_offset)
-            ax.autoscale_view()
-            j_offset += len(bins_desc)
+                ax, colors[:, j_offset:j_offset + len(g_bins_desc)])
+            if gi == 0:
+                plt.yticks(np.arange(0.5, len(matrix) + 0.5), labels)
+            j_offset += len(g_bins_desc)
             gi += 1
         plt.tight_layout(pad=2, h_pad=0, w_pad=0)
-        plt.savefig(filepath, dpi=dpi)
+        fig.savefig(filepath, dpi=dpi)
+        plt.close(fig)
 
 
 class _PerResidueIFPImgWriter(object):
     @staticmethod
-    def write(filepath, ifp, dpi=150):
-        matrix = ifp._normalized_matrix
-        axes = _PerResidueIFPImgWriter._setup_plot_for(ifp)
-
-        for i, j in product(range(len(ifp)), range(ifp.nbins)):
-            iname = ifp._bins_desc[j][0]
-            value = matrix[i][j] * .8 + .2  # start at a darker color
-            color = IFP_COLOR_SCHEMES[iname](value)
-            rt = plt.Rectangle([j, i], 1, 1, facecolor=color, edgecolor=color)
-            axes.add_patch(rt)
-        axes.autoscale_view()
-        axes.invert_yaxis()
+    def write(filepath, bins_desc, matrix, labels, dpi=150):
+        fig, axes = _PerResidueIFPImgWriter._setup_plot_for(
+            bins_desc, len(matrix), labels)
+        colors = _ifp_colors(matrix, bins_desc.pluck(0))
+        axes.imshow(colors, aspect='auto', interpolation='nearest',
+                    extent=(0, len(bins_desc), len(matrix), 0))
 
         plt.tight_layout()
-        plt.savefig(filepath, dpi=dpi)
+        fig.savefig(filepath, dpi=dpi)
+        plt.close(fig)
 
     @staticmethod
-    def _setup_plot_for(ifp):
+    def _setup_plot_for(bins_desc, nrows, labels):
         xlabels, displayed_inames = [], []
-        for resnum, rescode, frag in ifp._bins_desc.pluck(1, 2, 3):
+        for resnum, rescode, frag in bins_desc.pluck(1, 2, 3):
             res = rescode + str(resnum)
             if res in displayed_inames:
                 res = ''
             displayed_inames.append(res)
             xlabels.append(glued((res, frag), '\n'))
 
-        fig, axes = plt.subplots(figsize=(ifp.nbins * .65, len(ifp) * .35))
-        plt.xticks(np.arange(0.5, ifp.nbins + 0.5), xlabels)
-        plt.yticks(np.arange(0.5, len(ifp) + 0.5), ifp.labels)
+        fig, axes = plt.subplots(figsize=(len(bins_desc) * .65, nrows * .35))
+        plt.xticks(np.arange(0.5, len(bins_desc) + 0.5), xlabels)
+        plt.yticks(np.arange(0.5, nrows + 0.5), labels)
         axes.xaxis.set_tick_params(top='off',
                                    labeltop='on',
                                    bottom='off',
                                    labelbottom='off')
         axes.yaxis.set_tick_params(top='off', bottom='off')
-        return axes
+        return fig, axes
 
 
 def _encode_interaction(interaction):
+    info = _interaction_bin_desc(interaction)
+    measure = 'distance' if interaction.name != 'steric-clash' else \
+        'relative_overlap'
+    return info, float(format(getattr(interaction, measure), '.3g'))
+
+
+def _interaction_bin_desc(interaction):
     try:
         residue, fragment = interaction.recep_desc.split(' ')
     except ValueError:  # does not have a fragment description
         residue, fragment = interaction.recep_desc, ''
     rescode, resnum = residue[0], int(residue[1:])
-    info = (interaction.name, resnum, rescode, fragment)
-    measure = 'distance' if interaction.name != 'steric-clash' else \
-        'relative_overlap'
-    return info, float(format(getattr(interaction, measure), '.3g'))
+    return interaction.name, resnum, rescode, fragment
 
 
 def _gather_bins_desc(interaction_matrix):
     interactions = interaction_matrix.flatten().sorted_by(
         'residues[0]', 'name', 'atom_indexes')
     return interactions.map(_encode_interaction).pluck('0').uniq()
+
+
+def _encode_interaction_matrix(interaction_matrix, bins_desc):
+    bin_idxs = dict((bin_desc, j) for j, bin_desc in enumerate(bins_desc))
+    rows, cols, values = [], [], []
+    for i, interactions in enumerate(interaction_matrix):
+        for bin_desc, value in curate_interactions(interactions).map(
+                _encode_interaction):
+            rows.append(i)
+            cols.append(bin_idxs[bin_desc])
+            values.append(value)
+    return (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp),
+            np.array(values, dtype=np.float32))
+
+
+def _check_csv_header(filepath, header):
+    """Return the number of rows after `header`, which must match."""
+    with open(filepath, 'rb') as csvfile:
+        rows = csv.reader(csvfile)
+        for expected in header:
+            if next(rows, None) != expected:
+                raise ValueError('{}: header does not match the fingerprint '
+                                 'bins'.format(filepath))
+        return sum(1 for _ in rows)
+
+
+def _format_csv_header(bins_desc):
+    residues, i_descriptions = [], []
+    for iname, resnum, rescode, f_desc in bins_desc:
+        residue = rescode + str(resnum)
+        residues.append(residue if residue not in residues else '')
+        i_descriptions.append('{}:{}'.format(interaction_abbr(iname), f_desc))
+    return [residues, i_descriptions]
+
+
+def _format_csv_values(rows, cols, values, shape, is_clash):
+    """Format values as InteractionFingerprint does, '' when missing."""
+    cells = np.full(shape, '', dtype=object)
+    if not len(values):
+        return cells
+    # back to the 3 significant digits of the encoded (float64) values
+    values = np.char.mod('%.3g', values.astype(float)).astype(float)
+    clash = is_clash[cols]
+    texts = np.char.mod('%.12g', values)  # as str(float)
+    no_dot = np.char.find(texts, '.') + np.char.find(texts, 'e') == -2
+    texts = np.where(no_dot, np.char.add(texts, '.0'), texts)
+    percents = np.char.mod('%.0f%%', values * 100)
+    cells[rows, cols] = np.where(clash, percents, texts)
+    return cells
+
+
+def _ifp_colors(matrix, inames):
+    """Return the RGBA color of every cell of a normalized matrix."""
+    colors = np.empty(matrix.shape + (4, ), dtype=np.uint8)
+    inames = np.array(inames)
+    for iname in set(inames):
+        cols = inames == iname
+        # start at a darker color; missing (-1) ones are clipped to white
+        colors[:, cols] = IFP_COLOR_SCHEMES[iname](
+            matrix[:, cols] * .8 + .2, bytes=True)
+    return colors
+
+
+def _row_to_bins(row):
+    return [None if np.isnan(value) else float(format(value, '.3g'))
+            for value in row.tolist()]
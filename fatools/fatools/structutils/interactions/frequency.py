@@ -0,0 +1,101 @@
+import csv
+from collections import namedtuple
+
+from fatools.structutils.interactions import curate_interactions
+from fatools.structutils.interactions.fingerprints import \
+    _interaction_bin_desc
+
+ContactFrequency = namedtuple('ContactFrequency', [
+    'name', 'resnum', 'rescode', 'fragment', 'count', 'nposes',
+    'occupancy', 'min_distance', 'mean_distance'])
+
+_COUNT, _NPOSES, _MIN, _SUM = range(4)
+
+
+class ContactFrequencyAccumulator(object):
+    """Accumulate how often receptor fragments interact over many poses.
+
+    Interactions are consumed one pose at a time and only running
+    statistics are kept per bin, i.e., per (interaction name, residue,
+    fragment) as in `InteractionFingerprintMatrix`: the number of
+    interactions, the number of poses with at least one of them and the
+    minimum and sum of their distances. Memory is thus bounded by the
+    number of bins, not by the number of poses, and accumulators filled by
+    parallel workers can be combined with `merge`.
+
+    Examples
+    --------
+    >>> accumulator = ContactFrequencyAccumulator()
+    >>> for interactions in interaction_matrix:  # doctest: +SKIP
+    ...     accumulator.add(interactions)
+    >>> accumulator.frequencies()  # doctest: +SKIP
+
+    """
+    def __init__(self):
+        self._nposes = 0
+        self._stats = dict()
+
+    nposes = property(lambda self: self._nposes)
+
+    def __len__(self):
+        return len(self._stats)
+
+    def add(self, interactions):
+        """Accumulate the interactions of one pose.
+
+        Interactions are curated first, as for interaction fingerprints.
+
+        """
+        stats, seen = self._stats, set()
+        for interaction in curate_interactions(interactions):
+            bin_desc = _interaction_bin_desc(interaction)
+            distance = float(interaction.distance)
+            bin_stats = stats.get(bin_desc)
+            if bin_stats is None:
+                bin_stats = stats[bin_desc] = [0, 0, distance, 0.]
+            bin_stats[_COUNT] += 1
+            bin_stats[_SUM] += distance
+            if distance < bin_stats[_MIN]:
+                bin_stats[_MIN] = distance
+            if bin_desc not in seen:
+                bin_stats[_NPOSES] += 1
+                seen.add(bin_desc)
+        self._nposes += 1
+
+    def update(self, interaction_matrix):
+        """Accumulate the interactions of several poses."""
+        for interactions in interaction_matrix:
+            self.add(interactions)
+
+    def merge(self, other):
+        """Add the statistics of another accumulator to this one."""
+        stats = self._stats
+        for bin_desc, other_stats in other._stats.items():
+            bin_stats = stats.get(bin_desc)
+            if bin_stats is None:
+                stats[bin_desc] = list(other_stats)
+                continue
+            bin_stats[_COUNT] += other_stats[_COUNT]
+            bin_stats[_NPOSES] += other_stats[_NPOSES]
+            bin_stats[_MIN] = min(bin_stats[_MIN], other_stats[_MIN])
+            bin_stats[_SUM] += other_stats[_SUM]
+        self._nposes += other._nposes
+        return self
+
+    def frequencies(self):
+        """Return the statistics of every bin as `ContactFrequency` tuples,
+        sorted by residue number, interaction name and fragment."""
+        frequencies = []
+        for bin_desc, (count, nposes, min_distance, distance_sum) in \
+                self._stats.items():
+            frequencies.append(ContactFrequency(*bin_desc + (
+                count, nposes, float(nposes) / self._nposes, min_distance,
+                distance_sum / count)))
+        return tuple(sorted(frequencies, key=lambda f: (
+            f.resnum, f.rescode, f.name, f.fragment)))
+
+    def write_csv(self, filepath):
+        with open(filepath, 'wb') as csvfile:
+            csvwriter = csv.writer(csvfile)
+            csvwriter.writerow(ContactFrequency._fields)
+            csvwriter.writerows(self.frequencies())
@@ -0,0 +1,269 @@
+import zlib
+from collections import namedtuple
+
+import numpy as np
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.asl import structure_identity
+from fatools.utils.caching import LRUCache
+
+RING_CACHE_SIZE = 64
+
+
+class ChargedAtoms(namedtuple('ChargedAtoms', 'indexes charges')):
+    """Charged atoms of a structure.
+
+    Attributes
+    ----------
+    indexes : numpy.ndarray
+        Sorted atom indexes.
+    charges : numpy.ndarray
+        Sign of the charge of every atom (1 or -1).
+
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.indexes)
+
+    @property
+    def cations(self):
+        return self.indexes[self.charges > 0]
+
+    def subset(self, atom_idxs):
+        """Return the charged atoms among `atom_idxs`."""
+        mask = np.in1d(self.indexes, list(atom_idxs))
+        return ChargedAtoms(self.indexes[mask], self.charges[mask])
+
+
+class RingGeometry(namedtuple('RingGeometry',
+                              'atom_indexes centroids normals')):
+    """Aromatic rings of a structure with their geometry.
+
+    Attributes
+    ----------
+    atom_indexes : tuple of tuple of int
+        Atom indexes of every ring.
+    centroids, normals : numpy.ndarray
+        Centroid and best-fit plane normal of every ring with shape
+        (number of rings, 3), or (p, number of rings, 3) for a batch of
+        poses.
+
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.atom_indexes)
+
+    def subset(self, atom_idxs):
+        """Return the rings with all of their atoms among `atom_idxs`."""
+        atom_idxs = frozenset(atom_idxs)
+        ring_idxs = [k for k, ring in enumerate(self.atom_indexes)
+                     if atom_idxs.issuperset(ring)]
+        return RingGeometry(
+            tuple(self.atom_indexes[k] for k in ring_idxs),
+            self.centroids[..., ring_idxs, :], self.normals[..., ring_idxs, :])
+
+
+class RingCache(object):
+    """Bounded cache of the aromatic rings of structures.
+
+    Rings are perceived once per structure and topology: entries are keyed
+    by the structure identity (its handle) and the topology checksum of
+    its `StructureArrays` (elements, formal charges and bonds), so a
+    structure reusing the handle of a freed one, or edited in place, is
+    perceived again. Centroids
+    and normals are kept along with a checksum of the coordinates, so
+    moving atoms only refreshes the ring geometry. The least recently used
+    structures are evicted first once `maxsize` is reached.
+
+    Poses of the same molecule stored as coordinate arrays can be measured
+    in a single call with `measure`, reusing the rings perceived on a
+    template structure.
+
+    """
+    def __init__(self, maxsize=RING_CACHE_SIZE):
+        self._cache = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def info(self):
+        """Return the hit/miss statistics as a `CacheInfo`."""
+        return self._cache.info()
+
+    def invalidate(self, st):
+        """Discard the cached rings of the given structure."""
+        identity = structure_identity(st)
+        for key in [key for key in self._cache.keys()
+                    if key[0] == identity]:
+            self._cache.discard(key)
+
+    def measure(self, st, coords):
+        """Return the rings of `st` measured on other coordinates.
+
+        Parameters
+        ----------
+        st : schrodinger.structure.Structure
+            Structure the rings are perceived on.
+        coords : array_like
+            Coordinates of the atoms of `st` with shape (n, 3), or
+            (p, n, 3) for a batch of poses.
+
+        Returns
+        -------
+        RingGeometry
+
+        """
+        rings = self._entry(st).rings
+        return RingGeometry(rings, *measure_rings(coords, rings))
+
+    def rings(self, st):
+        """Return the `RingGeometry` of the aromatic rings of `st`."""
+        entry = self._entry(st)
+        xyz = st.getXYZ(copy=False)
+        checksum = zlib.crc32(xyz.tobytes())
+        if entry.checksum != checksum:
+            entry.centroids, entry.normals = measure_rings(xyz, entry.rings)
+            entry.checksum = checksum
+        return RingGeometry(entry.rings, entry.centroids, entry.normals)
+
+    def _entry(self, st):
+        key = (structure_identity(st),
+               get_structure_arrays(st).topology_checksum)
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._cache[key] = _RingCacheEntry(
+                find_aromatic_rings(st))
+        return entry
+
+
+class _RingCacheEntry(object):
+    __slots__ = ('rings', 'checksum', 'centroids', 'normals')
+
+    def __init__(self, rings):
+        self.rings = rings
+        self.checksum = self.centroids = self.normals = None
+
+
+RING_CACHE = RingCache()
+
+
+def atom_coordinates(st, atom_idxs):
+    """Return the coordinates of the given atoms (1-based indexes) of a
+    structure or `StructureArrays`."""
+    coords = get_structure_arrays(st).coords
+    return coords[np.asarray(atom_idxs, dtype=np.intp) - 1]
+
+
+def find_charged_atoms(st, atoms=None, resonance=True):
+    """Find the charged atoms of a structure.
+
+    Atoms with a formal charge are charged, unless they are bonded to an
+    atom with the opposite charge (e.g., nitro groups). With `resonance`,
+    the charge is spread over the terminal atoms of the same element
+    sharing a neighbor with a charged atom, so both oxygens of a
+    carboxylate and both terminal nitrogens of a guanidinium count.
+
+    Parameters
+    ----------
+    st : schrodinger.structure.Structure or StructureArrays
+        Structure.
+    atoms : iterable of int, optional
+        Indexes of the atoms to consider. Defaults to all atoms.
+    resonance : bool, optional
+        Whether to spread the charges over resonance partners.
+
+    Returns
+    -------
+    ChargedAtoms
+        Indexes and charge signs of the charged atoms.
+
+    """
+    arrays = get_structure_arrays(st)
+    selected = np.ones(len(arrays), dtype=bool)
+    if atoms is not None:
+        selected[:] = False
+        selected[np.asarray(list(atoms), dtype=np.intp) - 1] = True
+    charges = np.sign(arrays.formal_charges)
+    bonded1, bonded2 = arrays.bonds.T - 1
+    zwitterions = charges[bonded1] * charges[bonded2] < 0
+    signs = np.where(selected, charges, 0)
+    signs[bonded1[zwitterions]] = signs[bonded2[zwitterions]] = 0
+    if resonance:
+        signs = _spread_resonance_charges(arrays, signs, selected)
+    indexes = np.nonzero(signs)[0]
+    return ChargedAtoms(indexes + 1, signs[indexes].astype(np.intp))
+
+
+def find_aromatic_rings(st, atoms=None):
+    """Return the atom indexes of the aromatic rings of a structure.
+
+    Only rings with all of their atoms among `atoms` (all atoms by
+    default) are returned.
+
+    """
+    selected = None if atoms is None else frozenset(atoms)
+    rings = []
+    for ring in st.ring:
+        if not ring.isAromatic():
+            continue
+        ring_idxs = tuple(ring.getAtomIndices())
+        if selected is None or selected.issuperset(ring_idxs):
+            rings.append(ring_idxs)
+    return tuple(rings)
+
+
+def measure_rings(coords, rings):
+    """Measure the centroid and normal of rings.
+
+    The normal is the one of the plane that best fits the ring atoms (the
+    last right singular vector of their centered coordinates), so puckered
+    rings are handled too. Rings are processed in one vectorized step per
+    ring size.
+
+    Parameters
+    ----------
+    coords : array_like
+        Coordinates of all the atoms of the structure with shape (n, 3), or
+        (p, n, 3) for a batch of poses.
+    rings : sequence of sequence of int
+        Atom indexes (1-based) of every ring.
+
+    Returns
+    -------
+    centroids, normals : numpy.ndarray
+        Arrays with shape (number of rings, 3), or (p, number of rings, 3).
+
+    """
+    coords = np.asarray(coords, dtype=float)
+    shape = coords.shape[:-2] + (len(rings), 3)
+    centroids, normals = np.empty(shape), np.empty(shape)
+    for size in set(map(len, rings)):
+        ring_idxs = [k for k, ring in enumerate(rings) if len(ring) == size]
+        atom_idxs = np.array([rings[k] for k in ring_idxs], dtype=np.intp)
+        points = coords[..., atom_idxs - 1, :]
+        centers = points.mean(axis=-2)
+        _, _, vh = np.linalg.svd(points - centers[..., np.newaxis, :])
+        centroids[..., ring_idxs, :] = centers
+        normals[..., ring_idxs, :] = vh[..., -1, :]
+    return centroids, normals
+
+
+def _spread_resonance_charges(arrays, signs, selected):
+    heavy = arrays.elements != 'H'
+    bonded1, bonded2 = arrays.bonds.T - 1
+    heavy_degrees = np.bincount(
+        np.concatenate([bonded1[heavy[bonded2]], bonded2[heavy[bonded1]]]),
+        minlength=len(arrays))
+    partners = selected & (arrays.formal_charges == 0) & (heavy_degrees == 1)
+    spread = signs.copy()
+    for i in np.nonzero(signs)[0]:
+        for center in arrays.bonded_atoms(i + 1):
+            for j in arrays.bonded_atoms(center) - 1:
+                if partners[j] and not spread[j] and \
+                        arrays.elements[j] == arrays.elements[i]:
+                    spread[j] = signs[i]
+    return spread
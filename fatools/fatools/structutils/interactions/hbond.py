@@ -1,18 +1,26 @@
-from fatools.structutils import get_atoms
-from fatools.structutils.interactions import (InteractionCriteria,
-                                              register_finder)
+from collections import namedtuple
+
+import numpy as np
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.interactions import (
+    InteractionCriteria, InteractionCriteriaPreset, register_finder)
 from fatools.structutils.interactions.finder import PairwiseInteractionFinder
 from fatools.structutils.interactions.interaction import PairwiseInteraction
 from fatools.utils.caching import cached_property
-from fatools.utils.enum import Enum
-from schrodinger.structutils.analyze import evaluate_asl, match_hbond
+from fatools.utils.geometry import (find_neighbor_pairs, measure_angles,
+                                    measure_distances)
+from schrodinger.structutils.analyze import match_hbond
 
 H_POLAR_ASL = 'atom.ele H and not /C0-H0/'
 HBOND_ACCEPTOR_ASL = 'not (atom.ele C H)'
 HBOND_ATOMS_ASL = '({}) or ({})'.format(HBOND_ACCEPTOR_ASL, H_POLAR_ASL)
 
+HydrogenBondMatches = namedtuple('HydrogenBondMatches', [
+    'hydrogen_indexes', 'acceptor_indexes', 'distances', 'donor_angles',
+    'acceptor_angles'])
+
 
-class HydrogenBondCriteria(Enum):
+class HydrogenBondCriteria(InteractionCriteriaPreset):
     maestro = InteractionCriteria(
         max_distance=2.8, min_donor_angle=120, min_acceptor_angle=90)
     glide = InteractionCriteria(
@@ -22,6 +30,7 @@ HBondCriteria = HydrogenBondCriteria
 
 
 class HydrogenBondInteraction(PairwiseInteraction):
+    __slots__ = ()
     __interaction_name__ = 'h-bond'
 
     H = hydrogen = property(lambda self: self._sorted_atoms[0])
@@ -34,6 +43,7 @@ HBondInteraction = HydrogenBondInteraction
 
 
 class HydrogenBondFinder(PairwiseInteractionFinder):
+    __atoms_asl__ = HBOND_ATOMS_ASL
     __criteria__ = HydrogenBondCriteria
     __interaction__ = HydrogenBondInteraction
 
@@ -44,10 +54,133 @@ class HydrogenBondFinder(PairwiseInteractionFinder):
             acceptor_angle=self.criteria.min_acceptor_angle)
         return match_hbond(atom1, atom2, **constraints)
 
-    @staticmethod
-    def _setup_atom_sets(st1, as1, st2, as2):
-        as1 = frozenset(evaluate_asl(st1, HBOND_ATOMS_ASL)) & frozenset(as1)
-        as2 = frozenset(evaluate_asl(st2, HBOND_ATOMS_ASL)) & frozenset(as2)
-        return get_atoms(st1, as1), get_atoms(st2, as2)
+    def _search_atom_indexes(self, st1, as1, st2, as2):
+        arrays1, arrays2 = get_structure_arrays(st1), get_structure_arrays(st2)
+        hs1, accs1 = _split_hbond_atoms(arrays1, as1)
+        hs2, accs2 = _split_hbond_atoms(arrays2, as2)
+        interactions = []
+        for hs, h_arrays, accs, acc_arrays, h_first in (
+                (hs1, arrays1, accs2, arrays2, True),
+                (hs2, arrays2, accs1, arrays1, False)):
+            if not len(hs) or not len(accs):
+                continue
+            coords = _hbond_coordinates(h_arrays, hs, acc_arrays, accs)
+            matches = search_hbonds(*coords, criteria=self.criteria,
+                                    smallest_acceptor_angle=True)
+            # selected as `match_hbond` does, but the acceptor angle is
+            # reported as `HydrogenBondInteraction` measures it
+            h_idxs, acc_idxs = matches[:2]
+            acceptor_angles = _min_acceptor_angles(
+                coords[0][h_idxs], coords[2][acc_idxs],
+                coords[3][acc_idxs, :1])
+            for i, j, d, dang, aang in zip(
+                    h_idxs, acc_idxs, matches.distances,
+                    matches.donor_angles, acceptor_angles):
+                atoms = (hs[i], accs[j]) if h_first else (accs[j], hs[i])
+                interactions.append(self.__interaction__(
+                    st1, int(atoms[0]), st2, int(atoms[1]),
+                    distance=float(d),
+                    donor_angle=float(dang),
+                    acceptor_angle=None if np.isnan(aang) else float(aang)))
+        return interactions
 HBondFinder = HydrogenBondFinder
 register_finder(HydrogenBondFinder)
+
+
+def search_hbonds(hydrogens, donors, acceptors, acceptor_neighbors=None,
+                  criteria=None, smallest_acceptor_angle=False):
+    """Find hydrogen bonds between arrays of atom coordinates.
+
+    Every hydrogen is paired with every acceptor within the maximum
+    distance of the criteria, and the H...A distance, D-H...A (donor)
+    angle and H...A-X (acceptor) angle are computed for all pairs at once.
+    As for `HydrogenBondInteraction`, the acceptor angle is measured with
+    the first neighbor of the acceptor unless `smallest_acceptor_angle` is
+    set.
+
+    Parameters
+    ----------
+    hydrogens : array_like
+        Coordinates of the polar hydrogens with shape (n, 3).
+    donors : array_like
+        Coordinates of the atom bonded to each hydrogen, shape (n, 3).
+    acceptors : array_like
+        Coordinates of the acceptors with shape (m, 3).
+    acceptor_neighbors : array_like, optional
+        Coordinates of the atoms bonded to each acceptor with shape
+        (m, k, 3), padded with NaN for acceptors with less than k
+        neighbors, or (m, 3) for a single neighbor per acceptor.
+        Acceptors without neighbors have NaN acceptor angles, which are
+        not checked against the criteria.
+    criteria : InteractionCriteria or str, optional
+        Criteria instance or name of a `HydrogenBondCriteria` member.
+        Defaults to ``HydrogenBondCriteria.default``.
+    smallest_acceptor_angle : bool, optional
+        Use the smallest acceptor angle over all the acceptor neighbors,
+        as Schrodinger's `match_hbond` does, instead of the angle with the
+        first one.
+
+    Returns
+    -------
+    HydrogenBondMatches
+        Hydrogen and acceptor indexes plus measurements of the matching
+        pairs, sorted by hydrogen index and then by acceptor index.
+
+    """
+    criteria = HydrogenBondFinder._setup_criteria(criteria, {})
+    hydrogens = np.asarray(hydrogens, dtype=float).reshape(-1, 3)
+    donors = np.asarray(donors, dtype=float).reshape(-1, 3)
+    acceptors = np.asarray(acceptors, dtype=float).reshape(-1, 3)
+    if acceptor_neighbors is None:
+        acceptor_neighbors = np.empty((len(acceptors), 0, 3))
+    acceptor_neighbors = np.asarray(acceptor_neighbors, dtype=float)
+    if acceptor_neighbors.ndim == 2:
+        acceptor_neighbors = acceptor_neighbors[:, np.newaxis]
+    if not smallest_acceptor_angle:
+        acceptor_neighbors = acceptor_neighbors[:, :1]
+
+    max_distance = getattr(criteria, 'max_distance', None)
+    if max_distance is not None:
+        h_idxs, acc_idxs = find_neighbor_pairs(
+            hydrogens, acceptors, max_distance)
+    else:
+        h_idxs, acc_idxs = [idxs.ravel() for idxs in np.indices(
+            (len(hydrogens), len(acceptors)))]
+
+    hs, accs = hydrogens[h_idxs], acceptors[acc_idxs]
+    distances = measure_distances(hs, accs)
+    donor_angles = measure_angles(donors[h_idxs], hs, accs)
+    acceptor_angles = _min_acceptor_angles(
+        hs, accs, acceptor_neighbors[acc_idxs])
+
+    mask = criteria.match_arrays(dict(
+        distance=distances,
+        donor_angle=donor_angles,
+        acceptor_angle=acceptor_angles))
+    return HydrogenBondMatches(h_idxs[mask], acc_idxs[mask], distances[mask],
+                               donor_angles[mask], acceptor_angles[mask])
+
+
+def _hbond_coordinates(h_arrays, hydrogens, acc_arrays, acceptors):
+    donors = h_arrays.neighbor_matrix(hydrogens, 1)[:, 0]
+    neighbors = acc_arrays.neighbor_matrix(acceptors)
+    return (h_arrays.coordinates(hydrogens), h_arrays.coordinates(donors),
+            acc_arrays.coordinates(acceptors),
+            acc_arrays.coordinates(neighbors))
+
+
+def _min_acceptor_angles(hydrogens, acceptors, acceptor_neighbors):
+    angles = measure_angles(hydrogens[:, np.newaxis],
+                            acceptors[:, np.newaxis],
+                            acceptor_neighbors)
+    # missing (NaN-padded) neighbors must not win the minimum
+    angles = np.hstack([np.where(np.isnan(angles), np.inf, angles),
+                        np.full((len(angles), 1), np.inf)]).min(axis=1)
+    angles[np.isinf(angles)] = np.nan
+    return angles
+
+
+def _split_hbond_atoms(arrays, atom_idxs):
+    atom_idxs = np.asarray(atom_idxs, dtype=np.intp)
+    is_hydrogen = arrays.elements[atom_idxs - 1] == 'H'
+    return atom_idxs[is_hydrogen], atom_idxs[~is_hydrogen]
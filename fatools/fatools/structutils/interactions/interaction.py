@@ -10,21 +10,50 @@ from schrodinger.structutils.measure import (measure_bond_angle,
 builtin.extend_tuple()
 
 
-# TODO add docstring
 class Interaction(object):
+    """Interaction between two fragments (atoms, rings, ...) of structures.
+
+    Interactions are compact records: single atoms are kept as indexes into
+    their structure and the measurements as a tuple ordered like
+    `__measures__`. Atoms are wrapped again on every access to `fragments`,
+    and labels (e.g., `description`, `recep_desc`) are computed through the
+    structures on demand and cached in a dict that is only created when
+    needed, so large sets of interactions (e.g., the steric clashes of a
+    pose) stay small in memory.
+
+    Subclasses must declare ``__slots__`` too.
+
+    """
+    # one slot per structure/fragment saves the memory of two tuples
+    __slots__ = ('_st1', '_st2', '_ref1', '_ref2', '_values', '_extra',
+                 '_cache')
+    __measures__ = ()
+
     def __init__(self, st1, fragment1, st2, fragment2, **measurements):
-        self._structures = (st1, st2)
-        self._fragments = (wrap_atom_if_needed(fragment1, st1),
-                           wrap_atom_if_needed(fragment2, st2))
-        self._measurements = measurements
+        self._st1, self._st2 = st1, st2
+        self._ref1 = _fragment_ref(fragment1)
+        self._ref2 = _fragment_ref(fragment2)
+        self._extra = measurements  # visible to the calculators
+        self._cache = None
         self._after_initialize()
-        self._calculate_missing_measurements()
+        for measure in self.__measures__:
+            if measure not in measurements:
+                calculator = getattr(self, 'calculate_' + measure)
+                measurements[measure] = calculator(self._fragments)
+        self._values = tuple([measurements.pop(measure)
+                              for measure in self.__measures__])
+        self._extra = measurements or None
+        self._cache = None  # drop wrappers created by the calculators
 
     def __getattr__(self, name):
-        try:
-            return self._measurements[name]
-        except KeyError:
-            return super(Interaction, self).__getattribute__(name)
+        if not name.startswith('_'):
+            values = getattr(self, '_values', None)
+            if values is not None and name in self.__measures__:
+                return values[self.__measures__.index(name)]
+            extra = getattr(self, '_extra', None)
+            if extra and name in extra:
+                return extra[name]
+        return super(Interaction, self).__getattribute__(name)
 
     def __str__(self):
         return self.description
@@ -38,10 +67,11 @@ class Interaction(object):
 
     abbr = abbreviation
 
-    @cached_property
+    @property
     def atom_indexes(self):
-        get_idxs = lambda f: getattr(f, 'atom_indexes', (f.index, ))
-        return self._fragments.map(get_idxs)
+        return tuple([(ref, ) if isinstance(ref, int) else
+                      getattr(ref, 'atom_indexes', (ref.index, ))
+                      for ref in self._fragment_refs])
 
     @cached_property
     def description(self):
@@ -56,11 +86,13 @@ class Interaction(object):
 
     @property
     def measurement_values(self):
-        return tuple(self._measurements[k] for k in self.__measures__)
+        return self._values
 
     @property
     def measurements(self):
-        return self._measurements.copy()
+        measurements = dict(zip(self.__measures__, self._values))
+        measurements.update(self._extra or ())
+        return measurements
 
     @property
     def name(self):
@@ -70,30 +102,36 @@ class Interaction(object):
     def recep_desc(self):
         return get_interaction_fragment_label(self.fragments[0])
 
-    @cached_property
+    @property
     def residues(self):
-        def get_resnum(f):
+        def get_resnum(ref, st):
+            if isinstance(ref, int):  # no need to wrap the atom
+                return st.atom[ref].resnum
             try:
-                return f.resnum
+                return ref.resnum
             except AttributeError:  # for atom collections
-                return f.atom_resnum
-        return self._fragments.map(get_resnum).flatten().uniq()
+                return ref.atom_resnum
+        return tuple(map(get_resnum, self._fragment_refs,
+                         self._structures)).flatten().uniq()
 
     @property
     def structures(self):
         return tuple(self._structures)
 
+    _fragment_refs = property(lambda self: (self._ref1, self._ref2))
+    _structures = property(lambda self: (self._st1, self._st2))
+
+    @property
+    def _fragments(self):
+        return tuple(wrap_atom_if_needed(ref, st)
+                     for ref, st in zip(self._fragment_refs, self._structures))
+
     def _after_initialize(self):
         pass
 
-    def _calculate_missing_measurements(self):
-        missing_measures = set(self.__measures__) - set(self._measurements)
-        for measure in missing_measures:
-            calculator = getattr(self, 'calculate_' + measure)
-            self._measurements[measure] = calculator(self._fragments)
-
 
 class PairwiseInteraction(Interaction):
+    __slots__ = ()
     __measures__ = ('distance', 'donor_angle', 'acceptor_angle')
 
     acceptor = property(lambda self: self._sorted_atoms[1])
@@ -115,6 +153,14 @@ class PairwiseInteraction(Interaction):
         return measure_bond_angle(shared.bond[1].atom2, shared, acc)
 
 
+def _fragment_ref(fragment):
+    # atoms are stored by index and wrapped again on demand
+    if isinstance(fragment, AtomCollection) or \
+            not hasattr(fragment, 'index'):
+        return fragment
+    return fragment.index
+
+
 def get_interaction_fragment_label(recep_f):
     if isinstance(recep_f, Ring):
         rescode, resnum = recep_f.pdbcode, recep_f.resnum
@@ -1,26 +1,44 @@
+from collections import namedtuple
+
+import numpy as np
 from fatools.structure import Ring
 from fatools.structutils import get_atoms
-from fatools.structutils.interactions import (InteractionCriteria,
-                                              register_finder)
+from fatools.structutils.interactions import (
+    InteractionCriteria, InteractionCriteriaPreset, register_finder)
 from fatools.structutils.interactions.finder import InteractionFinder
+from fatools.structutils.interactions.groups import (RING_CACHE,
+                                                     atom_coordinates,
+                                                     find_charged_atoms)
 from fatools.structutils.interactions.interaction import Interaction
-from fatools.utils.enum import Enum
-from schrodinger.structutils.interactions import (find_pi_cation_interactions,
-                                                  find_pi_pi_interactions)
+from fatools.utils.geometry import find_batch_neighbor_pairs, gather_points
+
+# ring plane angles of pi stacking, as in Maestro
+PI_PI_FACE_TO_FACE_MAX_ANGLE = 30
+PI_PI_EDGE_TO_FACE_MIN_ANGLE = 60
+
+CationPiMatches = namedtuple('CationPiMatches', [
+    'pose_indexes', 'cation_indexes', 'ring_indexes', 'distances', 'angles'])
+PiPiMatches = namedtuple('PiPiMatches', [
+    'pose_indexes', 'indexes1', 'indexes2', 'distances', 'angles',
+    'face_to_face'])
 
 
-class CationPiCriteria(Enum):
+class CationPiCriteria(InteractionCriteriaPreset):
+    # Schrodinger's defaults for pi-cation interactions
     default = InteractionCriteria(
-        max_distance=30)
+        max_distance=6.6,
+        max_angle=30)
 
 
-class PiPiCriteria(Enum):
+class PiPiCriteria(InteractionCriteriaPreset):
+    # Maestro's centroid distances for pi stacking, in angstroms
     default = InteractionCriteria(
-        max_face_to_face_distance=30,
-        max_edge_to_face_distance=60)
+        max_face_to_face_distance=4.4,
+        max_edge_to_face_distance=5.5)
 
 
 class CationPiInteraction(Interaction):
+    __slots__ = ()
     __interaction_name__ = 'cation-pi'
     __measures__ = ('distance', 'angle')
 
@@ -29,6 +47,7 @@ class CationPiInteraction(Interaction):
 
 
 class PiPiInteraction(Interaction):
+    __slots__ = ()
     __interaction_name__ = 'pi-pi'
     __measures__ = ('distance', 'angle', 'face_to_face')
 
@@ -36,55 +55,196 @@ class PiPiInteraction(Interaction):
 
 
 class CationPiFinder(InteractionFinder):
+    """Find cation-pi interactions between cations and aromatic rings.
+
+    Cations (atoms with a positive formal charge) are perceived once per
+    search (once per receptor with `search_context`), aromatic rings and
+    their geometry come from `RING_CACHE`, and all the candidate pairs are
+    measured at once by `search_cation_pi`. Interactions always have the
+    cation as first fragment.
+
+    """
     __criteria__ = CationPiCriteria
     __interaction__ = CationPiInteraction
 
+    def _search_context(self, receptor_ctx, st2, as2):
+        pocket = receptor_ctx.pocket(st2, as2)
+        if not pocket:
+            return ()
+        cations1 = receptor_ctx.charged_atoms(resonance=False) \
+            .subset(pocket).cations
+        rings1 = receptor_ctx.aromatic_rings().subset(pocket)
+        return self._search_groups(
+            receptor_ctx.structure, cations1, rings1,
+            st2, _find_cations(st2, as2), RING_CACHE.rings(st2).subset(as2))
+
     def _search_interactions(self, st1, as1, st2, as2):
-        sst1, sst2 = st1.extract(as1), st2.extract(as2)
-        sst1._st_id, sst2._st_id = 1, 2
-        c_pi_interactions = find_pi_cation_interactions(sst1, sst2)
-        c_pi_interactions = [c_pi for c_pi in c_pi_interactions
-                             if self.criteria.match_measurements(
-                                 distance=c_pi.distance)]
-        return tuple(CationPiFinder._map_interaction(c_pi, st1, as1, st2, as2)
-                     for c_pi in c_pi_interactions)
-
-    @staticmethod
-    def _map_interaction(c_pi, st1, as1, st2, as2):
-        if c_pi.cation_structure._st_id == 2:
-            st1, st2 = st2, st1
-            as1, as2 = as2, as1
-        as1 = get_atoms(st1, [as1[i - 1] for i in c_pi.cation_centroid.atoms])
-        as2 = get_atoms(st2, [as2[i - 1] for i in c_pi.pi_centroid.atoms])
-        ring = Ring(st2, as2, c_pi.pi_centroid.xyz)
-        measurements = dict(distance=c_pi.distance, angle=c_pi.angle)
-        return CationPiInteraction(st1, as1[0], st2, ring, **measurements)
+        return self._search_groups(
+            st1, _find_cations(st1, as1), RING_CACHE.rings(st1).subset(as1),
+            st2, _find_cations(st2, as2), RING_CACHE.rings(st2).subset(as2))
+
+    def _search_groups(self, st1, cations1, rings1, st2, cations2, rings2):
+        interactions = []
+        for cation_st, cations, ring_st, rings in (
+                (st1, cations1, st2, rings2), (st2, cations2, st1, rings1)):
+            if not len(cations) or not len(rings):
+                continue
+            matches = search_cation_pi(atom_coordinates(cation_st, cations),
+                                       rings.centroids, rings.normals,
+                                       self.criteria)
+            for _, i, j, d, angle in zip(*matches):
+                interactions.append(CationPiInteraction(
+                    cation_st, int(cations[i]),
+                    ring_st, _ring_fragment(ring_st, rings, j),
+                    distance=float(d), angle=float(angle)))
+        return interactions
 register_finder(CationPiFinder)
 
 
 class PiPiFinder(InteractionFinder):
+    """Find pi stacking between aromatic rings.
+
+    Aromatic rings and their geometry come from `RING_CACHE` (and from the
+    receptor context with `search_context`), so rings are perceived once
+    per structure, and all the ring pairs are measured at once by
+    `search_pi_pi`.
+
+    """
     __criteria__ = PiPiCriteria
     __interaction__ = PiPiInteraction
 
+    def _search_context(self, receptor_ctx, st2, as2):
+        pocket = receptor_ctx.pocket(st2, as2)
+        if not pocket:
+            return ()
+        return self._search_rings(
+            receptor_ctx.structure,
+            receptor_ctx.aromatic_rings().subset(pocket),
+            st2, RING_CACHE.rings(st2).subset(as2))
+
     def _search_interactions(self, st1, as1, st2, as2):
-        sst1, sst2 = st1.extract(as1), st2.extract(as2)
-        constraints = dict(
-            max_ftf_dist=self.criteria.max_face_to_face_distance,
-            max_etf_dist=self.criteria.max_edge_to_face_distance)
-        pi_pi_interactions = find_pi_pi_interactions(sst1, sst2, **constraints)
-        return tuple(PiPiFinder._map_interaction(pi_pi, st1, as1, st2, as2)
-                     for pi_pi in pi_pi_interactions)
-
-    @staticmethod
-    def _map_interaction(pi_pi, st1, as1, st2, as2):
-        as1 = get_atoms(st1, [as1[idx - 1] for idx in pi_pi.ring1.atoms])
-        as2 = get_atoms(st2, [as2[idx - 1] for idx in pi_pi.ring2.atoms])
-        ring1 = Ring(st1, as1, pi_pi.ring1.xyz)
-        ring2 = Ring(st2, as2, pi_pi.ring2.xyz)
-        return PiPiInteraction(
-            st1, ring1,
-            st2, ring2,
-            distance=pi_pi.distance,
-            angle=pi_pi.angle,
-            face_to_face=pi_pi.face_to_face)
+        return self._search_rings(st1, RING_CACHE.rings(st1).subset(as1),
+                                  st2, RING_CACHE.rings(st2).subset(as2))
+
+    def _search_rings(self, st1, rings1, st2, rings2):
+        if not len(rings1) or not len(rings2):
+            return ()
+        matches = search_pi_pi(rings1.centroids, rings1.normals,
+                               rings2.centroids, rings2.normals,
+                               self.criteria)
+        interactions = []
+        for _, i, j, d, angle, face_to_face in zip(*matches):
+            if st1 is st2 and \
+                    rings1.atom_indexes[i] == rings2.atom_indexes[j]:
+                continue  # a ring does not stack with itself
+            interactions.append(PiPiInteraction(
+                st1, _ring_fragment(st1, rings1, i),
+                st2, _ring_fragment(st2, rings2, j),
+                distance=float(d), angle=float(angle),
+                face_to_face=bool(face_to_face)))
+        return interactions
 register_finder(PiPiFinder)
+
+
+def search_cation_pi(cations, centroids, normals, criteria=None):
+    """Find cation-pi interactions between arrays of cations and rings.
+
+    The angle of a pair is the one between the ring normal and the
+    centroid-cation vector, folded into [0, 90] degrees, so a cation right
+    above the ring has a null angle.
+
+    Parameters
+    ----------
+    cations : array_like
+        Coordinates of the cations with shape (n, 3), or (p, n, 3) for a
+        batch of poses (see `find_batch_neighbor_pairs`).
+    centroids, normals : array_like
+        Centroid and normal of every ring with shape (m, 3), or (p, m, 3)
+        for a batch of poses (see `measure_rings`).
+    criteria : InteractionCriteria or str, optional
+        Criteria instance or name of a `CationPiCriteria` member.
+        Defaults to ``CationPiCriteria.default``.
+
+    Returns
+    -------
+    CationPiMatches
+        Pose indexes, cation and ring indexes plus measurements of the
+        matching pairs, sorted by pose, cation and ring indexes.
+
+    """
+    criteria = CationPiFinder._setup_criteria(criteria, {})
+    poses, cation_idxs, ring_idxs = find_batch_neighbor_pairs(
+        cations, centroids, criteria.max_distance)
+    vectors = gather_points(cations, poses, cation_idxs) - \
+        gather_points(centroids, poses, ring_idxs)
+    ring_normals = gather_points(normals, poses, ring_idxs)
+    distances = np.sqrt((vectors ** 2).sum(axis=-1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cosines = np.abs((vectors * ring_normals).sum(axis=-1)) / (
+            distances * np.sqrt((ring_normals ** 2).sum(axis=-1)))
+    angles = np.degrees(np.arccos(np.clip(cosines, 0, 1)))
+    mask = criteria.match_arrays(
+        distance=distances, angle=angles)
+    return CationPiMatches(poses[mask], cation_idxs[mask], ring_idxs[mask],
+                           distances[mask], angles[mask])
+
+
+def search_pi_pi(centroids1, normals1, centroids2, normals2,
+                 criteria=None):
+    """Find pi stacking between arrays of rings.
+
+    The angle of a pair is the one between the ring planes, folded into
+    [0, 90] degrees. Rings stack face to face when the angle is at most
+    `PI_PI_FACE_TO_FACE_MAX_ANGLE` and their centroids are within the
+    maximum face-to-face distance of the criteria, and edge to face when
+    the angle is at least `PI_PI_EDGE_TO_FACE_MIN_ANGLE` and their
+    centroids are within the maximum edge-to-face distance.
+
+    Parameters
+    ----------
+    centroids1, normals1, centroids2, normals2 : array_like
+        Centroid and normal of every ring of both sets with shape (n, 3)
+        and (m, 3). Either set may be given for a batch of poses, with
+        shape (p, n, 3) or (p, m, 3) (see `find_batch_neighbor_pairs`).
+    criteria : InteractionCriteria or str, optional
+        Criteria instance or name of a `PiPiCriteria` member. Defaults to
+        ``PiPiCriteria.default``.
+
+    Returns
+    -------
+    PiPiMatches
+        Pose indexes, ring indexes into both sets, measurements and
+        stacking type of the matching pairs, sorted by pose and ring
+        indexes.
+
+    """
+    criteria = PiPiFinder._setup_criteria(criteria, {})
+    max_ftf_distance = criteria.max_face_to_face_distance
+    max_etf_distance = criteria.max_edge_to_face_distance
+    poses, idxs1, idxs2 = find_batch_neighbor_pairs(
+        centroids1, centroids2, max(max_ftf_distance, max_etf_distance))
+    ring_normals1 = gather_points(normals1, poses, idxs1)
+    ring_normals2 = gather_points(normals2, poses, idxs2)
+    distances = np.sqrt(((gather_points(centroids1, poses, idxs1) -
+                          gather_points(centroids2, poses, idxs2)) ** 2)
+                        .sum(axis=-1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cosines = np.abs((ring_normals1 * ring_normals2).sum(axis=-1)) / (
+            np.sqrt((ring_normals1 ** 2).sum(axis=-1) *
+                    (ring_normals2 ** 2).sum(axis=-1)))
+    angles = np.degrees(np.arccos(np.clip(cosines, 0, 1)))
+    face_to_face = (angles <= PI_PI_FACE_TO_FACE_MAX_ANGLE) & \
+        (distances <= max_ftf_distance)
+    mask = face_to_face | ((angles >= PI_PI_EDGE_TO_FACE_MIN_ANGLE) &
+                           (distances <= max_etf_distance))
+    return PiPiMatches(poses[mask], idxs1[mask], idxs2[mask],
+                       distances[mask], angles[mask], face_to_face[mask])
+
+
+def _find_cations(st, atoms):
+    return find_charged_atoms(st, atoms, resonance=False).cations
+
+
+def _ring_fragment(st, rings, k):
+    return Ring(st, get_atoms(st, rings.atom_indexes[k]),
+                rings.centroids[k].tolist(), rings.normals[k].tolist())
@@ -1,18 +1,27 @@
-from fatools.structutils.interactions import (InteractionCriteria,
-                                              register_finder)
+from collections import namedtuple
+
+import numpy as np
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.interactions import (
+    InteractionCriteria, InteractionCriteriaPreset, register_finder)
 from fatools.structutils.interactions.finder import InteractionFinder
+from fatools.structutils.interactions.groups import (atom_coordinates,
+                                                     find_charged_atoms)
 from fatools.structutils.interactions.interaction import Interaction
-from fatools.utils.enum import Enum
-from schrodinger.structutils.interactions.salt_bridge import \
-    SaltBridgeFinder as _SaltBridgeFinder
+from fatools.utils.geometry import (find_batch_neighbor_pairs, gather_points,
+                                    measure_distances)
 from schrodinger.structutils.measure import measure_distance
 
+SaltBridgeMatches = namedtuple('SaltBridgeMatches', [
+    'pose_indexes', 'indexes1', 'indexes2', 'distances'])
+
 
-class SaltBridgeCriteria(Enum):
+class SaltBridgeCriteria(InteractionCriteriaPreset):
     default = InteractionCriteria(max_distance=4)
 
 
 class SaltBridgeInteraction(Interaction):
+    __slots__ = ()
     __interaction_name__ = 'salt-bridge'
     __measures__ = ('distance',)
 
@@ -23,14 +32,85 @@ class SaltBridgeInteraction(Interaction):
 
 
 class SaltBridgeFinder(InteractionFinder):
+    """Find salt bridges between oppositely charged atoms.
+
+    Charged atoms are perceived once per search (once per receptor with
+    `search_context`) by `find_charged_atoms` and all the candidate pairs
+    are measured at once by `search_salt_bridges`. Pairs within the same
+    residue are ignored.
+
+    """
     __criteria__ = SaltBridgeCriteria
     __interaction__ = SaltBridgeInteraction
 
+    def _search_context(self, receptor_ctx, st2, as2):
+        pocket = receptor_ctx.pocket(st2, as2)
+        if not pocket:
+            return ()
+        charged1 = receptor_ctx.charged_atoms().subset(pocket)
+        return self._search_charged_atoms(
+            receptor_ctx.structure, charged1,
+            st2, find_charged_atoms(st2, as2))
+
     def _search_interactions(self, st1, as1, st2, as2):
-        options = dict(
-            cutoff=self.criteria.max_distance,
-            ignore_same_res=True)
-        sb_iter = _SaltBridgeFinder.find(st1, as1, st2, as2, **options)
-        return tuple(SaltBridgeInteraction(st1, atom1, st2, atom2)
-                     for atom1, atom2 in sb_iter)
+        return self._search_charged_atoms(
+            st1, find_charged_atoms(st1, as1),
+            st2, find_charged_atoms(st2, as2))
+
+    def _search_charged_atoms(self, st1, charged1, st2, charged2):
+        if not len(charged1) or not len(charged2):
+            return ()
+        matches = search_salt_bridges(
+            atom_coordinates(st1, charged1.indexes), charged1.charges,
+            atom_coordinates(st2, charged2.indexes), charged2.charges,
+            criteria=self.criteria)
+        atom_idxs1 = charged1.indexes[matches.indexes1]
+        atom_idxs2 = charged2.indexes[matches.indexes2]
+        distances = matches.distances
+        if st1 is st2:  # ignore pairs within the same residue
+            residue_ids = get_structure_arrays(st1).residue_ids
+            mask = residue_ids[atom_idxs1 - 1] != residue_ids[atom_idxs2 - 1]
+            atom_idxs1, atom_idxs2 = atom_idxs1[mask], atom_idxs2[mask]
+            distances = distances[mask]
+        return [SaltBridgeInteraction(st1, int(i), st2, int(j),
+                                      distance=float(d))
+                for i, j, d in zip(atom_idxs1, atom_idxs2, distances)]
 register_finder(SaltBridgeFinder)
+
+
+def search_salt_bridges(coords1, charges1, coords2, charges2, criteria=None):
+    """Find salt bridges between arrays of charged atoms.
+
+    Parameters
+    ----------
+    coords1, coords2 : array_like
+        Coordinates of the charged atoms with shape (n, 3) and (m, 3).
+        Either of them may be given for a batch of poses, with shape
+        (p, n, 3) or (p, m, 3) (see `find_batch_neighbor_pairs`).
+    charges1, charges2 : array_like
+        Charge (only its sign matters) of every atom.
+    criteria : InteractionCriteria or str, optional
+        Criteria instance or name of a `SaltBridgeCriteria` member.
+        Defaults to ``SaltBridgeCriteria.default``.
+
+    Returns
+    -------
+    SaltBridgeMatches
+        Pose indexes, atom indexes into both sets and distances of the
+        oppositely charged pairs matching the criteria, sorted by pose and
+        atom indexes.
+
+    """
+    criteria = SaltBridgeFinder._setup_criteria(criteria, {})
+    charges1 = np.sign(np.asarray(charges1, dtype=float)).ravel()
+    charges2 = np.sign(np.asarray(charges2, dtype=float)).ravel()
+    poses, idxs1, idxs2 = find_batch_neighbor_pairs(
+        coords1, coords2, criteria.max_distance)
+    opposite = charges1[idxs1] * charges2[idxs2] < 0
+    poses, idxs1, idxs2 = poses[opposite], idxs1[opposite], idxs2[opposite]
+    distances = measure_distances(gather_points(coords1, poses, idxs1),
+                                  gather_points(coords2, poses, idxs2))
+    mask = criteria.match_arrays(distance=distances)
+    return SaltBridgeMatches(poses[mask], idxs1[mask], idxs2[mask],
+                             distances[mask])
+
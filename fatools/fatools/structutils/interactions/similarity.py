@@ -0,0 +1,225 @@
+import numbers
+from collections import namedtuple
+
+import numpy as np
+from fatools.utils.kernel import InvalidArgumentError
+
+SIMILARITY_CHUNK_SIZE = 1 << 16
+SIMILARITY_METRICS = ('tanimoto', 'tversky')
+
+SimilarityHits = namedtuple('SimilarityHits', 'indexes scores')
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0f0f0f0f0f0f0f0f)
+_H01 = np.uint64(0x0101010101010101)
+
+
+class BitFingerprintMatrix(object):
+    """Binary interaction fingerprints packed into 64-bit words.
+
+    Every bin of an `InteractionFingerprintMatrix` is encoded as a
+    presence bit. With `distance_buckets`, each bin gets one extra bit per
+    bucket edge, set when the interaction distance is at or below the edge
+    (steric clashes only get the presence bit), so that poses with similar
+    interactions at similar distances share more bits.
+
+    Similarities are computed with bitwise operations and a vectorized
+    popcount, which ranks millions of fingerprints in a fraction of a
+    second.
+
+    Parameters
+    ----------
+    bits : array_like
+        Boolean array with one row per fingerprint.
+    bins_desc : list, optional
+        Description of the bins the bits were encoded from.
+    distance_buckets : sequence of float, optional
+        Bucket edges the bits were encoded with.
+    labels : list of str, optional
+        Label of every fingerprint.
+
+    """
+    def __init__(self, bits, bins_desc=None, distance_buckets=(),
+                 labels=None):
+        bits = np.asarray(bits, dtype=bool)
+        if bits.ndim != 2:
+            raise ValueError('bits must be a 2-dimensional array')
+        self._nbits = bits.shape[1]
+        self._words = _pack_bits(bits)
+        self._counts = _count_bits(self._words)
+        self._bins_desc = bins_desc
+        self._distance_buckets = tuple(sorted(distance_buckets))
+        self._labels = labels
+
+    bins_desc = property(lambda self: self._bins_desc)
+    counts = property(lambda self: self._counts)
+    distance_buckets = property(lambda self: self._distance_buckets)
+    labels = property(lambda self: self._labels)
+    nbits = property(lambda self: self._nbits)
+
+    def __len__(self):
+        return len(self._words)
+
+    @classmethod
+    def from_ifp(cls, ifp, distance_buckets=()):
+        """Encode an `InteractionFingerprintMatrix` as bits."""
+        distance_buckets = tuple(sorted(distance_buckets))
+        width = len(distance_buckets) + 1
+        rows, cols, values = ifp._entries()
+        rows, bit_idxs = _encode_bits(
+            rows, cols, values, _distance_bins(ifp.bins_desc),
+            distance_buckets)
+        bits = np.zeros((len(ifp), ifp.nbins * width), dtype=bool)
+        bits[rows, bit_idxs] = True
+        return cls(bits, ifp.bins_desc, distance_buckets, ifp.labels)
+
+    @property
+    def bits(self):
+        """Unpacked boolean array of bits."""
+        bits = np.unpackbits(self._words.view(np.uint8), axis=1)
+        return bits[:, :self._nbits].astype(bool)
+
+    def similarity(self, references, metric='tanimoto', alpha=.5, beta=.5):
+        """Return the similarity of every fingerprint to the references.
+
+        Parameters
+        ----------
+        references : int, InteractionFingerprint or list
+            Index of a fingerprint of this matrix, an
+            `InteractionFingerprint` (its bins are matched by description)
+            or a list of them.
+        metric : str, optional
+            Either 'tanimoto' or 'tversky'. The Tversky index weights the
+            bits only set in the reference by `alpha` and the bits only set
+            in the fingerprint by `beta`. Similarity is 0 when neither
+            fingerprint has any bit set.
+        alpha, beta : float, optional
+            Tversky weights. Ignored for the Tanimoto metric.
+
+        Returns
+        -------
+        numpy.ndarray
+            Similarities with shape (number of references, len(self)).
+
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise InvalidArgumentError('metric', metric)
+        if metric == 'tanimoto':
+            alpha = beta = 1.
+        ref_words, ref_counts = self._encode_references(references)
+        scores = np.empty((len(ref_words), len(self)))
+        for start in range(0, len(self), SIMILARITY_CHUNK_SIZE):
+            stop = start + SIMILARITY_CHUNK_SIZE
+            words, counts = self._words[start:stop], self._counts[start:stop]
+            for i, (ref, ref_count) in enumerate(zip(ref_words, ref_counts)):
+                common = _count_bits(words & ref)
+                scores[i, start:stop] = _tversky(
+                    common, ref_count, counts, alpha, beta)
+        return scores
+
+    def top_k(self, references, k=10, metric='tanimoto', alpha=.5, beta=.5,
+              fusion='max'):
+        """Return the `k` fingerprints most similar to the references.
+
+        Scores against several references are fused by taking their 'max'
+        or 'mean'. Hits are sorted by decreasing score, ties by index.
+
+        Returns
+        -------
+        SimilarityHits
+            Indexes and scores of the hits.
+
+        """
+        if fusion not in ('max', 'mean'):
+            raise InvalidArgumentError('fusion', fusion)
+        scores = self.similarity(references, metric, alpha, beta)
+        scores = scores.max(axis=0) if fusion == 'max' else \
+            scores.mean(axis=0)
+        k = min(k, len(scores))
+        if k <= 0:
+            return SimilarityHits(np.empty(0, np.intp), np.empty(0))
+        indexes = np.argpartition(-scores, k - 1)[:k]
+        # ties at the k-th score: keep the lowest indexes
+        threshold = scores[indexes].min()
+        indexes = np.nonzero(scores >= threshold)[0]
+        indexes = indexes[np.lexsort((indexes, -scores[indexes]))][:k]
+        return SimilarityHits(indexes, scores[indexes])
+
+    def _encode_references(self, references):
+        if isinstance(references, numbers.Integral) or \
+                hasattr(references, '_bins_desc'):
+            references = [references]
+        words = np.zeros((len(references), self._words.shape[1]), np.uint64)
+        counts = np.zeros(len(references), dtype=np.intp)
+        for i, reference in enumerate(references):
+            if isinstance(reference, numbers.Integral):
+                words[i], counts[i] = self._words[reference], \
+                    self._counts[reference]
+            else:
+                words[i], counts[i] = self._encode_fingerprint(reference)
+        return words, counts
+
+    def _encode_fingerprint(self, fingerprint):
+        if self._bins_desc is None:
+            raise ValueError('bins description is required to compare '
+                             'with interaction fingerprints')
+        # bins missing in this matrix go after the known ones; their bits
+        # count for the reference but never match
+        bin_idxs = dict((desc, j) for j, desc in enumerate(self._bins_desc))
+        bins_desc, cols, values = list(self._bins_desc), [], []
+        for desc, value in zip(fingerprint._bins_desc, fingerprint):
+            if value is None:
+                continue
+            if desc not in bin_idxs:
+                bin_idxs[desc] = len(bins_desc)
+                bins_desc.append(desc)
+            cols.append(bin_idxs[desc])
+            values.append(value)
+        _, bit_idxs = _encode_bits(
+            np.zeros(len(cols), dtype=np.intp), np.array(cols, dtype=np.intp),
+            np.array(values, dtype=np.float32), _distance_bins(bins_desc),
+            self._distance_buckets)
+        bits = np.zeros((1, self._nbits), dtype=bool)
+        bits[0, bit_idxs[bit_idxs < self._nbits]] = True
+        return _pack_bits(bits)[0], len(bit_idxs)
+
+
+def _distance_bins(bins_desc):
+    return np.array([desc[0] != 'steric-clash' for desc in bins_desc],
+                    dtype=bool)
+
+
+def _encode_bits(rows, cols, values, is_distance, distance_buckets):
+    """Return the rows and bit indexes set by the given entries."""
+    width = len(distance_buckets) + 1
+    all_rows, bit_idxs = [rows], [cols * width]
+    for k, edge in enumerate(distance_buckets, 1):
+        hit = is_distance[cols] & (values <= edge)
+        all_rows.append(rows[hit])
+        bit_idxs.append(cols[hit] * width + k)
+    return np.concatenate(all_rows), np.concatenate(bit_idxs)
+
+
+def _pack_bits(bits):
+    nwords = -(-bits.shape[1] // 64)
+    padded = np.zeros((len(bits), nwords * 64), dtype=bool)
+    padded[:, :bits.shape[1]] = bits
+    return np.packbits(padded, axis=1).view(np.uint64)
+
+
+def _count_bits(words):
+    return _popcount(words).sum(axis=1).astype(np.intp)
+
+
+def _popcount(words):
+    """Number of bits set in every 64-bit word (SWAR algorithm)."""
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _H01) >> np.uint64(56)
+
+
+def _tversky(common, ref_counts, counts, alpha, beta):
+    den = common + alpha * (ref_counts - common) + beta * (counts - common)
+    return np.where(den > 0, common / np.maximum(den, 1e-12), 0.)
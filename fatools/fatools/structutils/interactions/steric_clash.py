@@ -1,12 +1,17 @@
+from collections import namedtuple
+
+import numpy as np
 from fatools.core_ext import builtin
 from fatools.structure import AtomCollection
-from fatools.structutils.interactions import (InteractionCriteria,
-                                              register_finder)
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.interactions import (
+    InteractionCriteria, InteractionCriteriaPreset, register_finder)
 from fatools.structutils.interactions.finder import InteractionFinder
+from fatools.structutils.interactions.groups import atom_coordinates
 from fatools.structutils.interactions.interaction import (
     Interaction, get_interaction_fragment_label)
 from fatools.utils.caching import cached_property
-from fatools.utils.enum import Enum
+from fatools.utils.geometry import find_neighbor_pairs, measure_distances
 from fatools.utils.statistics import mean
 from schrodinger.structutils.interactions.steric_clash import clash_iterator
 from schrodinger.structutils.measure import measure_distance
@@ -14,12 +19,16 @@ from schrodinger.structutils.measure import measure_distance
 builtin.extend_list()
 builtin.extend_tuple()
 
+StericClashMatches = namedtuple('StericClashMatches', [
+    'indexes1', 'indexes2', 'distances', 'overlaps'])
+
 
-class StericClashCriteria(Enum):
+class StericClashCriteria(InteractionCriteriaPreset):
     default = InteractionCriteria(min_overlap=0.4)
 
 
 class StericClashInteraction(Interaction):
+    __slots__ = ()
     __interaction_name__ = 'steric-clash'
     __measures__ = ('distance', 'overlap')
 
@@ -46,6 +55,7 @@ class StericClashInteraction(Interaction):
 
 
 class CompoundStericClashInteraction(Interaction):
+    __slots__ = ()
     __interaction_name__ = 'steric-clash'
     __measures__ = ('distance', 'overlap')
 
@@ -53,12 +63,18 @@ class CompoundStericClashInteraction(Interaction):
     def relative_overlap(self):
         return self.overlap / self.vdw_radii_sum
 
-    @cached_property
+    @property
     def vdw_radii_sum(self):
-        return mean(self._calculate_all_vdw_radii_sums())
+        return self.distance + self.overlap
 
     @classmethod
-    def from_steric_clashes(cls, steric_clashes):
+    def from_steric_clashes(cls, steric_clashes, **measurements):
+        """Join steric clashes between the same pair of residues.
+
+        The distance and overlap are the means over the clashes; pass them
+        as `measurements` when already known (see `compound_clashes`).
+
+        """
         atoms = list.with_capacity(2)
         for i in range(2):
             atoms[i] = steric_clashes.pluck('atoms[{}]'.format(i))
@@ -66,13 +82,13 @@ class CompoundStericClashInteraction(Interaction):
                 raise ValueError('atoms belong to different residues')
         st1, st2 = steric_clashes[0].structures
         return cls(st1, AtomCollection(st1, atoms[0]),
-                   st2, AtomCollection(st2, atoms[1]))
+                   st2, AtomCollection(st2, atoms[1]), **measurements)
 
     def calculate_distance(self, fragments):
         return mean(self._calculate_all_distances())
 
     def calculate_overlap(self, atoms):
-        return self.vdw_radii_sum - self.distance
+        return mean(self._calculate_all_vdw_radii_sums()) - self.distance
 
     def _calculate_all_distances(self):
         return tuple([measure_distance(a1, a2)
@@ -84,12 +100,110 @@ class CompoundStericClashInteraction(Interaction):
 
 
 class StericClashFinder(InteractionFinder):
+    """Find steric clashes between atoms.
+
+    Clashes within a structure are found by Schrodinger's `clash_iterator`,
+    which skips bonded atoms. Clashes between two structures are found by
+    `search_clashes`, which only checks the van der Waals overlap: any other
+    pair filtering of `clash_iterator` does not apply there.
+
+    """
     __criteria__ = StericClashCriteria
     __interaction__ = StericClashInteraction
 
     def _search_interactions(self, st1, as1, st2, as2):
-        options = dict(allowable_overlap=self.criteria.min_overlap)
-        sc_iter = clash_iterator(st1, as1, st2, as2, **options)
-        return tuple(StericClashInteraction(st1, atom1, st2, atom2, distance=d)
-                     for atom1, atom2, d in sc_iter)
+        if st1 is st2:  # intra-structure clashes skip bonded atoms
+            options = dict(allowable_overlap=self.criteria.min_overlap)
+            sc_iter = clash_iterator(st1, as1, st2, as2, **options)
+            return tuple(
+                StericClashInteraction(st1, atom1, st2, atom2, distance=d)
+                for atom1, atom2, d in sc_iter)
+
+        as1, as2 = sorted(as1), sorted(as2)
+        if not as1 or not as2:
+            return ()
+        matches = search_clashes(
+            atom_coordinates(st1, as1), _vdw_radii(st1, as1),
+            atom_coordinates(st2, as2), _vdw_radii(st2, as2),
+            min_overlap=self.criteria.min_overlap)
+        return tuple(StericClashInteraction(st1, as1[i], st2, as2[j],
+                                            distance=float(d),
+                                            overlap=float(o))
+                     for i, j, d, o in zip(*matches))
 register_finder(StericClashFinder)
+
+
+def compound_clashes(group_ids, distances, overlaps):
+    """Average clash measurements per group (e.g., per residue).
+
+    Parameters
+    ----------
+    group_ids : array_like
+        Group index, from 0 to n - 1, of every clash.
+    distances, overlaps : array_like
+        Measurements of every clash.
+
+    Returns
+    -------
+    counts, distances, overlaps : numpy.ndarray
+        Number of clashes and mean distance and overlap of each group.
+
+    """
+    group_ids = np.asarray(group_ids, dtype=np.intp)
+    counts = np.bincount(group_ids)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_distances = np.bincount(group_ids, distances) / counts
+        mean_overlaps = np.bincount(group_ids, overlaps) / counts
+    return counts, mean_distances, mean_overlaps
+
+
+def search_clashes(coords1, radii1, coords2, radii2, min_overlap=0.4):
+    """Find steric clashes between two sets of atoms.
+
+    Two atoms clash when the sum of their van der Waals radii minus their
+    distance (the overlap) is larger than `min_overlap`. This is the only
+    rule applied: unlike Schrodinger's `clash_iterator`, pairs are not
+    filtered otherwise (e.g., hydrogen-bonded pairs are reported too).
+    Candidate pairs come from a cell list, so the cost grows with the
+    number of close pairs rather than with the product of both sets.
+
+    Parameters
+    ----------
+    coords1, coords2 : array_like
+        Atom coordinates with shape (n, 3) and (m, 3).
+    radii1, radii2 : array_like
+        van der Waals radius of every atom.
+    min_overlap : float, optional
+        Allowed overlap in angstroms.
+
+    Returns
+    -------
+    StericClashMatches
+        Indexes into both sets plus distances and overlaps of the clashes,
+        sorted by the first index and then by the second one.
+
+    """
+    coords1 = np.asarray(coords1, dtype=float).reshape(-1, 3)
+    coords2 = np.asarray(coords2, dtype=float).reshape(-1, 3)
+    radii1 = np.asarray(radii1, dtype=float)
+    radii2 = np.asarray(radii2, dtype=float)
+    if not len(coords1) or not len(coords2):
+        empty = np.empty(0)
+        return StericClashMatches(empty.astype(np.intp),
+                                  empty.astype(np.intp), empty, empty)
+
+    cutoff = radii1.max() + radii2.max() - min_overlap
+    if cutoff <= 0:
+        idxs1 = idxs2 = np.empty(0, dtype=np.intp)
+    else:
+        idxs1, idxs2 = find_neighbor_pairs(coords1, coords2, cutoff)
+    distances = measure_distances(coords1[idxs1], coords2[idxs2])
+    overlaps = radii1[idxs1] + radii2[idxs2] - distances
+    mask = overlaps > min_overlap
+    return StericClashMatches(idxs1[mask], idxs2[mask], distances[mask],
+                              overlaps[mask])
+
+
+def _vdw_radii(st, atom_idxs):
+    radii = get_structure_arrays(st).vdw_radii
+    return radii[np.asarray(atom_idxs, dtype=np.intp) - 1]
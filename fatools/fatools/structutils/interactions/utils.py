@@ -1,11 +1,22 @@
+import multiprocessing
+from collections import OrderedDict
+from itertools import chain
+
+import numpy as np
 from fatools.core_ext import builtin
 from fatools.structutils.interactions import (CompoundStericClashInteraction,
+                                              InteractionCriteria,
                                               StericClashInteraction)
+from fatools.structutils.interactions.steric_clash import compound_clashes
+from fatools.structutils.interactions.context import ReceptorContext
 from fatools.structutils.interactions.finder import (FINDER_REGISTRY,
                                                      InteractionFinder)
+from fatools.utils.kernel import InvalidArgumentError
 
 builtin.extend_list()
 
+_POOL_STATE = None  # (receptor context, ligands, finder, atoms, func)
+
 
 # TODO add docstring
 class MultipleInteractionFinder(InteractionFinder):
@@ -13,38 +24,168 @@ class MultipleInteractionFinder(InteractionFinder):
         self._finders = gather_finders(interactions or ('all',),
                                        interaction_options)
 
+    def _gather_interactions(self, search):
+        results = self._map_finders(search)
+        return curate_interactions(list(chain.from_iterable(results)))
+
+    def _map_finders(self, search):
+        # finders share the structures, whose wrappers and ASL evaluation
+        # are not thread-safe: use `map_interactions` for parallelism
+        return [search(finder) for finder in self._finders]
+
+    def _search_context(self, receptor_ctx, st2, as2):
+        as2 = tuple(as2)  # shared by all finders, so it must be immutable
+        return self._gather_interactions(
+            lambda finder: finder._search_context(receptor_ctx, st2, as2))
+
     def _search_interactions(self, st1, as1, st2, as2):
-        all_interactions = []
-        for finder in self._finders:
-            # must pass atom set copies to avoid problems
-            interactions = finder._search_interactions(
-                st1, list(as1), st2, list(as2))
-            all_interactions.extend(interactions)
-        return curate_interactions(all_interactions)
+        as1, as2 = tuple(as1), tuple(as2)  # idem
+        return self._gather_interactions(
+            lambda finder: finder._search_interactions(st1, as1, st2, as2))
 
     def _sort_interactions(self, interactions):
         return interactions.sorted_by('residues[0]', 'name', 'atom_indexes')
 
 
+class MultipleCriteriaFinder(MultipleInteractionFinder):
+    """Find interactions under several named criteria sets in one pass.
+
+    Rather than searching once per criteria set, every finder searches
+    once with the envelope (the loosest) of its criteria over all the sets
+    (see `InteractionCriteria.envelope`), so candidate pairs are found and
+    measured only once. The measurements of the interactions found are
+    then matched against the criteria of every set at once with
+    `InteractionCriteria.match_interactions`, and interactions are curated
+    per set. Finders whose criteria cannot be checked on the measurements
+    of their interactions (e.g., pi-pi stacking) search once per distinct
+    criteria instead.
+
+    Searches return an `OrderedDict` with the interactions of every set by
+    label.
+
+    Parameters
+    ----------
+    criteria_sets : dict
+        Criteria of every set by label. Each set maps interaction names, as
+        for `find_interactions` options, to a criteria instance, preset or
+        preset name; unlisted interactions use their default criteria. Use
+        an `OrderedDict` to keep the labels in order.
+    *interactions : str
+        Names of the interactions to search. Defaults to all.
+    interactions : sequence of str, optional
+        More names of interactions to search, so that they can be given
+        through `find` too.
+
+    Raises
+    ------
+    InvalidArgumentError
+        If any other option is given.
+
+    Examples
+    --------
+    >>> criteria_sets = OrderedDict([
+    ...     ('maestro', {'h-bond': 'maestro'}),
+    ...     ('glide', {'h-bond': 'glide', 'x-bond': 'loose'})])
+    >>> finder = MultipleCriteriaFinder(criteria_sets, 'h-bond', 'x-bond')
+    >>> finder.search(receptor, ligand)  # doctest: +SKIP
+    OrderedDict([('maestro', (...)), ('glide', (...))])
+
+    """
+    def __init__(self, criteria_sets, *interactions, **options):
+        more_interactions = options.pop('interactions', ())
+        if isinstance(more_interactions, str):
+            more_interactions = (more_interactions, )
+        if options:
+            name = sorted(options)[0]
+            raise InvalidArgumentError(name, options[name])
+        interactions += tuple(more_interactions)
+        super(MultipleCriteriaFinder, self).__init__(*interactions)
+        self._labels = tuple(criteria_sets)
+        set_options = [
+            dict((FINDER_REGISTRY[name], criteria) for name, criteria in
+                 criteria_sets[label].items())
+            for label in self._labels]
+        # (finder index, criteria to filter with or None) of every set
+        self._selections = tuple([] for _ in self._labels)
+        finders = []
+        for fcls in [type(finder) for finder in self._finders]:
+            criteria = [fcls._setup_criteria(options.get(fcls), {})
+                        for options in set_options]
+            distinct = []
+            for c in criteria:
+                if not any(c.measures == d.measures for d in distinct):
+                    distinct.append(c)
+            measures = set(fcls.__interaction__.__measures__)
+            if len(distinct) > 1 and \
+                    all(set(d.measures) <= measures for d in distinct):
+                distinct = [InteractionCriteria.envelope(distinct)]
+            for selection, c in zip(self._selections, criteria):
+                i = next(i for i, d in enumerate(distinct)
+                         if len(distinct) == 1 or c.measures == d.measures)
+                selection.append((len(finders) + i, None
+                                  if c.measures == distinct[i].measures
+                                  else c))
+            finders.extend(fcls(c) for c in distinct)
+        self._finders = tuple(finders)
+
+    def _finish_search(self, labeled):
+        finish_search = super(MultipleCriteriaFinder, self)._finish_search
+        return OrderedDict((label, finish_search(interactions))
+                           for label, interactions in labeled.items())
+
+    def _gather_interactions(self, search):
+        results = [list(interactions)
+                   for interactions in self._map_finders(search)]
+        labeled = OrderedDict()
+        for label, selection in zip(self._labels, self._selections):
+            interactions = []
+            for i, criteria in selection:
+                if criteria is None or not results[i]:
+                    interactions.extend(results[i])
+                    continue
+                mask = criteria.match_interactions(results[i])
+                interactions.extend(interaction for interaction, matched
+                                    in zip(results[i], mask) if matched)
+            labeled[label] = curate_interactions(interactions)
+        return labeled
+
+
 def compact_interactions(interactions):
     """Join together steric-clashes with the same residue."""
     interactions = list(interactions).sorted_by(
         'residues[0]', 'name', 'atom_indexes')
-    i = 0
-    while i < len(interactions):
-        if isinstance(interactions[i], StericClashInteraction):
-            j, resnum, sc_list = i, interactions[i].residues[0], []
-            while j < len(interactions) and \
-                    isinstance(interactions[j], StericClashInteraction) and \
-                    interactions[j].residues[0] == resnum:
-                sc_list.append(interactions[j])
-                j += 1
-            if len(sc_list) > 1:
-                csc = CompoundStericClashInteraction.from_steric_clashes(
-                    sc_list)
-                interactions[i:j] = [csc]
-        i += 1
-    return tuple(interactions)
+    clash_idxs = [i for i, interaction in enumerate(interactions)
+                  if isinstance(interaction, StericClashInteraction)]
+    if len(clash_idxs) < 2:
+        return tuple(interactions)
+
+    clashes = [interactions[i] for i in clash_idxs]
+    resnums = [clash.residues[0] for clash in clashes]
+    group_resnums, group_ids = np.unique(resnums, return_inverse=True)
+    counts, distances, overlaps = compound_clashes(
+        group_ids,
+        [clash.distance for clash in clashes],
+        [clash.overlap for clash in clashes])
+
+    members = [[] for _ in group_resnums]
+    for clash, group_id in zip(clashes, group_ids):
+        members[group_id].append(clash)
+
+    # clashes of a residue are contiguous after sorting, so the compound
+    # interaction takes the place of the first one
+    clash_groups = dict(zip(clash_idxs, group_ids))
+    compacted = []
+    for i, interaction in enumerate(interactions):
+        group_id = clash_groups.get(i)
+        if group_id is None or counts[group_id] == 1:
+            compacted.append(interaction)
+        elif members[group_id][0] is interaction:
+            compacted.append(
+                CompoundStericClashInteraction.from_steric_clashes(
+                    members[group_id],
+                    distance=float(distances[group_id]),
+                    overlap=float(overlaps[group_id])))
+    return tuple(compacted)
 
 
 def curate_interactions(interactions):
@@ -65,6 +206,107 @@ def find_interactions(st1, st2=None, atoms1=None, atoms2=None, **options):
     return MultipleInteractionFinder.find(st1, st2, atoms1, atoms2, **options)
 
 
+def find_interactions_by_criteria(criteria_sets, st1, st2=None, atoms1=None,
+                                  atoms2=None, **options):
+    """Find interactions under several criteria sets in a single pass.
+
+    See `MultipleCriteriaFinder` for `criteria_sets` and the options, e.g.,
+    ``interactions=('h-bond', 'x-bond')`` to restrict the search.
+
+    Returns
+    -------
+    OrderedDict
+        Tuple of interactions of every criteria set by label.
+
+    """
+    return MultipleCriteriaFinder.find(st1, st2, atoms1, atoms2,
+                                       criteria_sets=criteria_sets, **options)
+
+
+def find_interactions_many(receptor_ctx, ligands, atoms=None, **options):
+    """Find the interactions between a receptor and many ligands.
+
+    Parameters
+    ----------
+    receptor_ctx : ReceptorContext or schrodinger.structure.Structure
+        Receptor context, created from the structure if needed, which is
+        reused across all ligands.
+    ligands : iterable of schrodinger.structure.Structure
+        Ligand structures (e.g., a structure reader over docking poses).
+    atoms : str or list of int, optional
+        ASL expression or atom indexes of every ligand to consider.
+    **options
+        Interaction options as for `find_interactions`.
+
+    Yields
+    ------
+    tuple of Interaction
+        Interactions found for each ligand, in the same order.
+
+    """
+    if not isinstance(receptor_ctx, ReceptorContext):
+        receptor_ctx = ReceptorContext(receptor_ctx)
+    finder = MultipleInteractionFinder(**options)
+    for ligand in ligands:
+        yield finder.search_context(receptor_ctx, ligand, atoms)
+
+
+def map_interactions(func, receptor_ctx, ligands, atoms=None, processes=None,
+                     chunksize=None, **options):
+    """Apply `func` to the interactions of many ligands in parallel.
+
+    Ligands are distributed in chunks among a pool of worker processes,
+    each of which finds the interactions of a pose against the receptor
+    context and returns ``func(interactions)``. Interactions refer to
+    structures and cannot leave the workers, so `func` must reduce them to
+    something that can be pickled (e.g., fingerprint bins).
+
+    The receptor context and the ligands are inherited by the workers when
+    forked rather than pickled, which requires a POSIX platform.
+
+    Parameters
+    ----------
+    func : callable
+        Function taking the tuple of interactions of a pose. It must be
+        defined at the top level of a module.
+    receptor_ctx : ReceptorContext or schrodinger.structure.Structure
+        Receptor context, created from the structure if needed.
+    ligands : iterable of schrodinger.structure.Structure
+        Ligand structures, which are all loaded in memory.
+    atoms : str or list of int, optional
+        ASL expression or atom indexes of every ligand to consider.
+    processes : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    chunksize : int, optional
+        Number of poses sent to a worker at a time. By default, poses are
+        split into about four chunks per worker.
+    **options
+        Interaction options as for `find_interactions`.
+
+    Returns
+    -------
+    list
+        Results of `func` in the same order as `ligands`.
+
+    """
+    global _POOL_STATE
+    if not isinstance(receptor_ctx, ReceptorContext):
+        receptor_ctx = ReceptorContext(receptor_ctx)
+    ligands = list(ligands)
+    finder = MultipleInteractionFinder(**options)
+    _POOL_STATE = (receptor_ctx, ligands, finder, atoms, func)
+    try:
+        pool = multiprocessing.Pool(processes)
+        try:
+            return pool.map(_map_pose_interactions, range(len(ligands)),
+                            chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        _POOL_STATE = None
+
+
 def gather_finders(interactions, interaction_options):
     if len(interactions) == 1 and interactions[0] == 'all':
         return tuple(fcls() for fcls in set(FINDER_REGISTRY.values()))
@@ -84,10 +326,15 @@ def remove_duplicate_interactions(interactions):
     # steric-clashes at the end
     sort_key = lambda i: i.name == 'steric-clash'
 
-    interaction_map = dict()
+    interaction_map = OrderedDict()  # keep the order deterministic
     for interaction in interactions.sorted(sort_key):
         atom_indexes = interaction.atom_indexes.flatten()
         is_duplicate = atom_indexes in interaction_map
         if interaction.name != 'steric-clash' or not is_duplicate:
             interaction_map[atom_indexes] = interaction
     return tuple(interaction_map.values())
+
+
+def _map_pose_interactions(i):
+    receptor_ctx, ligands, finder, atoms, func = _POOL_STATE
+    return func(finder.search_context(receptor_ctx, ligands[i], atoms))
@@ -1,19 +1,26 @@
-from fatools.structutils import get_atoms
-from fatools.structutils.interactions import (InteractionCriteria,
-                                              register_finder)
+from collections import namedtuple
+
+import numpy as np
+from fatools.structutils.arrays import get_structure_arrays
+from fatools.structutils.interactions import (
+    InteractionCriteria, InteractionCriteriaPreset, register_finder)
 from fatools.structutils.interactions.finder import PairwiseInteractionFinder
 from fatools.structutils.interactions.interaction import PairwiseInteraction
 from fatools.utils.caching import cached_property
-from fatools.utils.enum import Enum
-from schrodinger.structutils.analyze import evaluate_asl
+from fatools.utils.geometry import (find_neighbor_pairs, measure_angles,
+                                    measure_distances)
 
 HALOGENS = frozenset(['F', 'Cl', 'Br', 'I'])
 HALOGEN_ASL = 'atom.ele F Cl Br I'
 XBOND_ACCEPTOR_ASL = 'atom.ele O N'
 XBOND_ATOMS_ASL = '({}) or ({})'.format(XBOND_ACCEPTOR_ASL, HALOGEN_ASL)
 
+HalogenBondMatches = namedtuple('HalogenBondMatches', [
+    'halogen_indexes', 'acceptor_indexes', 'distances', 'donor_angles',
+    'acceptor_angles'])
+
 
-class HalogenBondCriteria(Enum):
+class HalogenBondCriteria(InteractionCriteriaPreset):
     default = InteractionCriteria(
         max_distance=3.5,
         min_donor_angle=140,
@@ -28,6 +35,7 @@ XBondCriteria = HalogenBondCriteria
 
 
 class HalogenBondInteraction(PairwiseInteraction):
+    __slots__ = ()
     __interaction_name__ = 'x-bond'
 
     halogen = X = property(lambda self: self._sorted_atoms[0])
@@ -42,6 +50,7 @@ XBondInteraction = HalogenBondInteraction
 
 
 class HalogenBondFinder(PairwiseInteractionFinder):
+    __atoms_asl__ = XBOND_ATOMS_ASL
     __criteria__ = HalogenBondCriteria
     __interaction__ = HalogenBondInteraction
 
@@ -57,11 +66,26 @@ class HalogenBondFinder(PairwiseInteractionFinder):
             exclude_halogens=self.excluded_halogens)
         return match_xbond(atom1, atom2, **constraints)
 
-    @staticmethod
-    def _setup_atom_sets(st1, as1, st2, as2):
-        as1 = frozenset(evaluate_asl(st1, XBOND_ATOMS_ASL)) & frozenset(as1)
-        as2 = frozenset(evaluate_asl(st2, XBOND_ATOMS_ASL)) & frozenset(as2)
-        return get_atoms(st1, as1), get_atoms(st2, as2)
+    def _search_atom_indexes(self, st1, as1, st2, as2):
+        halogens = HALOGENS - set(self.excluded_halogens or ())
+        arrays1, arrays2 = get_structure_arrays(st1), get_structure_arrays(st2)
+        xs1, accs1 = _split_xbond_atoms(arrays1, as1, halogens)
+        xs2, accs2 = _split_xbond_atoms(arrays2, as2, halogens)
+        interactions = []
+        for xs, x_arrays, accs, acc_arrays, x_first in (
+                (xs1, arrays1, accs2, arrays2, True),
+                (xs2, arrays2, accs1, arrays1, False)):
+            if not len(xs) or not len(accs):
+                continue
+            matches = search_xbonds(
+                *_xbond_array_coordinates(x_arrays, xs, acc_arrays, accs),
+                criteria=self.criteria)
+            for i, j, d, dang, aang in zip(*matches):
+                atoms = (xs[i], accs[j]) if x_first else (accs[j], xs[i])
+                interactions.append(self.__interaction__(
+                    st1, int(atoms[0]), st2, int(atoms[1]),
+                    **_measurement_dict(d, dang, aang)))
+        return interactions
 
 
 XBondFinder = HalogenBondFinder
@@ -78,12 +102,113 @@ def match_xbond(atom1, atom2,
     if halogen.element not in HALOGENS - set(exclude_halogens or ()):
         return False
 
-    interaction = HalogenBondInteraction(None, halogen, None, acceptor)
+    xyzs = map(np.asarray, _xbond_coordinates([halogen], [acceptor]))
+    measurements = _measure_xbonds(*xyzs)
     criteria = InteractionCriteria(
         max_distance=max_distance,
         min_donor_angle=donor_angle,
         min_acceptor_angle=acceptor_angle)
-    match_xbond = criteria.match_interaction(interaction)
+    match_xbond = bool(criteria.match_arrays(measurements)[0])
     if return_values:
-        return (match_xbond, ) + interaction.measurement_values
+        values = _measurement_dict(**{measure: values[0] for measure, values
+                                      in measurements.items()})
+        return (match_xbond, ) + tuple(
+            values[measure] for measure in HalogenBondInteraction.__measures__)
     return match_xbond
+
+
+def search_xbonds(halogens, donors, acceptors, acceptor_neighbors=None,
+                  criteria=None):
+    """Find halogen bonds between arrays of atom coordinates.
+
+    Every halogen is paired with every acceptor within the maximum distance
+    of the criteria, and the X...A distance, C-X...A (donor) angle and
+    X...A-R (acceptor) angle are computed for all pairs at once. Halogens
+    to be excluded (e.g., fluorine) must be left out beforehand.
+
+    Parameters
+    ----------
+    halogens : array_like
+        Coordinates of the halogens with shape (n, 3).
+    donors : array_like
+        Coordinates of the atom bonded to each halogen, shape (n, 3).
+    acceptors : array_like
+        Coordinates of the acceptors with shape (m, 3).
+    acceptor_neighbors : array_like, optional
+        Coordinates of the first atom bonded to each acceptor with shape
+        (m, 3), NaN for acceptors without neighbors. Missing acceptor
+        angles are not checked against the criteria.
+    criteria : InteractionCriteria or str, optional
+        Criteria instance or name of a `HalogenBondCriteria` member.
+        Defaults to ``HalogenBondCriteria.default``.
+
+    Returns
+    -------
+    HalogenBondMatches
+        Halogen and acceptor indexes plus measurements of the matching
+        pairs, sorted by halogen index and then by acceptor index.
+
+    """
+    criteria = HalogenBondFinder._setup_criteria(criteria, {})
+    halogens = np.asarray(halogens, dtype=float).reshape(-1, 3)
+    donors = np.asarray(donors, dtype=float).reshape(-1, 3)
+    acceptors = np.asarray(acceptors, dtype=float).reshape(-1, 3)
+    if acceptor_neighbors is None:
+        acceptor_neighbors = np.full(acceptors.shape, np.nan)
+    acceptor_neighbors = np.asarray(acceptor_neighbors, dtype=float) \
+        .reshape(-1, 3)
+
+    max_distance = getattr(criteria, 'max_distance', None)
+    if max_distance is not None:
+        x_idxs, acc_idxs = find_neighbor_pairs(
+            halogens, acceptors, max_distance)
+    else:
+        x_idxs, acc_idxs = [idxs.ravel() for idxs in np.indices(
+            (len(halogens), len(acceptors)))]
+
+    measurements = _measure_xbonds(
+        halogens[x_idxs], donors[x_idxs],
+        acceptors[acc_idxs], acceptor_neighbors[acc_idxs])
+    mask = criteria.match_arrays(measurements)
+    return HalogenBondMatches(
+        x_idxs[mask], acc_idxs[mask], measurements['distance'][mask],
+        measurements['donor_angle'][mask],
+        measurements['acceptor_angle'][mask])
+
+
+def _measure_xbonds(halogens, donors, acceptors, acceptor_neighbors):
+    return dict(
+        distance=measure_distances(halogens, acceptors),
+        donor_angle=measure_angles(donors, halogens, acceptors),
+        acceptor_angle=measure_angles(acceptor_neighbors, acceptors, halogens))
+
+
+def _measurement_dict(distance, donor_angle, acceptor_angle):
+    return dict(
+        distance=float(distance),
+        donor_angle=float(donor_angle),
+        acceptor_angle=None if np.isnan(acceptor_angle) else
+        float(acceptor_angle))
+
+
+def _split_xbond_atoms(arrays, atom_idxs, halogens):
+    atom_idxs = np.asarray(atom_idxs, dtype=np.intp)
+    elements = arrays.elements[atom_idxs - 1]
+    return (atom_idxs[np.in1d(elements, list(halogens))],
+            atom_idxs[~np.in1d(elements, list(HALOGENS))])
+
+
+def _xbond_array_coordinates(x_arrays, halogens, acc_arrays, acceptors):
+    donors = x_arrays.neighbor_matrix(halogens, 1)[:, 0]
+    neighbors = acc_arrays.neighbor_matrix(acceptors, 1)[:, 0]
+    return (x_arrays.coordinates(halogens), x_arrays.coordinates(donors),
+            acc_arrays.coordinates(acceptors),
+            acc_arrays.coordinates(neighbors))
+
+
+def _xbond_coordinates(halogens, acceptors):
+    nan_xyz = (np.nan, ) * 3
+    neighbors = [acc.bond[1].atom2.xyz if acc.bond_total else nan_xyz
+                 for acc in acceptors]
+    return ([x.xyz for x in halogens], [x.bond[1].atom2.xyz for x in halogens],
+            [acc.xyz for acc in acceptors], neighbors)
@@ -0,0 +1,116 @@
+import io
+import os
+import shutil
+import tempfile
+import textwrap
+import unittest
+
+from fatools.application.schrodinger.macromodel.MacromodelCmd import (
+    RunPrimeMMGBSA)
+from fatools.application.schrodinger.prime.output import (
+    PrimeMMGBSATable, convert_property_value, parse_prime_mmgbsa_csv)
+from fatools.application.schrodinger.prime.runner import PrimeMMGBSARunner
+
+PRIME_CSV = textwrap.dedent("""\
+    title,r_i_docking_score,r_psp_MMGBSA_dG_Bind,r_psp_Lig_Strain_Energy,\
+i_psp_Prime_MMGBSA_ligand_number
+    1AQ1,-9.1,-45.25,3.5,1
+    2EXM,-7.2,-30.5,,2
+    """)
+
+
+class PrimeMMGBSACmdTests(unittest.TestCase):
+    def test_default_cmdline(self):
+        cmd = RunPrimeMMGBSA('1AQ1.mae')
+        self.assertEqual('1AQ1', cmd.jobname)
+        self.assertNotIn('-NJOBS', cmd.cmdline)
+
+    def test_cmdline_with_njobs(self):
+        cmd = RunPrimeMMGBSA('1AQ1.mae', njobs=4, flexdist=7)
+        self.assertIn('-NJOBS 4', cmd.cmdline)
+        self.assertIn('-flexdist 7', cmd.cmdline)
+
+
+class PrimeMMGBSAOutputTests(unittest.TestCase):
+    def test_convert_property_value(self):
+        self.assertEqual(-45.25, convert_property_value('r_psp_a', '-45.25'))
+        self.assertEqual(2, convert_property_value('i_psp_a', '2'))
+        self.assertIs(True, convert_property_value('b_psp_a', '1'))
+        self.assertEqual('x', convert_property_value('s_psp_a', 'x'))
+        self.assertIsNone(convert_property_value('r_psp_a', ''))
+
+    def test_parse_csv(self):
+        results = parse_prime_mmgbsa_csv(io.BytesIO(PRIME_CSV))
+        self.assertEqual(['1AQ1', '2EXM'], [r.title for r in results])
+        self.assertEqual(
+            ['r_psp_MMGBSA_dG_Bind', 'r_psp_Lig_Strain_Energy'],
+            list(results[0].terms))
+        self.assertEqual(-45.25, results[0].mmgbsa_dg_bind)
+        self.assertEqual(3.5, results[0].strain_ligand)
+        self.assertIsNone(results[1].strain_ligand)
+
+    def test_table(self):
+        table = PrimeMMGBSATable(parse_prime_mmgbsa_csv(io.BytesIO(PRIME_CSV)))
+        self.assertEqual(2, len(table))
+        self.assertEqual((-45.25, -30.5), table.column('r_psp_MMGBSA_dG_Bind'))
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filepath = os.path.join(tmpdir, 'out.csv')
+            table.write_csv(filepath)
+            with open(filepath) as f:
+                lines = f.read().splitlines()
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(
+            'title,r_psp_MMGBSA_dG_Bind,r_psp_Lig_Strain_Energy', lines[0])
+        self.assertEqual('2EXM,-30.5,', lines[2])
+
+
+class PrimeMMGBSARunnerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_cpu_per_job(self):
+        self.assertEqual(1, PrimeMMGBSARunner([], cpu=1, njobs=4).cpu_per_job)
+        self.assertEqual(4, PrimeMMGBSARunner([], cpu=8, njobs=4).cpu_per_job)
+        self.assertEqual(1, PrimeMMGBSARunner([], cpu=8).cpu_per_job)
+
+    def test_read_job_output(self):
+        jobname = os.path.join(self.tmpdir, '1AQ1')
+        with open(jobname + '-out.csv', 'wb') as f:
+            f.write(PRIME_CSV)
+        runner = PrimeMMGBSARunner([])
+        runner._handle_job_done(FakeJob(jobname))
+        self.assertEqual(2, len(runner.table))
+        self.assertEqual({}, runner.failed_outputs)
+
+    def test_malformed_job_output_does_not_halt(self):
+        jobname = os.path.join(self.tmpdir, '1AQ1')
+        with open(jobname + '-out.csv', 'wb') as f:
+            f.write('title,r_psp_MMGBSA_dG_Bind\n1AQ1,\0\n')
+        runner = PrimeMMGBSARunner([])
+        runner._handle_job_done(FakeJob(jobname))
+        runner._handle_job_done(FakeJob(jobname + '-missing'))
+        self.assertEqual([jobname, jobname + '-missing'],
+                         list(runner.failed_outputs))
+        self.assertIsInstance(runner.failed_outputs[jobname + '-missing'],
+                              IOError)
+
+    def test_unexpected_errors_are_raised(self):
+        runner = PrimeMMGBSARunner([])
+        with self.assertRaises(AttributeError):
+            runner._handle_job_done(None)
+        self.assertEqual({}, runner.failed_outputs)
+
+
+class FakeJob(object):
+    def __init__(self, name):
+        self.name = name
+
+
+if __name__ == '__main__':
+    unittest.main()
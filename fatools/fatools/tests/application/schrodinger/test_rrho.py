@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from fatools.application.schrodinger.macromodel.MacromodelCmd import (
+    RunRRHOEntropyCmd)
+from fatools.application.schrodinger.macromodel.output import (
+    read_rrho_entropy_csv)
+from fatools.application.schrodinger.macromodel.RRHO.cache import (
+    RRHOEntropyCache, hash_coordinates)
+from fatools.application.schrodinger.macromodel.RRHO.runner import (
+    RRHOEntropyTable)
+
+RRHO_CSV = ('Title,TdS_trans,TdS_rot,TdS_vib,TdS_total\n'
+            '2EXM_ligand,11.5,9.25,20.0,40.75\n')
+
+
+class RRHOEntropyCmdTests(unittest.TestCase):
+    def test_creation_with_one_file(self):
+        cmd = RunRRHOEntropyCmd('poses/2EXM.mae', radius=7)
+        self.assertEqual('2EXM', cmd.jobname)
+        self.assertEqual('2EXM_entropyRRHO.csv', cmd.csv)
+        self.assertFalse(cmd.uses_jobcontrol)
+        self.assertEqual(
+            ['rrho_entropy.py', '-csv', '2EXM_entropyRRHO.csv', '-r', '7',
+             'poses/2EXM.mae'],
+            cmd.args[1:])
+
+    def test_args_with_whitespace(self):
+        environ = os.environ.copy()
+        os.environ['SCHRODINGER'] = '/opt/schrodinger suite'
+        try:
+            cmd = RunRRHOEntropyCmd('my poses/2EXM.mae')
+            args = cmd.args
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+        self.assertEqual(
+            ['/opt/schrodinger suite/run', 'rrho_entropy.py', '-csv',
+             '2EXM_entropyRRHO.csv', 'my poses/2EXM.mae'],
+            args)
+
+
+class RRHOEntropyTableTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csvfile = os.path.join(self.tmpdir, '2EXM_entropyRRHO.csv')
+        with open(self.csvfile, 'w') as f:
+            f.write(RRHO_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_csv(self):
+        result, = read_rrho_entropy_csv(self.csvfile)
+        self.assertEqual('2EXM_ligand', result.name)
+        self.assertEqual(11.5, result.ts_translation)
+        self.assertEqual(40.75, result.ts_total)
+
+    def test_stream_results(self):
+        outfile = os.path.join(self.tmpdir, 'RRHO_scoring_terms.csv')
+        table = RRHOEntropyTable(outfile)
+        table.extend(read_rrho_entropy_csv(self.csvfile))
+        with open(outfile) as f:  # written before closing the table
+            lines = f.read().splitlines()
+        table.close()
+        self.assertEqual(1, len(table))
+        self.assertEqual('title,tds_trans,tds_rot,tds_vib,tds_total', lines[0])
+        self.assertEqual('2EXM_ligand,11.5,9.25,20.0,40.75', lines[1])
+
+
+class RRHOEntropyCacheTests(unittest.TestCase):
+    elements = ('C', 'O')
+    coordinates = ((0., 1.5, -2.25), (1.2, 0., 0.))
+
+    def test_hash_is_canonical(self):
+        key = hash_coordinates(self.elements, self.coordinates, radius=7)
+        coordinates = ((1e-5, 1.50004, -2.25), (1.2, -0.0001, 0.))
+        self.assertEqual(
+            key, hash_coordinates(self.elements, coordinates, radius=7.0))
+
+    def test_hash_depends_on_radius_and_coordinates(self):
+        key = hash_coordinates(self.elements, self.coordinates, radius=7)
+        self.assertNotEqual(
+            key, hash_coordinates(self.elements, self.coordinates, radius=5))
+        self.assertNotEqual(
+            key, hash_coordinates(self.elements, self.coordinates[::-1], 7))
+        self.assertNotEqual(
+            key, hash_coordinates(('C', 'N'), self.coordinates, radius=7))
+
+    def test_hash_depends_on_topology(self):
+        key = hash_coordinates(self.elements, self.coordinates, radius=7,
+                               formal_charges=(0, 0), bonds=[(1, 2, 2)])
+        self.assertEqual(key, hash_coordinates(
+            self.elements, self.coordinates, radius=7,
+            formal_charges=(0, 0), bonds=[(2, 1, 2)]))
+        self.assertNotEqual(key, hash_coordinates(
+            self.elements, self.coordinates, radius=7,
+            formal_charges=(0, 0), bonds=[(1, 2, 1)]))
+        self.assertNotEqual(key, hash_coordinates(
+            self.elements, self.coordinates, radius=7,
+            formal_charges=(0, -1), bonds=[(1, 2, 2)]))
+
+    def test_persistence(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filepath = os.path.join(tmpdir, 'cache.json')
+            csvfile = os.path.join(tmpdir, 'rrho.csv')
+            with open(csvfile, 'w') as f:
+                f.write(RRHO_CSV)
+
+            cache = RRHOEntropyCache(filepath)
+            self.assertIsNone(cache.get('key', ['2EXM_ligand']))
+            cache.put('key', read_rrho_entropy_csv(csvfile))
+            cache.save()
+
+            cache = RRHOEntropyCache(filepath)
+            self.assertIsNone(cache.get('key', ['a', 'b']))
+            result, = cache.get('key', ['renamed'])
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual('renamed', result.name)
+        self.assertEqual(9.25, result.ts_rotation)
+        self.assertEqual(40.75, result.ts_total)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,14 @@
 import unittest
 
+from collections import namedtuple
+
 from fatools.core_ext import builtin
+from fatools.utils.kernel import InvalidArgumentError
+
+builtin.extend_list()
+builtin.extend_tuple()
+
+Residue = namedtuple('Residue', 'chain resnum name')
 
 
 class DictTests(unittest.TestCase):
@@ -9,5 +17,47 @@ class DictTests(unittest.TestCase):
         expected = dict(cpu='1', host='localhost', debug='False')
         self.assertDictEqual(expected, mapping.transform_values(str))
 
+
+class IterableTests(unittest.TestCase):
+    def setUp(self):
+        self.residues = [Residue('B', 10, 'ASP'), Residue('A', 3, 'LYS'),
+                         Residue('B', 4, 'PHE'), Residue('A', 7, 'ASP')]
+
+    def test_uniq(self):
+        self.assertEqual([3, 1, 2], [3, 1, 3, 2, 1, 2].uniq())
+        self.assertEqual(('b', 'a'), ('b', 'a', 'b').uniq())
+
+    def test_group_by(self):
+        groups = self.residues.group_by('chain')
+        self.assertEqual(('A', 'B'), groups.pluck(0))
+        self.assertEqual([(3, 7), (10, 4)],
+                         [group.pluck('resnum') for _, group in groups])
+
+    def test_group_by_many_keys(self):
+        groups = self.residues.group_by('name', 'chain')
+        self.assertEqual((('ASP', 'A'), ('ASP', 'B'), ('LYS', 'A'),
+                          ('PHE', 'B')), groups.pluck(0))
+
+    def test_group_by_without_sorting(self):
+        groups = self.residues.group_by('name', sort=False)
+        self.assertEqual(('ASP', 'LYS', 'PHE'), groups.pluck(0))
+        self.assertEqual((10, 7), groups[0][1].pluck('resnum'))
+        self.assertIsInstance(groups[0][1], list)
+
+    def test_group_by_with_unknown_option(self):
+        with self.assertRaises(InvalidArgumentError):
+            self.residues.group_by('name', sorted=False)
+
+    def test_pluck(self):
+        self.assertEqual(('B', 'A', 'B', 'A'), self.residues.pluck('chain'))
+        self.assertEqual((('B', 10), ('A', 3)),
+                         self.residues[:2].pluck('0', 'resnum'))
+
+    def test_sorted_by(self):
+        self.assertEqual((3, 7, 4, 10),
+                         self.residues.sorted_by('chain', 'resnum').pluck(
+                             'resnum'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class FakeAtom(object):
+    def __init__(self, index, element, formal_charge, resnum=1):
+        self.index = index
+        self.element = element
+        self.formal_charge = formal_charge
+        self.resnum = resnum
+        self.chain = 'A'
+        self.pdbname = element
+        self.vdw_radius = 1.5
+        self.inscode = ' '
+
+
+class FakeBond(object):
+    def __init__(self, atom1, atom2):
+        self.atom1, self.atom2 = atom1, atom2
+
+
+class FakeRing(object):
+    def __init__(self, atom_idxs, aromatic):
+        self._atom_idxs = atom_idxs
+        self._aromatic = aromatic
+
+    def getAtomIndices(self):
+        return list(self._atom_idxs)
+
+    def isAromatic(self):
+        return self._aromatic
+
+
+class FakeStructure(object):
+    _handles = iter(range(1, 1000))
+
+    def __init__(self, elements, charges, bonds, handle=None,
+                 resnums=None):
+        self.handle = handle or next(FakeStructure._handles)
+        resnums = resnums or [1] * len(elements)
+        self.atom = [FakeAtom(i, *values) for i, values in enumerate(
+            zip(elements, charges, resnums), 1)]
+        self.bonds = [FakeBond(self.atom[i - 1], self.atom[j - 1])
+                      for i, j in bonds]
+        self.ring = []
+        self.xyz = np.zeros((len(elements), 3))
+
+    atom_total = property(lambda self: len(self.atom))
+    bond = property(lambda self: iter(self.bonds))
+    bond_total = property(lambda self: len(self.bonds))
+
+    def getXYZ(self, copy=True):
+        return self.xyz.copy() if copy else self.xyz
+
+
+class FakeInteraction(object):
+    def __init__(self, name, recep_desc, value, atom_indexes):
+        self.name = name
+        self.recep_desc = recep_desc
+        self.residues = (int(recep_desc.split()[0][1:]), )
+        self.atom_indexes = tuple((i, ) for i in atom_indexes)
+        if name == 'steric-clash':
+            self.relative_overlap = value
+        else:
+            self.distance = value
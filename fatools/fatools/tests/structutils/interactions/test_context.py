@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions import context
+from fatools.structutils.interactions.context import ReceptorContext
+from fatools.tests.structutils.interactions import FakeStructure
+
+
+class ReceptorContextTests(unittest.TestCase):
+    def setUp(self):
+        # residue 1 (N+ and a distant C), residue 2 (O-) and residue 3 (C)
+        self.receptor = FakeStructure(['N', 'C', 'O', 'C'], [1, 0, -1, 0],
+                                      [(1, 2)], resnums=[1, 1, 2, 3])
+        self.receptor.xyz = np.array(
+            [[0, 0, 0], [10, 0, 0], [3, 0, 0], [20, 0, 0]], dtype=float)
+        self.ligand = FakeStructure(['C', 'C'], [0, 0], [(1, 2)])
+        self.ligand.xyz = np.array([[1, 0, 0], [1, 1.5, 0]])
+        self.atoms = [1, 2, 3, 4]
+        self._evaluate_asl = context.evaluate_asl
+        self.asl_calls = []
+
+    def tearDown(self):
+        context.evaluate_asl = self._evaluate_asl
+
+    def fake_evaluate_asl(self, st, asl):
+        self.asl_calls.append(asl)
+        return [1, 2, 4]
+
+    def test_pocket_keeps_whole_residues(self):
+        ctx = ReceptorContext(self.receptor, self.atoms, cutoff=4)
+        self.assertEqual((1, 2, 3, 4), ctx.atom_indexes)
+        # atom 2 is far from the ligand but belongs to residue 1
+        self.assertEqual(frozenset([1, 2, 3]), ctx.pocket(self.ligand, [1]))
+        self.ligand.xyz = self.ligand.xyz + [50, 0, 0]
+        self.assertEqual(frozenset(), ctx.pocket(self.ligand, [1, 2]))
+
+    def test_pocket_of_atom_subset(self):
+        ctx = ReceptorContext(self.receptor, [2, 3, 4], cutoff=4)
+        self.assertEqual(frozenset([3]), ctx.pocket(self.ligand, [1]))
+
+    def test_empty_atom_set(self):
+        with self.assertRaises(ValueError):
+            ReceptorContext(self.receptor, [])
+
+    def test_charged_atoms(self):
+        ctx = ReceptorContext(self.receptor, self.atoms)
+        charged = ctx.charged_atoms()
+        self.assertEqual([1, 3], charged.indexes.tolist())
+        self.assertEqual([1, -1], charged.charges.tolist())
+        self.assertIs(charged, ctx.charged_atoms())
+        self.assertIsNot(charged, ctx.charged_atoms(resonance=False))
+
+        ctx = ReceptorContext(self.receptor, [2, 3, 4])
+        self.assertEqual([3], ctx.charged_atoms().indexes.tolist())
+
+    def test_atom_set(self):
+        context.evaluate_asl = self.fake_evaluate_asl
+        ctx = ReceptorContext(self.receptor, [2, 3, 4])
+        self.assertEqual(frozenset([2, 4]), ctx.atom_set('not atom.ele O'))
+        self.assertEqual(frozenset([2, 4]), ctx.atom_set('not atom.ele O'))
+        self.assertEqual(['not atom.ele O'], self.asl_calls)
+
+    def test_aromatic_rings(self):
+        ctx = ReceptorContext(self.receptor, self.atoms)
+        rings = ctx.aromatic_rings()
+        self.assertEqual(0, len(rings))
+        self.assertIs(rings, ctx.aromatic_rings())
+
+
+if __name__ == '__main__':
+    unittest.main()
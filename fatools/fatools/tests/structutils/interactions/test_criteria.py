@@ -1,6 +1,8 @@
 import unittest
 
-from fatools.structutils.interactions import InteractionCriteria
+import numpy as np
+from fatools.structutils.interactions import (
+    HalogenBondCriteria, HydrogenBondCriteria, InteractionCriteria)
 from fatools.utils.kernel import InvalidArgumentError, MissingArgumentError
 
 
@@ -58,6 +60,115 @@ class InteractionCriteriaTests(unittest.TestCase):
         self.assertTrue(self.criteria.match_measurements(
             distance=2.4, donor_angle=156, acceptor_angle=None))
 
+    def test_match_arrays(self):
+        mask = self.criteria.match_arrays(dict(
+            distance=[2.4, 2.4, 1.5, 3.5],
+            donor_angle=[156, 129, 156, 140],
+            acceptor_angle=[159, 159, 159, 170]))
+        self.assertEqual([True, False, False, True], mask.tolist())
+
+    def test_match_arrays_as_keywords(self):
+        mask = self.criteria.match_arrays(
+            dict(distance=[2.4, 2.4]), donor_angle=[156, 129],
+            acceptor_angle=[159, 159])
+        self.assertEqual([True, False], mask.tolist())
+
+    def test_match_arrays_with_missing_measure(self):
+        with self.assertRaises(MissingArgumentError):
+            self.criteria.match_arrays(distance=[2.4], acceptor_angle=[159])
+
+    def test_match_arrays_without_constraints(self):
+        criteria = InteractionCriteria()
+        self.assertEqual([True, True], criteria.match_arrays(
+            distance=[2.4, 9.9]).tolist())
+        self.assertTrue(criteria.match_arrays())
+        self.assertEqual([True, True], criteria.match_interactions(
+            [FakeInteraction(), FakeInteraction(distance=9.9)]).tolist())
+
+    def test_match_arrays_with_undefined_values(self):
+        mask = self.criteria.match_arrays(
+            distance=[2.4, 2.4], donor_angle=[156, np.nan],
+            acceptor_angle=[np.nan, 100])
+        self.assertEqual([True, False], mask.tolist())
+
+    def test_match_arrays_as_match_measurements(self):
+        values = np.random.RandomState(0).uniform(
+            [1, 100, 100], [4, 180, 180], (100, 3))
+        mask = self.criteria.match_arrays(
+            distance=values[:, 0], donor_angle=values[:, 1],
+            acceptor_angle=values[:, 2])
+        expected = [self.criteria.match_measurements(
+            distance=d, donor_angle=dang, acceptor_angle=aang)
+            for d, dang, aang in values]
+        self.assertEqual(expected, mask.tolist())
+
+    def test_match_arrays_with_presets(self):
+        measurements = dict(distance=[2.4, 2.7], donor_angle=[130, 130],
+                            acceptor_angle=[95, 95])
+        self.assertEqual(
+            [True, True],
+            HydrogenBondCriteria.maestro.match_arrays(measurements).tolist())
+        self.assertEqual(
+            [True, False],
+            HydrogenBondCriteria.glide.match_arrays(measurements).tolist())
+        self.assertEqual(
+            [True, False],
+            HydrogenBondCriteria.glide.value.match_arrays(
+                measurements).tolist())
+        self.assertIs(HydrogenBondCriteria.maestro.value,
+                      HydrogenBondCriteria.default.criteria)
+
+    def test_match_arrays_with_halogen_bond_presets(self):
+        criteria = HalogenBondCriteria.loose.value
+        measurements = dict(
+            distance=[criteria.max_distance, criteria.max_distance + 0.1],
+            donor_angle=[criteria.min_donor_angle] * 2,
+            acceptor_angle=[criteria.min_acceptor_angle] * 2)
+        self.assertEqual(
+            [True, False],
+            HalogenBondCriteria.loose.match_arrays(measurements).tolist())
+
+    def test_envelope(self):
+        criteria = InteractionCriteria.envelope([
+            self.criteria,
+            InteractionCriteria(max_distance=4, min_donor_angle=120,
+                                min_acceptor_angle=130),
+            InteractionCriteria(max_distance=3, min_distance=2.5,
+                                min_donor_angle=150, acceptor_angle=(130, 160),
+                                max_angle=30)])
+        expected = dict(
+            distance=(None, 4),
+            donor_angle=(120, None),
+            acceptor_angle=(120, None))
+        self.assertDictEqual(expected, criteria.measures)
+
+    def test_match_interactions(self):
+        interactions = [
+            FakeInteraction(distance=2.4, donor_angle=156,
+                            acceptor_angle=159),
+            FakeInteraction(distance=2.4, donor_angle=129,
+                            acceptor_angle=159),
+            FakeInteraction(distance=2.4, donor_angle=156,
+                            acceptor_angle=None)]
+        self.assertEqual(
+            [True, False, True],
+            self.criteria.match_interactions(interactions).tolist())
+        self.assertEqual(
+            [self.criteria.match_interaction(i) for i in interactions],
+            self.criteria.match_interactions(interactions).tolist())
+
+    def test_match_interactions_with_missing_measure(self):
+        interactions = [FakeInteraction(distance=2.4, donor_angle=156)]
+        with self.assertRaises(MissingArgumentError):
+            self.criteria.match_interactions(interactions)
+        with self.assertRaises(MissingArgumentError):
+            InteractionCriteria(max_distance=2.8).match_interactions(
+                [FakeInteraction(angle=20), FakeInteraction(angle=40)])
+
+    def test_envelope_of_no_criteria(self):
+        with self.assertRaises(ValueError):
+            InteractionCriteria.envelope([])
+
     def test_replace(self):
         criteria = self.criteria.replace(min_distance=None)
         expected = dict(
@@ -67,5 +178,11 @@ class InteractionCriteriaTests(unittest.TestCase):
         self.assertIsNot(criteria, self.criteria)
         self.assertDictEqual(expected, criteria.measures)
 
+
+class FakeInteraction(object):
+    def __init__(self, **measurements):
+        self.measurements = measurements
+
+
 if __name__ == '__main__':
     unittest.main()
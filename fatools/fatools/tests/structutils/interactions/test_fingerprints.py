@@ -0,0 +1,182 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions.fingerprints import (
+    CSRMatrix, InteractionFingerprintMatrix, InteractionFingerprintWriter,
+    _ifp_colors)
+from fatools.tests.structutils.interactions import FakeInteraction
+
+CSV_OUTPUT = '''\
+,K3,D12,F30,,L100
+,SB:NZ,HB:bb,PP:6R,SC:sc,XB:
+pose1,,2.61,4.0,14%,
+pose2,3.5,3.0,,,
+pose3,,,,12%,3.33
+'''
+
+
+class InteractionFingerprintMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.interaction_matrix = make_interaction_matrix()
+        self.labels = ['pose1', 'pose2', 'pose3']
+        self.ifp = InteractionFingerprintMatrix(
+            self.interaction_matrix, labels=self.labels)
+
+    def test_values(self):
+        expected = [[np.nan, 2.61, 4.0, 0.145, np.nan],
+                    [3.5, 3.0, np.nan, np.nan, np.nan],
+                    [np.nan, np.nan, np.nan, 0.125, 3.33]]
+        self.assertEqual(np.float32, self.ifp.values.dtype)
+        np.testing.assert_allclose(expected, self.ifp.values, rtol=1e-6)
+        self.assertEqual(
+            [False, True, True, True, False], self.ifp.mask[0].tolist())
+
+    def test_fingerprints(self):
+        self.assertEqual(3, len(self.ifp))
+        self.assertEqual([None, 2.61, 4.0, 0.145, None], list(self.ifp[0]))
+        self.assertEqual([3.5, 3.0, None, None, None], list(self.ifp[1]))
+
+    def test_normalized_matrix(self):
+        expected = [[-1, 1, 1, 1, -1],
+                    [1, 0, -1, -1, -1],
+                    [-1, -1, -1, 0, 1]]
+        np.testing.assert_allclose(expected, self.ifp._normalized_matrix)
+
+    def test_sparse(self):
+        sparse_ifp = InteractionFingerprintMatrix(
+            self.interaction_matrix, labels=self.labels, sparse=True)
+        self.assertTrue(sparse_ifp.sparse)
+        self.assertIsInstance(sparse_ifp._values, CSRMatrix)
+        self.assertEqual(7, len(sparse_ifp._values.data))
+        np.testing.assert_array_equal(self.ifp.values, sparse_ifp.values)
+        self.assertEqual(str(self.ifp), str(sparse_ifp))
+        np.testing.assert_array_equal(self.ifp._normalized_matrix,
+                                      sparse_ifp._normalized_matrix)
+
+    def test_write_csv(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filepath = os.path.join(tmpdir, 'ifp.csv')
+            self.ifp.write_csv(filepath)
+            with open(filepath) as csvfile:
+                self.assertEqual(CSV_OUTPUT,
+                                 csvfile.read().replace('\r\n', '\n'))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_write_img(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for group_by in ('residue', 'interaction'):
+                filepath = os.path.join(tmpdir, group_by + '.png')
+                self.ifp.write_img(filepath, dpi=30, group_by=group_by)
+                self.assertTrue(os.path.getsize(filepath))
+            self.ifp.write_img(os.path.join(tmpdir, 'tile.png'), dpi=30,
+                               tile_size=2)
+            self.assertEqual(
+                ['interaction.png', 'residue.png', 'tile_1.png',
+                 'tile_2.png'], sorted(os.listdir(tmpdir)))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_colors(self):
+        colors = _ifp_colors(self.ifp._normalized_matrix,
+                             self.ifp.bins_desc.pluck(0))
+        self.assertEqual((3, 5, 4), colors.shape)
+        self.assertEqual([255, 255, 255, 255], colors[0, 0].tolist())
+        self.assertEqual([0, 0, 255, 255], colors[0, 1].tolist())
+        self.assertEqual([165, 42, 42, 255], colors[1, 0].tolist())
+
+
+class InteractionFingerprintWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tmpdir, 'ifp.csv')
+        self.interaction_matrix = make_interaction_matrix()
+        self.labels = ['pose1', 'pose2', 'pose3']
+        self.bins_desc = InteractionFingerprintMatrix(
+            self.interaction_matrix).bins_desc
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def read_output(self):
+        with open(self.filepath) as csvfile:
+            return csvfile.read().replace('\r\n', '\n')
+
+    def test_write(self):
+        with InteractionFingerprintWriter(self.filepath,
+                                          self.bins_desc) as writer:
+            writer.writerows(self.interaction_matrix, self.labels)
+        self.assertTrue(writer.closed)
+        self.assertEqual(3, writer.nrows)
+        self.assertEqual(CSV_OUTPUT, self.read_output())
+
+    def test_write_keeps_minimum_per_bin(self):
+        # the shortest h-bond to D12 bb comes first this time
+        self.interaction_matrix[0][0].distance = 2.61
+        self.interaction_matrix[0][1].distance = 2.87
+        with InteractionFingerprintWriter(self.filepath,
+                                          self.bins_desc) as writer:
+            writer.writerows(self.interaction_matrix, self.labels)
+        self.assertEqual(CSV_OUTPUT, self.read_output())
+
+    def test_append(self):
+        with InteractionFingerprintWriter(self.filepath,
+                                          self.bins_desc) as writer:
+            writer.write(self.interaction_matrix[0], 'pose1')
+        with InteractionFingerprintWriter(self.filepath, self.bins_desc,
+                                          append=True) as writer:
+            self.assertEqual(1, writer.nrows)
+            writer.writerows(self.interaction_matrix[1:], self.labels[1:])
+        self.assertEqual(3, writer.nrows)
+        self.assertEqual(CSV_OUTPUT, self.read_output())
+
+    def test_append_mismatching_bins(self):
+        with InteractionFingerprintWriter(self.filepath, self.bins_desc):
+            pass
+        with self.assertRaises(ValueError):
+            InteractionFingerprintWriter(self.filepath, self.bins_desc[1:],
+                                         append=True)
+
+    def test_unknown_bins_are_skipped(self):
+        with InteractionFingerprintWriter(self.filepath, self.bins_desc[:2],
+                                          labels=False) as writer:
+            writer.writerows(self.interaction_matrix)
+            writer.write([])
+        self.assertEqual(4, writer.nskipped)
+        self.assertEqual('K3,D12\nSB:NZ,HB:bb\n,2.61\n3.5,3.0\n,\n,\n',
+                         self.read_output())
+
+
+class CSRMatrixTests(unittest.TestCase):
+    def test_from_entries(self):
+        matrix = CSRMatrix.from_entries(
+            [2, 0, 2, 0], [1, 3, 1, 0], [5., 1., 4., 2.], (3, 4))
+        self.assertEqual([2, 1, 4], matrix.data.tolist())
+        self.assertEqual([0, 3, 1], matrix.indices.tolist())
+        self.assertEqual([0, 2, 2, 3], matrix.indptr.tolist())
+        expected = [[2, np.nan, np.nan, 1],
+                    [np.nan] * 4,
+                    [np.nan, 4, np.nan, np.nan]]
+        np.testing.assert_array_equal(expected, matrix.toarray())
+        np.testing.assert_array_equal(expected[2], matrix.getrow(2))
+
+
+def make_interaction_matrix():
+    return [
+        [FakeInteraction('h-bond', 'D12 bb', 2.87, (5, 40)),
+         FakeInteraction('h-bond', 'D12 bb', 2.61, (6, 40)),
+         FakeInteraction('steric-clash', 'F30 sc', 0.145, (60, 41)),
+         FakeInteraction('pi-pi', 'F30 6R', 4.0, (61, 42))],
+        [FakeInteraction('salt-bridge', 'K3 NZ', 3.5, (7, 41)),
+         FakeInteraction('h-bond', 'D12 bb', 3.0, (5, 41))],
+        [FakeInteraction('steric-clash', 'F30 sc', 0.125, (60, 41)),
+         FakeInteraction('x-bond', 'L100', 3.33, (9, 43))]]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from fatools.structutils.interactions import (ContactFrequency,
+                                              ContactFrequencyAccumulator)
+from fatools.tests.structutils.interactions import FakeInteraction
+
+
+class ContactFrequencyAccumulatorTests(unittest.TestCase):
+    def setUp(self):
+        self.poses = [
+            [FakeInteraction('h-bond', 'D12 bb', 2.8, (5, 40)),
+             FakeInteraction('h-bond', 'D12 bb', 2.6, (6, 40)),
+             FakeInteraction('pi-pi', 'F30 6R', 4.0, (61, 42))],
+            [FakeInteraction('salt-bridge', 'K3 NZ', 3.5, (7, 41)),
+             FakeInteraction('h-bond', 'D12 bb', 3.0, (5, 41))],
+            [],
+            [FakeInteraction('x-bond', 'L100', 3.3, (9, 43))]]
+        self.expected = (
+            ContactFrequency('salt-bridge', 3, 'K', 'NZ', 1, 1, .25, 3.5,
+                             3.5),
+            ContactFrequency('h-bond', 12, 'D', 'bb', 3, 2, .5, 2.6,
+                             (2.8 + 2.6 + 3.0) / 3),
+            ContactFrequency('pi-pi', 30, 'F', '6R', 1, 1, .25, 4.0, 4.0),
+            ContactFrequency('x-bond', 100, 'L', '', 1, 1, .25, 3.3, 3.3))
+
+    def assertFrequenciesEqual(self, expected, frequencies):
+        self.assertEqual(len(expected), len(frequencies))
+        for expected_freq, freq in zip(expected, frequencies):
+            self.assertEqual(expected_freq[:5], freq[:5])
+            for expected_value, value in zip(expected_freq[5:], freq[5:]):
+                self.assertAlmostEqual(expected_value, value)
+
+    def test_update(self):
+        accumulator = ContactFrequencyAccumulator()
+        accumulator.update(self.poses)
+        self.assertEqual(4, accumulator.nposes)
+        self.assertEqual(4, len(accumulator))
+        self.assertFrequenciesEqual(self.expected, accumulator.frequencies())
+
+    def test_merge(self):
+        accumulator1 = ContactFrequencyAccumulator()
+        accumulator1.update(self.poses[:1])
+        accumulator2 = ContactFrequencyAccumulator()
+        accumulator2.update(self.poses[1:])
+        self.assertIs(accumulator1, accumulator1.merge(accumulator2))
+        self.assertEqual(4, accumulator1.nposes)
+        self.assertFrequenciesEqual(self.expected, accumulator1.frequencies())
+        self.assertEqual(3, len(accumulator2))  # left untouched
+
+    def test_write_csv(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filepath = os.path.join(tmpdir, 'frequencies.csv')
+            accumulator = ContactFrequencyAccumulator()
+            accumulator.update(self.poses)
+            accumulator.write_csv(filepath)
+            with open(filepath, 'rb') as csvfile:
+                rows = list(csv.reader(csvfile))
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(list(ContactFrequency._fields), rows[0])
+        self.assertEqual(['salt-bridge', '3', 'K', 'NZ', '1', '1', '0.25',
+                          '3.5', '3.5'], rows[1])
+        self.assertEqual(5, len(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
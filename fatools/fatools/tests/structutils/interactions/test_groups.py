@@ -0,0 +1,147 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.arrays import StructureArrays
+from fatools.structutils.interactions.groups import (RingCache,
+                                                     find_aromatic_rings,
+                                                     find_charged_atoms,
+                                                     measure_rings)
+from fatools.tests.structutils.interactions import (FakeBond, FakeRing,
+                                                    FakeStructure)
+
+
+class FindChargedAtomsTests(unittest.TestCase):
+    def setUp(self):
+        # acetate (C1, C2, O3, O4-), methylammonium (C5, N6+) and nitro
+        # (N7+, O8-, O9) groups
+        self.st = make_structure_arrays(
+            ['C', 'C', 'O', 'O', 'C', 'N', 'N', 'O', 'O'],
+            [0, 0, 0, -1, 0, 1, 1, -1, 0],
+            [(1, 2), (2, 3), (2, 4), (5, 6), (7, 8), (7, 9)])
+
+    def test_find_charged_atoms(self):
+        charged = find_charged_atoms(self.st)
+        self.assertEqual([3, 4, 6], charged.indexes.tolist())
+        self.assertEqual([-1, -1, 1], charged.charges.tolist())
+        self.assertEqual([6], charged.cations.tolist())
+
+    def test_find_charged_atoms_without_resonance(self):
+        charged = find_charged_atoms(self.st, resonance=False)
+        self.assertEqual([4, 6], charged.indexes.tolist())
+
+    def test_find_charged_atoms_in_atom_subset(self):
+        charged = find_charged_atoms(self.st, [1, 2, 4, 5, 6])
+        self.assertEqual([4, 6], charged.indexes.tolist())
+        self.assertEqual([6], charged.subset([1, 6]).indexes.tolist())
+
+
+class FindAromaticRingsTests(unittest.TestCase):
+    def test_find_aromatic_rings(self):
+        st = FakeStructure(['C'] * 12, [0] * 12, [])
+        st.ring = [FakeRing((1, 2, 3, 4, 5, 6), True),
+                   FakeRing((7, 8, 9, 10, 11, 12), False)]
+        self.assertEqual(((1, 2, 3, 4, 5, 6), ), find_aromatic_rings(st))
+        self.assertEqual((), find_aromatic_rings(st, range(1, 6)))
+
+
+class MeasureRingsTests(unittest.TestCase):
+    def setUp(self):
+        angles = np.radians(np.arange(0, 360, 60))
+        hexagon = np.column_stack(
+            [1.4 * np.cos(angles), 1.4 * np.sin(angles), np.zeros(6)])
+        angles = np.radians(np.arange(0, 360, 72))
+        pentagon = np.column_stack(
+            [np.zeros(5), 1.2 * np.cos(angles), 1.2 * np.sin(angles)])
+        self.coords = np.vstack([hexagon + [1, 2, 3], pentagon])
+        self.rings = [range(1, 7), range(7, 12)]
+
+    def test_measure_rings(self):
+        centroids, normals = measure_rings(self.coords, self.rings)
+        np.testing.assert_allclose([[1, 2, 3], [0, 0, 0]], centroids,
+                                   atol=1e-9)
+        np.testing.assert_allclose([[0, 0, 1], [1, 0, 0]], np.abs(normals),
+                                   atol=1e-9)
+
+    def test_measure_rings_in_batch(self):
+        poses = np.array([self.coords, self.coords + [0, 0, 5]])
+        centroids, normals = measure_rings(poses, self.rings)
+        self.assertEqual((2, 2, 3), centroids.shape)
+        np.testing.assert_allclose([[1, 2, 8], [0, 0, 5]], centroids[1],
+                                   atol=1e-9)
+        np.testing.assert_allclose([[0, 0, 1], [1, 0, 0]],
+                                   np.abs(normals[1]), atol=1e-9)
+
+
+class RingCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.st = FakeStructure(['C'] * 12, [0] * 12, [])
+        self.st.ring = [FakeRing((1, 2, 3, 4, 5, 6), True),
+                        FakeRing((7, 8, 9, 10, 11, 12), True)]
+        angles = np.radians(np.arange(0, 360, 60))
+        hexagon = np.column_stack(
+            [1.4 * np.cos(angles), 1.4 * np.sin(angles), np.zeros(6)])
+        self.st.xyz = np.vstack([hexagon, hexagon + [0, 0, 3.5]])
+        self.cache = RingCache()
+
+    def test_rings(self):
+        rings = self.cache.rings(self.st)
+        self.assertEqual(((1, 2, 3, 4, 5, 6), (7, 8, 9, 10, 11, 12)),
+                         rings.atom_indexes)
+        np.testing.assert_allclose([[0, 0, 0], [0, 0, 3.5]], rings.centroids,
+                                   atol=1e-9)
+        np.testing.assert_allclose([[0, 0, 1], [0, 0, 1]],
+                                   np.abs(rings.normals), atol=1e-9)
+        self.assertIs(rings.centroids, self.cache.rings(self.st).centroids)
+        self.assertEqual(1, self.cache.info().hits)
+
+    def test_rings_are_perceived_once_per_topology(self):
+        self.cache.rings(self.st)
+        self.st.ring = []  # not perceived again
+        self.assertEqual(2, len(self.cache.rings(self.st)))
+        self.st.bonds.append(FakeBond(self.st.atom[0], self.st.atom[1]))
+        self.assertEqual(0, len(self.cache.rings(self.st)))
+
+    def test_rings_with_reused_handle(self):
+        self.cache.rings(self.st)
+        # another molecule with the same handle and atom and bond totals
+        st = FakeStructure(['N'] + ['C'] * 11, [0] * 12, [],
+                           handle=self.st.handle)
+        st.ring = [FakeRing((7, 8, 9, 10, 11, 12), True)]
+        st.xyz = self.st.xyz
+        self.assertEqual(((7, 8, 9, 10, 11, 12), ),
+                         self.cache.rings(st).atom_indexes)
+
+    def test_moved_atoms_only_refresh_geometry(self):
+        self.cache.rings(self.st)
+        self.st.ring = []
+        self.st.xyz = self.st.xyz + [1, 0, 0]
+        rings = self.cache.rings(self.st)
+        self.assertEqual(2, len(rings))
+        np.testing.assert_allclose([[1, 0, 0], [1, 0, 3.5]], rings.centroids,
+                                   atol=1e-9)
+
+    def test_measure(self):
+        poses = np.array([self.st.xyz, self.st.xyz + [0, 5, 0]])
+        rings = self.cache.measure(self.st, poses)
+        self.assertEqual((2, 2, 3), rings.centroids.shape)
+        np.testing.assert_allclose([[0, 5, 0], [0, 5, 3.5]],
+                                   rings.centroids[1], atol=1e-9)
+        rings = rings.subset(range(7, 13))
+        self.assertEqual(((7, 8, 9, 10, 11, 12), ), rings.atom_indexes)
+        self.assertEqual((2, 1, 3), rings.normals.shape)
+
+    def test_invalidate(self):
+        self.cache.rings(self.st)
+        self.cache.invalidate(self.st)
+        self.assertEqual(0, len(self.cache))
+
+
+def make_structure_arrays(elements, charges, bonds):
+    natoms = len(elements)
+    return StructureArrays(
+        np.zeros((natoms, 3)), elements, [1] * natoms, ['A'] * natoms,
+        elements, [1.5] * natoms, charges, bonds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.arrays import StructureArrays
+from fatools.structutils.interactions import (HydrogenBondCriteria,
+                                              HydrogenBondFinder,
+                                              InteractionCriteria)
+from fatools.structutils.interactions.hbond import search_hbonds
+
+
+class SearchHydrogenBondsTests(unittest.TestCase):
+    def setUp(self):
+        # O-H donors pointing along +x
+        self.donors = [[-1, 0, 0], [-1, 10, 0], [-1, 0, 20]]
+        self.hydrogens = [[0, 0, 0], [0, 10, 0], [0, 0, 20]]
+        self.acceptors = [
+            [2.6, 0, 0],  # 2.6 A from H0, linear
+            [0.4168, 12.3635, 0],  # 2.4 A from H1, 100 deg donor angle
+            [2.0785, 0, 21.2],  # 2.4 A from H2, 150 deg donor angle
+            [30, 30, 30]]  # too far from everything
+        nan = [np.nan] * 3
+        self.neighbors = [
+            [[3.8, 0, 0], nan],  # 180 deg acceptor angle
+            [[1.5444, 12.774, 0], nan],  # 120 deg acceptor angle
+            [[2.2868, 0, 22.3818], [2.7668, 0, 20.217]],  # 130 and 95 deg
+            [nan, nan]]
+
+    def search(self, criteria=None, neighbors=True):
+        return search_hbonds(self.hydrogens, self.donors, self.acceptors,
+                             self.neighbors if neighbors else None,
+                             criteria=criteria)
+
+    def test_search_hbonds(self):
+        matches = self.search()
+        self.assertEqual([0, 2], matches.hydrogen_indexes.tolist())
+        self.assertEqual([0, 2], matches.acceptor_indexes.tolist())
+        np.testing.assert_allclose([2.6, 2.4], matches.distances, atol=1e-4)
+        np.testing.assert_allclose([180, 150], matches.donor_angles,
+                                   atol=1e-2)
+        # the angle with the first acceptor neighbor
+        np.testing.assert_allclose([180, 130], matches.acceptor_angles,
+                                   atol=1e-2)
+
+    def test_search_hbonds_with_smallest_acceptor_angle(self):
+        matches = search_hbonds(self.hydrogens, self.donors, self.acceptors,
+                                self.neighbors, smallest_acceptor_angle=True)
+        self.assertEqual([0, 2], matches.hydrogen_indexes.tolist())
+        np.testing.assert_allclose([180, 95], matches.acceptor_angles,
+                                   atol=1e-2)
+
+        criteria = InteractionCriteria(max_distance=3, min_acceptor_angle=100)
+        matches = search_hbonds(self.hydrogens, self.donors, self.acceptors,
+                                self.neighbors, criteria=criteria,
+                                smallest_acceptor_angle=True)
+        self.assertEqual([0, 1], matches.hydrogen_indexes.tolist())
+
+    def test_search_hbonds_with_criteria_preset(self):
+        matches = self.search('glide')
+        self.assertEqual([1, 2], matches.hydrogen_indexes.tolist())
+        self.assertEqual([1, 2], matches.acceptor_indexes.tolist())
+
+        matches = self.search(HydrogenBondCriteria.glide.value)
+        self.assertEqual([1, 2], matches.hydrogen_indexes.tolist())
+
+    def test_search_hbonds_with_custom_criteria(self):
+        criteria = InteractionCriteria(
+            max_distance=3, min_donor_angle=140, min_acceptor_angle=140)
+        matches = self.search(criteria)
+        self.assertEqual([0], matches.hydrogen_indexes.tolist())
+        self.assertEqual([0], matches.acceptor_indexes.tolist())
+
+    def test_search_hbonds_without_acceptor_neighbors(self):
+        matches = self.search(neighbors=False)
+        self.assertEqual([0, 2], matches.hydrogen_indexes.tolist())
+        self.assertTrue(np.isnan(matches.acceptor_angles).all())
+
+    def test_search_hbonds_without_candidates(self):
+        matches = search_hbonds(self.hydrogens, self.donors, [[50, 50, 50]])
+        self.assertEqual(0, len(matches.hydrogen_indexes))
+        self.assertEqual(0, len(matches.distances))
+
+
+class HydrogenBondFinderTests(unittest.TestCase):
+    def test_criteria_setup(self):
+        glide = HydrogenBondCriteria.glide.value
+        self.assertIs(glide, HydrogenBondFinder('glide').criteria)
+        self.assertIs(glide, HydrogenBondFinder(glide).criteria)
+        self.assertIs(
+            glide, HydrogenBondFinder(HydrogenBondCriteria.glide).criteria)
+
+    def test_criteria_setup_with_constraints(self):
+        criteria = HydrogenBondFinder('glide', max_distance=3).criteria
+        self.assertEqual((None, 3), criteria.distance)
+        self.assertEqual((90, None), criteria.donor_angle)
+
+        criteria = HydrogenBondFinder(max_distance=3).criteria
+        self.assertEqual((None, 3), criteria.distance)
+        self.assertEqual((120, None), criteria.donor_angle)
+
+    def test_search_structure_arrays(self):
+        # receptor N-H donor and ligand C=O acceptor, both ways
+        receptor = StructureArrays(
+            [[-1, 0, 0], [0, 0, 0], [2.9, 0, 0]], ['N', 'H', 'O'],
+            [1] * 3, ['A'] * 3, ['N', 'H', 'O'], [1.5] * 3, [0] * 3,
+            [(1, 2)])
+        ligand = StructureArrays(
+            [[2, 0, 0], [3.2, 0, 0], [2.9, 1, 0], [2.9, 2, 0]],
+            ['O', 'C', 'H', 'O'], [900] * 4, ['L'] * 4,
+            ['O1', 'C1', 'H1', 'O2'], [1.5] * 4, [0] * 4,
+            [(1, 2), (3, 4)])
+        finder = HydrogenBondFinder()
+        interactions = finder._search_atom_indexes(
+            receptor, [1, 2, 3], ligand, [1, 3, 4])
+        self.assertEqual([((2, ), (1, )), ((3, ), (3, ))],
+                         [i.atom_indexes for i in interactions])
+        self.assertAlmostEqual(2, interactions[0].distance)
+        self.assertAlmostEqual(180, interactions[0].donor_angle)
+        self.assertAlmostEqual(180, interactions[0].acceptor_angle)
+        self.assertIsNone(interactions[1].acceptor_angle)
+
+    def test_search_with_several_acceptor_neighbors(self):
+        # N-H donor pointing to an O acceptor bonded to two carbons, with
+        # 130 deg (first neighbor) and 85 or 100 deg acceptor angles
+        receptor = StructureArrays(
+            [[-1, 0, 0], [0, 0, 0]], ['N', 'H'], [1] * 2, ['A'] * 2,
+            ['N', 'H'], [1.5] * 2, [0] * 2, [(1, 2)])
+        finder = HydrogenBondFinder()
+        for second_neighbor, expected in (([1.8954, -1.1954, 0], 0),
+                                          ([2.2084, -1.1818, 0], 1)):
+            ligand = StructureArrays(
+                [[2, 0, 0], [2.7713, 0.9193, 0], second_neighbor],
+                ['O', 'C', 'C'], [900] * 3, ['L'] * 3, ['O1', 'C1', 'C2'],
+                [1.5] * 3, [0] * 3, [(1, 2), (1, 3)])
+            interactions = finder._search_atom_indexes(
+                receptor, [2], ligand, [1])
+            self.assertEqual(expected, len(interactions))
+        self.assertAlmostEqual(130, interactions[0].acceptor_angle,
+                               places=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
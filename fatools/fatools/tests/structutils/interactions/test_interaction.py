@@ -0,0 +1,76 @@
+import unittest
+
+from fatools.structure import Atom
+from fatools.structutils.interactions import interaction
+from fatools.structutils.interactions.interaction import Interaction
+
+
+class InteractionTests(unittest.TestCase):
+    def setUp(self):
+        self.wrap_atom_if_needed = interaction.wrap_atom_if_needed
+        interaction.wrap_atom_if_needed = fake_wrap_atom_if_needed
+        self.st1 = FakeStructure([FakeAtom(1, 10, 'D', 'OD1'),
+                                  FakeAtom(2, 12, 'K', 'NZ')])
+        self.st2 = FakeStructure([FakeAtom(1, 900, 'L', 'O1')])
+        self.interaction = FakeInteraction(
+            self.st1, self.st1.atom[2], self.st2, self.st2.atom[1],
+            distance=2.5, energy=-1.2)
+
+    def tearDown(self):
+        interaction.wrap_atom_if_needed = self.wrap_atom_if_needed
+
+    def test_compact_storage(self):
+        self.assertFalse(hasattr(self.interaction, '__dict__'))
+        self.assertEqual((2, 1), self.interaction._fragment_refs)
+        self.assertIsNone(self.interaction._cache)
+
+    def test_fragments_are_fetched_from_structures(self):
+        self.assertEqual((self.st1.atom[2], self.st2.atom[1]),
+                         self.interaction.fragments)
+        self.assertEqual(((2, ), (1, )), self.interaction.atom_indexes)
+        self.assertEqual((12, 900), self.interaction.residues)
+
+    def test_measurements(self):
+        self.assertEqual(2.5, self.interaction.distance)
+        self.assertEqual(5.0, self.interaction.double_distance)
+        self.assertEqual(-1.2, self.interaction.energy)
+        self.assertEqual((2.5, 5.0), self.interaction.measurement_values)
+        self.assertEqual(dict(distance=2.5, double_distance=5.0,
+                              energy=-1.2),
+                         self.interaction.measurements)
+        self.assertRaises(AttributeError, getattr, self.interaction, 'angle')
+
+    def test_lazy_properties(self):
+        self.assertEqual('fake[2, 1]', self.interaction.description)
+        self.assertEqual('K12 NZ', self.interaction.recep_desc)
+        self.assertIn('recep_desc', self.interaction._cache)
+
+
+class FakeInteraction(Interaction):
+    __slots__ = ()
+    __interaction_name__ = 'fake'
+    __measures__ = ('distance', 'double_distance')
+
+    def calculate_double_distance(self, atoms):
+        return 2 * self.distance
+
+
+class FakeAtom(Atom):
+    def __init__(self, index, resnum, pdbcode, pdbname):
+        self.index = index
+        self.resnum = resnum
+        self.pdbcode = pdbcode
+        self.pdbname = pdbname
+
+
+class FakeStructure(object):
+    def __init__(self, atoms):
+        self.atom = dict((atom.index, atom) for atom in atoms)
+
+
+def fake_wrap_atom_if_needed(atom, st=None):
+    return st.atom[atom] if isinstance(atom, int) else atom
+
+
+if __name__ == '__main__':
+    unittest.main()
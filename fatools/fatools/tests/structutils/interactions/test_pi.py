@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions import (CationPiCriteria,
+                                              InteractionCriteria)
+from fatools.structutils.interactions.pi import search_cation_pi, search_pi_pi
+
+
+class SearchCationPiTests(unittest.TestCase):
+    def setUp(self):
+        self.centroids = [[0, 0, 0], [20, 0, 0]]
+        self.normals = [[0, 0, 1], [0, 0, -1]]
+        self.cations = [
+            [0, 0, 4],  # right above ring 0
+            [0, 2, -4],  # ~26.6 deg below ring 0
+            [20, 4, 3],  # ~53.1 deg above ring 1
+            [20, 0, 7]]  # too far from ring 1
+
+    def test_search_cation_pi(self):
+        matches = search_cation_pi(self.cations, self.centroids, self.normals)
+        self.assertEqual([0, 1], matches.cation_indexes.tolist())
+        self.assertEqual([0, 0], matches.ring_indexes.tolist())
+        np.testing.assert_allclose([4, np.hypot(2, 4)], matches.distances)
+        np.testing.assert_allclose([0, np.degrees(np.arctan2(2, 4))],
+                                   matches.angles, atol=1e-6)
+
+    def test_search_cation_pi_with_criteria(self):
+        criteria = CationPiCriteria.default.value.replace(
+            max_distance=8, max_angle=60)
+        matches = search_cation_pi(self.cations, self.centroids,
+                                   self.normals, criteria)
+        self.assertEqual([0, 1, 2, 3], matches.cation_indexes.tolist())
+        self.assertEqual([0, 0, 1, 1], matches.ring_indexes.tolist())
+
+    def test_search_cation_pi_in_batch(self):
+        centroids = np.array([self.centroids, np.add(self.centroids, 50)])
+        normals = np.array([self.normals, self.normals])
+        matches = search_cation_pi([[0, 0, 4], [50, 50, 46]], centroids,
+                                   normals)
+        self.assertEqual([0, 1], matches.pose_indexes.tolist())
+        self.assertEqual([0, 1], matches.cation_indexes.tolist())
+        self.assertEqual([0, 0], matches.ring_indexes.tolist())
+
+
+class SearchPiPiTests(unittest.TestCase):
+    def setUp(self):
+        self.criteria = InteractionCriteria(max_face_to_face_distance=4.4,
+                                            max_edge_to_face_distance=5.5)
+        self.centroids = [[0, 0, 0]]
+        self.normals = [[0, 0, 1]]
+        self.other_centroids = [
+            [0, 0, 3.5],  # stacked face to face
+            [5, 0, 0],  # T-shaped, edge to face
+            [0, 3, 0],  # tilted by 45 deg
+            [0, 0, 6]]  # parallel but too far
+        self.other_normals = [[0, 0, -1], [1, 0, 0], [0, 1, 1], [0, 0, 1]]
+
+    def test_search_pi_pi(self):
+        matches = search_pi_pi(self.centroids, self.normals,
+                               self.other_centroids, self.other_normals,
+                               self.criteria)
+        self.assertEqual([0, 0], matches.indexes1.tolist())
+        self.assertEqual([0, 1], matches.indexes2.tolist())
+        np.testing.assert_allclose([3.5, 5], matches.distances)
+        np.testing.assert_allclose([0, 90], matches.angles, atol=1e-6)
+        self.assertEqual([True, False], matches.face_to_face.tolist())
+
+    def test_search_pi_pi_with_default_criteria(self):
+        matches = search_pi_pi(self.centroids, self.normals,
+                               self.other_centroids, self.other_normals)
+        self.assertEqual([0, 1], matches.indexes2.tolist())
+
+        # parallel and perpendicular rings far apart do not stack
+        matches = search_pi_pi(self.centroids, self.normals,
+                               [[0, 0, 25], [50, 0, 0]],
+                               [[0, 0, 1], [1, 0, 0]])
+        self.assertEqual(0, len(matches.indexes2))
+
+    def test_search_pi_pi_in_batch(self):
+        centroids = np.array([self.centroids, np.add(self.centroids, 1.5)])
+        normals = np.array([self.normals, self.normals])
+        matches = search_pi_pi(centroids, normals, self.other_centroids,
+                               self.other_normals, self.criteria)
+        self.assertEqual([0, 0, 1, 1], matches.pose_indexes.tolist())
+        self.assertEqual([0, 1, 0, 1], matches.indexes2.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
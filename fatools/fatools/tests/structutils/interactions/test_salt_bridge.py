@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions import SaltBridgeCriteria
+from fatools.structutils.interactions.salt_bridge import search_salt_bridges
+
+
+class SearchSaltBridgesTests(unittest.TestCase):
+    def setUp(self):
+        self.coords1 = [[0, 0, 0], [10, 0, 0]]
+        self.charges1 = [1, -1]
+        self.coords2 = [
+            [3.5, 0, 0],  # anion close to the cation
+            [0, 3, 0],  # cation close to the cation
+            [10, 4.5, 0],  # cation too far from the anion
+            [13.9, 0, 0]]  # cation close to the anion
+        self.charges2 = [-1, 2, 1, 1]
+
+    def test_search_salt_bridges(self):
+        matches = search_salt_bridges(self.coords1, self.charges1,
+                                      self.coords2, self.charges2)
+        self.assertEqual([0, 0], matches.pose_indexes.tolist())
+        self.assertEqual([0, 1], matches.indexes1.tolist())
+        self.assertEqual([0, 3], matches.indexes2.tolist())
+        np.testing.assert_allclose([3.5, 3.9], matches.distances)
+
+    def test_search_salt_bridges_with_criteria(self):
+        matches = search_salt_bridges(self.coords1, self.charges1,
+                                      self.coords2, self.charges2,
+                                      criteria='default')
+        self.assertEqual(2, len(matches.distances))
+        matches = search_salt_bridges(
+            self.coords1, self.charges1, self.coords2, self.charges2,
+            criteria=SaltBridgeCriteria.default.value.replace(
+                max_distance=5))
+        self.assertEqual([0, 1, 1], matches.indexes1.tolist())
+        self.assertEqual([0, 2, 3], matches.indexes2.tolist())
+
+    def test_search_salt_bridges_in_batch(self):
+        poses = np.array([self.coords2, np.add(self.coords2, [0, 0, 1])])
+        matches = search_salt_bridges(self.coords1, self.charges1, poses,
+                                      self.charges2)
+        self.assertEqual([0, 0, 1], matches.pose_indexes.tolist())
+        self.assertEqual([0, 1, 0], matches.indexes1.tolist())
+        self.assertEqual([0, 3, 0], matches.indexes2.tolist())
+        np.testing.assert_allclose([3.5, 3.9, np.hypot(3.5, 1)],
+                                   matches.distances)
+
+    def test_search_salt_bridges_without_atoms(self):
+        matches = search_salt_bridges([], [], self.coords2, self.charges2)
+        self.assertTrue(all(len(values) == 0 for values in matches))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions.fingerprints import (
+    InteractionFingerprintMatrix)
+from fatools.structutils.interactions.similarity import BitFingerprintMatrix
+from fatools.tests.structutils.interactions import FakeInteraction
+from fatools.utils.kernel import InvalidArgumentError
+
+
+class BitFingerprintMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.bits = np.array([[1, 1, 0, 1, 0],
+                              [1, 1, 0, 0, 0],
+                              [0, 0, 1, 0, 1],
+                              [0, 0, 0, 0, 0],
+                              [1, 1, 0, 1, 1]], dtype=bool)
+        self.bfp = BitFingerprintMatrix(self.bits)
+
+    def test_packing(self):
+        self.assertEqual(5, len(self.bfp))
+        self.assertEqual(5, self.bfp.nbits)
+        self.assertEqual([3, 2, 2, 0, 4], self.bfp.counts.tolist())
+        np.testing.assert_array_equal(self.bits, self.bfp.bits)
+
+    def test_counts_span_several_words(self):
+        bits = np.random.RandomState(0).rand(20, 200) < .5
+        bfp = BitFingerprintMatrix(bits)
+        self.assertEqual(bits.sum(axis=1).tolist(), bfp.counts.tolist())
+        np.testing.assert_array_equal(bits, bfp.bits)
+
+    def test_tanimoto(self):
+        np.testing.assert_allclose(
+            [[1, 2 / 3., 0, 0, .75]], self.bfp.similarity(0))
+
+    def test_tversky(self):
+        scores = self.bfp.similarity(0, metric='tversky', alpha=1, beta=0)
+        np.testing.assert_allclose([[1, 2 / 3., 0, 0, 1]], scores)
+        scores = self.bfp.similarity(0, metric='tversky')  # dice
+        np.testing.assert_allclose([[1, .8, 0, 0, 6 / 7.]], scores)
+
+    def test_invalid_metric(self):
+        with self.assertRaises(InvalidArgumentError):
+            self.bfp.similarity(0, metric='cosine')
+
+    def test_top_k(self):
+        indexes, scores = self.bfp.top_k(0, k=3)
+        self.assertEqual([0, 4, 1], indexes.tolist())
+        np.testing.assert_allclose([1, .75, 2 / 3.], scores)
+
+    def test_top_k_ties(self):
+        indexes, scores = self.bfp.top_k(1, k=4)
+        self.assertEqual([1, 0, 4, 2], indexes.tolist())
+        np.testing.assert_allclose([1, 2 / 3., .5, 0], scores)
+
+    def test_top_k_many_references(self):
+        indexes, scores = self.bfp.top_k([1, 2], k=3)
+        self.assertEqual([1, 2, 0], indexes.tolist())
+        indexes, scores = self.bfp.top_k([1, 2], k=2, fusion='mean')
+        self.assertEqual([1, 2], indexes.tolist())
+        np.testing.assert_allclose([.5, .5], scores)
+
+
+class FromInteractionFingerprintsTests(unittest.TestCase):
+    def setUp(self):
+        self.ifp = InteractionFingerprintMatrix([
+            [FakeInteraction('h-bond', 'D12 bb', 2.6, (12, 6)),
+             FakeInteraction('steric-clash', 'F30 sc', .15, (30, 12))],
+            [FakeInteraction('h-bond', 'D12 bb', 3.2, (12, 6))],
+            [FakeInteraction('salt-bridge', 'K3 NZ', 3.9, (3, 11))]])
+
+    def test_presence_bits(self):
+        bfp = BitFingerprintMatrix.from_ifp(self.ifp)
+        np.testing.assert_array_equal(self.ifp.mask, bfp.bits)
+
+    def test_distance_buckets(self):
+        bfp = BitFingerprintMatrix.from_ifp(self.ifp, (3.5, 3.0))
+        self.assertEqual((3.0, 3.5), bfp.distance_buckets)
+        # K3 NZ, D12 bb and F30 sc with presence, <= 3.0 and <= 3.5 bits
+        np.testing.assert_array_equal([[0, 0, 0, 1, 1, 1, 1, 0, 0],
+                                       [0, 0, 0, 1, 0, 1, 0, 0, 0],
+                                       [1, 0, 0, 0, 0, 0, 0, 0, 0]],
+                                      bfp.bits)
+
+    def test_fingerprint_reference(self):
+        bfp = BitFingerprintMatrix.from_ifp(self.ifp)
+        reference = InteractionFingerprintMatrix([
+            [FakeInteraction('h-bond', 'D12 bb', 2.9, (12, 6)),
+             FakeInteraction('pi-pi', 'Y50 6R', 4.1, (50, 5))]])[0]
+        np.testing.assert_allclose([[1 / 3., .5, 0]],
+                                   bfp.similarity(reference))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions.steric_clash import (compound_clashes,
+                                                           search_clashes)
+
+
+class SearchClashesTests(unittest.TestCase):
+    def setUp(self):
+        self.coords1 = [[0, 0, 0], [10, 0, 0]]
+        self.radii1 = [1.5, 1.5]
+        self.coords2 = [
+            [2.0, 0, 0],  # 1.0 overlap with atom 0
+            [0, 2.5, 0],  # 0.5 overlap with atom 0
+            [0, 0, 2.8],  # 0.2 overlap with atom 0
+            [10, 2.6, 0],  # 0.4 overlap with atom 1
+            [30, 30, 30]]
+        self.radii2 = [1.5, 1.5, 1.5, 1.5, 1.5]
+
+    def test_search_clashes(self):
+        matches = search_clashes(self.coords1, self.radii1, self.coords2,
+                                 self.radii2)
+        self.assertEqual([0, 0], matches.indexes1.tolist())
+        self.assertEqual([0, 1], matches.indexes2.tolist())
+        np.testing.assert_allclose([2.0, 2.5], matches.distances)
+        np.testing.assert_allclose([1.0, 0.5], matches.overlaps)
+
+    def test_search_clashes_min_overlap(self):
+        matches = search_clashes(self.coords1, self.radii1, self.coords2,
+                                 self.radii2, min_overlap=0.1)
+        self.assertEqual([0, 0, 0, 1], matches.indexes1.tolist())
+        self.assertEqual([0, 1, 2, 3], matches.indexes2.tolist())
+        matches = search_clashes(self.coords1, self.radii1, self.coords2,
+                                 self.radii2, min_overlap=3.5)
+        self.assertEqual(0, len(matches.indexes1))
+
+    def test_search_clashes_without_atoms(self):
+        matches = search_clashes([], [], self.coords2, self.radii2)
+        self.assertTrue(all(len(values) == 0 for values in matches))
+        self.assertEqual(np.intp, matches.indexes1.dtype)
+
+
+class CompoundClashesTests(unittest.TestCase):
+    def test_compound_clashes(self):
+        counts, distances, overlaps = compound_clashes(
+            [0, 1, 0, 0], [2.0, 2.5, 3.0, 2.5], [1.0, 0.5, 0.2, 0.6])
+        self.assertEqual([3, 1], counts.tolist())
+        np.testing.assert_allclose([2.5, 2.5], distances)
+        np.testing.assert_allclose([0.6, 0.5], overlaps)
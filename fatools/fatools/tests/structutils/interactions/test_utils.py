@@ -0,0 +1,183 @@
+import unittest
+from collections import OrderedDict
+
+from fatools.structutils.interactions import (HydrogenBondCriteria,
+                                              HydrogenBondFinder,
+                                              InteractionCriteria,
+                                              PiPiFinder, utils)
+from fatools.structutils.interactions.utils import (
+    MultipleCriteriaFinder, MultipleInteractionFinder, compact_interactions,
+    find_interactions_by_criteria, map_interactions,
+    remove_duplicate_interactions)
+from fatools.utils.kernel import InvalidArgumentError
+
+
+class MultipleInteractionFinderTests(unittest.TestCase):
+    def setUp(self):
+        self.interactions = (
+            FakeInteraction('h-bond', 12, (5, 40)),
+            FakeInteraction('steric-clash', 12, (5, 40)),  # duplicate
+            FakeInteraction('salt-bridge', 3, (7, 41)),
+            FakeInteraction('h-bond', 3, (8, 42)),
+            FakeInteraction('pi-pi', 30, (60, 43)))
+
+    def test_search_with_several_finders(self):
+        finder = MultipleInteractionFinder('h-bond')
+        finder._finders = tuple(FakeFinder(self.interactions[i::3])
+                                for i in range(3))
+        interactions = finder._search_interactions(None, [1], None, [2])
+        self.assertEqual(4, len(interactions))
+        self.assertNotIn(self.interactions[1], interactions)
+
+    def test_remove_duplicate_interactions_keeps_order(self):
+        interactions = remove_duplicate_interactions(list(self.interactions))
+        self.assertEqual(
+            [self.interactions[i] for i in (0, 2, 3, 4)], list(interactions))
+
+
+class CompactInteractionsTests(unittest.TestCase):
+    def setUp(self):
+        self._clash_classes = (utils.StericClashInteraction,
+                               utils.CompoundStericClashInteraction)
+        utils.StericClashInteraction = FakeClash
+        utils.CompoundStericClashInteraction = FakeCompoundClash
+
+    def tearDown(self):
+        (utils.StericClashInteraction,
+         utils.CompoundStericClashInteraction) = self._clash_classes
+
+    def test_compact_interactions(self):
+        clashes = [FakeClash(12, (6, 41), 2.5, .5),
+                   FakeClash(3, (7, 41), 2.6, .6),
+                   FakeClash(12, (5, 40), 2.0, 1.0)]
+        hbond = FakeInteraction('h-bond', 12, (5, 40))
+        interactions = compact_interactions(clashes + [hbond])
+        self.assertEqual(3, len(interactions))
+        # a single clash of a residue is kept as is
+        self.assertIs(clashes[1], interactions[0])
+        self.assertIs(hbond, interactions[1])
+        compound = interactions[2]
+        self.assertIsInstance(compound, FakeCompoundClash)
+        self.assertEqual([clashes[2], clashes[0]], compound.clashes)
+        self.assertAlmostEqual(2.25, compound.distance)
+        self.assertAlmostEqual(.75, compound.overlap)
+
+    def test_compact_interactions_without_groups(self):
+        clashes = (FakeClash(12, (6, 41), 2.5, .5),
+                   FakeClash(3, (7, 41), 2.6, .6))
+        self.assertEqual(clashes[::-1], compact_interactions(clashes))
+
+
+class MultipleCriteriaFinderTests(unittest.TestCase):
+    def setUp(self):
+        self.criteria_sets = OrderedDict([
+            ('maestro', {'h-bond': 'maestro'}),
+            ('glide', {'h-bond': HydrogenBondCriteria.glide})])
+
+    def test_search_once_with_envelope_criteria(self):
+        finder = MultipleCriteriaFinder(self.criteria_sets, 'h-bond')
+        self.assertEqual(1, len(finder._finders))
+        self.assertIsInstance(finder._finders[0], HydrogenBondFinder)
+        self.assertEqual(
+            dict(distance=(None, 2.8), donor_angle=(90, None),
+                 acceptor_angle=(60, None)),
+            finder._finders[0].criteria.measures)
+
+    def test_search_once_per_criteria_without_measures(self):
+        criteria_sets = dict(default={}, strict={'pi-pi': InteractionCriteria(
+            max_face_to_face_distance=10, max_edge_to_face_distance=20)})
+        finder = MultipleCriteriaFinder(criteria_sets, 'pi-pi')
+        self.assertEqual(2, len(finder._finders))
+        self.assertTrue(all(isinstance(f, PiPiFinder)
+                            for f in finder._finders))
+
+    def test_interactions_option(self):
+        finder = MultipleCriteriaFinder(self.criteria_sets,
+                                        interactions=['h-bond'])
+        self.assertEqual(1, len(finder._finders))
+        self.assertIsInstance(finder._finders[0], HydrogenBondFinder)
+
+    def test_unknown_option(self):
+        with self.assertRaises(InvalidArgumentError):
+            MultipleCriteriaFinder(self.criteria_sets, 'h-bond', radius=5)
+        with self.assertRaises(InvalidArgumentError):
+            find_interactions_by_criteria(self.criteria_sets, None,
+                                          interaction='h-bond')
+
+    def test_gather_interactions_per_criteria_set(self):
+        interactions = [
+            FakeInteraction('h-bond', 3, (8, 42), distance=2.4,
+                            donor_angle=130, acceptor_angle=95),
+            FakeInteraction('h-bond', 5, (9, 43), distance=2.7,
+                            donor_angle=130, acceptor_angle=None),
+            FakeInteraction('h-bond', 7, (10, 44), distance=2.4,
+                            donor_angle=100, acceptor_angle=95)]
+        finder = MultipleCriteriaFinder(self.criteria_sets, 'h-bond')
+        labeled = finder._gather_interactions(lambda f: interactions)
+        self.assertEqual(['maestro', 'glide'], list(labeled))
+        self.assertEqual(interactions[:2], list(labeled['maestro']))
+        self.assertEqual([interactions[0], interactions[2]],
+                         list(labeled['glide']))
+
+
+class MapInteractionsTests(unittest.TestCase):
+    def setUp(self):
+        self._finder_cls = utils.MultipleInteractionFinder
+        utils.MultipleInteractionFinder = FakeContextFinder
+
+    def tearDown(self):
+        utils.MultipleInteractionFinder = self._finder_cls
+
+    def test_map_interactions(self):
+        receptor_ctx = utils.ReceptorContext.__new__(utils.ReceptorContext)
+        results = map_interactions(len, receptor_ctx, range(25),
+                                   processes=2, chunksize=4)
+        self.assertEqual([i % 4 for i in range(25)], results)
+
+
+class FakeContextFinder(object):
+    def __init__(self, **options):
+        pass
+
+    def search_context(self, receptor_ctx, ligand, atoms):
+        return (None, ) * (ligand % 4)
+
+
+class FakeFinder(object):
+    def __init__(self, interactions):
+        self.interactions = interactions
+
+    def _search_interactions(self, st1, as1, st2, as2):
+        return list(self.interactions)
+
+
+class FakeCompoundClash(object):
+    def __init__(self, clashes, distance, overlap):
+        self.clashes = clashes
+        self.distance, self.overlap = distance, overlap
+
+    @classmethod
+    def from_steric_clashes(cls, steric_clashes, **measurements):
+        return cls(list(steric_clashes), **measurements)
+
+
+class FakeInteraction(object):
+    def __init__(self, name, resnum, atom_indexes, **measurements):
+        self.measurements = measurements
+        self.name = name
+        self.residues = (resnum, )
+        self.atom_indexes = tuple((i, ) for i in atom_indexes)
+
+    def __repr__(self):
+        return 'FakeInteraction({0.name}, {0.atom_indexes})'.format(self)
+
+
+
+class FakeClash(FakeInteraction):
+    def __init__(self, resnum, atom_indexes, distance, overlap):
+        super(FakeClash, self).__init__('steric-clash', resnum, atom_indexes)
+        self.distance, self.overlap = distance, overlap
+
+
+if __name__ == '__main__':
+    unittest.main()
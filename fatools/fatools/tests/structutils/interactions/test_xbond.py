@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.interactions import match_xbond
+from fatools.structutils.interactions.xbond import search_xbonds
+
+COS50, SIN50 = np.cos(np.radians(50)), np.sin(np.radians(50))
+
+
+class SearchHalogenBondsTests(unittest.TestCase):
+    def setUp(self):
+        # C-Cl bond along +x
+        self.donors = [[-1.75, 0, 0]]
+        self.halogens = [[0, 0, 0]]
+        self.acceptors = [
+            [3, 0, 0],  # linear
+            [3 * COS50, 3 * SIN50, 0],  # 130 deg donor angle
+            [4.5, 0, 0],  # linear, but far
+            [0, 0, 3]]  # 90 deg donor angle
+        self.neighbors = [
+            [4.2, 0, 0],
+            [4.2 * COS50, 4.2 * SIN50, 0],
+            [5.7, 0, 0],
+            [np.nan] * 3]
+
+    def test_search_xbonds(self):
+        matches = search_xbonds(self.halogens, self.donors, self.acceptors,
+                                self.neighbors)
+        self.assertEqual([0], matches.halogen_indexes.tolist())
+        self.assertEqual([0], matches.acceptor_indexes.tolist())
+        np.testing.assert_allclose([3], matches.distances)
+        np.testing.assert_allclose([180], matches.donor_angles)
+        np.testing.assert_allclose([180], matches.acceptor_angles)
+
+    def test_search_xbonds_with_criteria_preset(self):
+        matches = search_xbonds(self.halogens, self.donors, self.acceptors,
+                                self.neighbors, criteria='loose')
+        self.assertEqual([0, 1, 2], matches.acceptor_indexes.tolist())
+        np.testing.assert_allclose([180, 130, 180], matches.donor_angles)
+
+    def test_search_xbonds_without_acceptor_neighbors(self):
+        matches = search_xbonds(self.halogens, self.donors, self.acceptors)
+        self.assertEqual([0], matches.acceptor_indexes.tolist())
+        self.assertTrue(np.isnan(matches.acceptor_angles).all())
+
+
+class MatchHalogenBondTests(unittest.TestCase):
+    def setUp(self):
+        carbon = FakeAtom('C', [-1.75, 0, 0])
+        self.halogen = FakeAtom('Cl', [0, 0, 0], carbon)
+        self.acceptor = FakeAtom('O', [3 * COS50, 3 * SIN50, 0])
+
+    def test_match_xbond(self):
+        self.assertFalse(match_xbond(self.halogen, self.acceptor))
+        self.assertTrue(match_xbond(self.acceptor, self.halogen,
+                                    max_distance=5, donor_angle=120))
+
+    def test_match_xbond_with_excluded_halogen(self):
+        self.halogen.element = 'F'
+        self.assertFalse(match_xbond(self.halogen, self.acceptor,
+                                     max_distance=5, donor_angle=120))
+
+    def test_match_xbond_returning_values(self):
+        match, distance, donor_angle, acceptor_angle = match_xbond(
+            self.halogen, self.acceptor, return_values=True)
+        self.assertFalse(match)
+        self.assertAlmostEqual(3, distance)
+        self.assertAlmostEqual(130, donor_angle)
+        self.assertIsNone(acceptor_angle)
+
+
+class FakeAtom(object):
+    def __init__(self, element, xyz, *neighbors):
+        self.element, self.xyz = element, xyz
+        self.bond = dict((i, FakeBond(atom))
+                         for i, atom in enumerate(neighbors, 1))
+    bond_total = property(lambda self: len(self.bond))
+    is_halogen = property(lambda self: self.element in ('F', 'Cl', 'Br', 'I'))
+
+
+class FakeBond(object):
+    def __init__(self, atom2):
+        self.atom2 = atom2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+from fatools.structutils.arrays import StructureArrays, StructureArraysCache
+
+
+class StructureArraysTests(unittest.TestCase):
+    def setUp(self):
+        # water (1-3), a two-atom residue 10 (4-5) and residue 11 (6)
+        self.arrays = StructureArrays(
+            [[0, 0, 0], [0.96, 0, 0], [-0.24, 0.93, 0],
+             [3, 0, 0], [4.5, 0, 0], [9, 0, 0]],
+            ['O', 'H', 'H', 'N', 'C', 'C'],
+            [1, 1, 1, 10, 10, 11],
+            ['W', 'W', 'W', 'A', 'A', 'A'],
+            [' O  ', ' H1 ', ' H2 ', ' N  ', ' CA ', ' CA '],
+            [1.52, 1.1, 1.1, 1.55, 1.7, 1.7],
+            [0, 0, 0, 1, 0, 0],
+            [(1, 2), (1, 3), (4, 5)])
+
+    def test_arrays(self):
+        self.assertEqual(6, len(self.arrays))
+        self.assertEqual(['N', 'C'], self.arrays.elements[3:5].tolist())
+        self.assertEqual([0, 0, 0, 1, 1, 2], self.arrays.residue_ids.tolist())
+
+    def test_neighbors(self):
+        self.assertEqual([2, 3], self.arrays.bonded_atoms(1).tolist())
+        self.assertEqual([1], self.arrays.bonded_atoms(3).tolist())
+        self.assertEqual([2, 1, 1, 1, 1, 0], self.arrays.degrees().tolist())
+        self.assertEqual([[2, 3], [0, 0], [4, 0]],
+                         self.arrays.neighbor_matrix([1, 6, 5]).tolist())
+        self.assertEqual([[2], [0]],
+                         self.arrays.neighbor_matrix([1, 6], 1).tolist())
+
+    def test_coordinates(self):
+        coords = self.arrays.coordinates([[4, 0]])
+        self.assertEqual((1, 2, 3), coords.shape)
+        self.assertEqual([3, 0, 0], coords[0, 0].tolist())
+        self.assertTrue(np.isnan(coords[0, 1]).all())
+
+    def test_within(self):
+        self.assertEqual([1, 2, 3, 4],
+                         self.arrays.within([1], 3.2).tolist())
+        self.assertEqual([1, 2, 3, 4, 5],
+                         self.arrays.within([1], 3.2, fillres=True).tolist())
+        self.assertEqual([], self.arrays.within([], 3.2).tolist())
+
+    def test_refresh_coordinates(self):
+        self.arrays.refresh_coordinates(self.arrays.coords + 1)
+        self.assertEqual([1, 1, 1], self.arrays.coords[0].tolist())
+        with self.assertRaises(ValueError):
+            self.arrays.refresh_coordinates(np.zeros((2, 3)))
+
+
+class StructureArraysCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = StructureArraysCache()
+        self.st = FakeStructure(handle=1)
+
+    def test_get(self):
+        arrays = self.cache.get(self.st)
+        self.assertEqual(['O', 'H'], arrays.elements.tolist())
+        self.assertEqual([[1, 2]], arrays.bonds.tolist())
+        self.assertIs(arrays, self.cache.get(self.st))
+        self.assertIs(arrays, self.cache.get(arrays))
+        self.assertEqual(1, self.st.snapshots)
+
+    def test_get_after_moving_atoms(self):
+        arrays = self.cache.get(self.st)
+        self.st.xyz[1, 0] = 2
+        self.assertIs(arrays, self.cache.get(self.st))
+        self.assertEqual(2, arrays.coords[1, 0])
+        self.assertEqual(1, self.st.snapshots)
+
+    def test_get_after_adding_atoms(self):
+        self.cache.get(self.st)
+        self.st.atom_total += 1
+        self.cache.get(self.st)
+        self.assertEqual(2, self.st.snapshots)
+
+    def test_get_with_reused_handle(self):
+        self.cache.get(self.st)
+        st = FakeStructure(handle=1)  # same handle and totals
+        st.atoms = [FakeAtom(1, 'C'), FakeAtom(2, 'O')]
+        arrays = self.cache.get(st)
+        self.assertEqual(['C', 'O'], arrays.elements.tolist())
+        self.assertEqual(1, len(self.cache))
+
+        del self.st, st
+        st = FakeStructure(handle=1)
+        self.assertEqual(['O', 'H'], self.cache.get(st).elements.tolist())
+
+    def test_invalidate(self):
+        self.cache.get(self.st)
+        self.cache.invalidate(self.st)
+        self.assertEqual(0, len(self.cache))
+
+
+class FakeAtom(object):
+    def __init__(self, index, element):
+        self.index = index
+        self.element = element
+        self.resnum = 1
+        self.chain = 'A'
+        self.pdbname = element
+        self.vdw_radius = 1.5
+        self.formal_charge = 0
+        self.inscode = ' '
+
+
+class FakeBond(object):
+    def __init__(self, atom1, atom2):
+        self.atom1, self.atom2 = atom1, atom2
+
+
+class FakeStructure(object):
+    def __init__(self, handle):
+        self.handle = handle
+        self.atoms = [FakeAtom(1, 'O'), FakeAtom(2, 'H')]
+        self.atom_total = len(self.atoms)
+        self.bond_total = 1
+        self.xyz = np.array([[0., 0, 0], [0.96, 0, 0]])
+        self.snapshots = 0
+
+    @property
+    def atom(self):
+        self.snapshots += 1
+        return iter(self.atoms)
+
+    @property
+    def bond(self):
+        return iter([FakeBond(*self.atoms)])
+
+    def getXYZ(self, copy=True):
+        return self.xyz.copy() if copy else self.xyz
+
+
+if __name__ == '__main__':
+    unittest.main()
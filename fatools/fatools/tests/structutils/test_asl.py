@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+from fatools.structutils import asl
+from fatools.structutils.asl import ASLCache
+
+
+class ASLCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self._analyze, asl.analyze = asl.analyze, self
+        self.cache = ASLCache(maxsize=2)
+        self.st = FakeStructure(handle=1)
+
+    def tearDown(self):
+        asl.analyze = self._analyze
+
+    def evaluate_asl(self, st, expression):
+        self.calls.append(expression)
+        return [1, 3] if expression == 'ligand' else [2]
+
+    def test_evaluate(self):
+        self.assertEqual([1, 3], self.cache.evaluate(self.st, 'ligand'))
+        self.assertEqual([1, 3], self.cache.evaluate(self.st, 'ligand'))
+        self.assertEqual([2], self.cache.evaluate(self.st, 'protein'))
+        self.assertEqual(['ligand', 'protein'], self.calls)
+        self.assertEqual((1, 2, 2, 2), self.cache.info())
+
+    def test_evaluate_returns_copies(self):
+        self.cache.evaluate(self.st, 'ligand').append(5)
+        self.assertEqual([1, 3], self.cache.evaluate(self.st, 'ligand'))
+
+    def test_evaluate_after_modification(self):
+        self.cache.evaluate(self.st, 'ligand')
+        self.st.xyz[0, 0] += 1
+        self.cache.evaluate(self.st, 'ligand')
+        self.st.bond_total += 1
+        self.cache.evaluate(self.st, 'ligand')
+        self.cache.evaluate(FakeStructure(handle=2), 'ligand')
+        self.assertEqual(4, len(self.calls))
+
+    def test_eviction(self):
+        for expression in ('ligand', 'protein', 'water', 'ligand'):
+            self.cache.evaluate(self.st, expression)
+        self.assertEqual(4, len(self.calls))
+        self.assertEqual(2, len(self.cache))
+
+    def test_invalidate(self):
+        other_st = FakeStructure(handle=2)
+        self.cache.evaluate(self.st, 'ligand')
+        self.cache.evaluate(other_st, 'ligand')
+        self.cache.invalidate(self.st)
+        self.cache.evaluate(self.st, 'ligand')
+        self.cache.evaluate(other_st, 'ligand')
+        self.assertEqual(3, len(self.calls))
+
+
+class FakeStructure(object):
+    def __init__(self, handle):
+        self.handle = handle
+        self.xyz = np.zeros((3, 3))
+        self.atom_total, self.bond_total = 3, 2
+
+    def getXYZ(self, copy=True):
+        return self.xyz.copy() if copy else self.xyz
+
+
+if __name__ == '__main__':
+    unittest.main()
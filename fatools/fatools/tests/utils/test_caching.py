@@ -1,5 +1,5 @@
 import unittest
-from fatools.utils.caching import cached_property
+from fatools.utils.caching import LRUCache, cached_property, lru_cache
 
 
 class CachedPropertyTests(unittest.TestCase):
@@ -37,3 +37,81 @@ class CachedPropertyTests(unittest.TestCase):
         self.assertEqual('https://github.com/franciscoadasme', c.url)
         self.assertEqual('https://github.com/franciscoadasme', c.url)
         self.assertEqual(1, c.access_count)
+
+
+class LRUCacheTests(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'], cache['b'] = 1, 2
+        self.assertEqual(1, cache.get('a'))
+        cache['c'] = 3
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(2, len(cache))
+
+    def test_info(self):
+        cache = LRUCache(maxsize=10)
+        cache['a'] = 1
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual((1, 1, 10, 1), cache.info())
+        cache.clear()
+        self.assertEqual((0, 0, 10, 0), cache.info())
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_keys(self):
+        cache = LRUCache(maxsize=3)
+        cache['a'], cache['b'], cache['c'] = 1, 2, 3
+        cache.get('a')
+        cache.discard('b')
+        self.assertEqual(['c', 'a'], cache.keys())
+
+
+class LRUCacheDecoratorTests(unittest.TestCase):
+    def test_lru_cache(self):
+        calls = []
+
+        @lru_cache(maxsize=2)
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        self.assertEqual(4, square(2))
+        self.assertEqual(4, square(2))
+        self.assertEqual(9, square(3))
+        self.assertEqual([2, 3], calls)
+        self.assertEqual((1, 2, 2, 2), square.cache_info())
+
+        square.cache_clear()
+        self.assertEqual(4, square(2))
+        self.assertEqual([2, 3, 2], calls)
+
+    def test_lru_cache_with_keyword_arguments(self):
+        @lru_cache()
+        def power(x, exp=2):
+            return x ** exp
+
+        self.assertEqual(4, power(2))
+        self.assertEqual(8, power(2, exp=3))
+        self.assertEqual(8, power(2, exp=3))
+        self.assertEqual(1, power.cache_info().hits)
+
+    def test_lru_cache_with_unhashable_arguments(self):
+        @lru_cache()
+        def total(values):
+            return sum(values)
+
+        self.assertEqual(6, total([1, 2, 3]))
+        self.assertEqual(0, total.cache_info().currsize)
+
+    def test_lru_cache_typed(self):
+        @lru_cache(typed=True)
+        def identity(x):
+            return x
+
+        self.assertIs(int, type(identity(1)))
+        self.assertIs(float, type(identity(1.0)))
@@ -1,9 +1,12 @@
 import unittest
 
 import numpy as np
-from fatools.utils.geometry import (Plane, measure_angle,
+from fatools.utils.geometry import (CellList, Plane,
+                                    find_batch_neighbor_pairs,
+                                    find_neighbor_pairs, gather_points,
+                                    measure_angle, measure_angles,
                                     measure_dihedral_angle, measure_distance,
-                                    measure_plane_angle)
+                                    measure_distances, measure_plane_angle)
 
 
 class MeasureAngleTests(unittest.TestCase):
@@ -24,6 +27,22 @@ class MeasureAngleTests(unittest.TestCase):
             [1.311066, 0.561562, 1.328446])
         self.assertAlmostEqual(176.022718008, angle, 9)
 
+    def test_measure_angles(self):
+        a = [[-0.871019, -3.915519, 2.403598],
+             [-1.072402, -3.222503, 3.313817]]
+        b = [[0.075125, -2.098154, 1.929842],
+             [-0.109673, -1.804572, 2.493067]]
+        angles = measure_angles(a, b, [1.311066, 0.561562, 1.328446])
+        self.assertEqual((2,), angles.shape)
+        self.assertAlmostEqual(177.102806566, angles[0], 9)
+        self.assertAlmostEqual(176.022718008, angles[1], 9)
+
+    def test_measure_angles_with_nan(self):
+        angles = measure_angles([[1, 0, 0], [np.nan] * 3], [0, 0, 0],
+                                [0, 1, 0])
+        self.assertAlmostEqual(90, angles[0])
+        self.assertTrue(np.isnan(angles[1]))
+
 
 class MeasureDistanceTests(unittest.TestCase):
     def test_measure_distance(self):
@@ -32,6 +51,13 @@ class MeasureDistanceTests(unittest.TestCase):
             [1.311066, 0.561562, 1.328446])
         self.assertAlmostEqual(2.99387984144, distance, 11)
 
+    def test_measure_distances(self):
+        distances = measure_distances(
+            [[0.075125, -2.098154, 1.929842], [3, 4, 0]],
+            [[1.311066, 0.561562, 1.328446], [0, 0, 0]])
+        self.assertAlmostEqual(2.99387984144, distances[0], 11)
+        self.assertEqual(5, distances[1])
+
 
 class MeasurePlaneAngleTests(unittest.TestCase):
     def test_measure_plane_angle(self):
@@ -97,5 +123,119 @@ class PlaneTests(unittest.TestCase):
         self.assertEqual((-30, 48, -17, -15), plane.coef)
 
 
+class CellListTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        self.coords = rng.uniform(-30, 30, size=(300, 3))
+        self.cell_list = CellList(self.coords, 4)
+
+    def test_query_pairs(self):
+        queries = [[0, 0, 0], [10, -10, 5], [100, 100, 100]]
+        for cutoff in (4, 2.5):
+            i, j = self.cell_list.query_pairs(queries, cutoff)
+            distances = np.linalg.norm(
+                np.array(queries)[:, np.newaxis] - self.coords, axis=2)
+            expected_i, expected_j = np.nonzero(distances <= cutoff)
+            self.assertEqual(expected_i.tolist(), i.tolist())
+            self.assertEqual(expected_j.tolist(), j.tolist())
+
+    def test_query_points(self):
+        queries = np.array([[0, 0, 0], [1, 0, 0]])
+        distances = np.linalg.norm(
+            queries[:, np.newaxis] - self.coords, axis=2)
+        expected = np.nonzero((distances <= 4).any(axis=0))[0]
+        idxs = self.cell_list.query_points(queries)
+        self.assertEqual(expected.tolist(), idxs.tolist())
+
+    def test_query_with_cutoff_larger_than_cell_size(self):
+        with self.assertRaises(ValueError):
+            self.cell_list.query_pairs([[0, 0, 0]], 5)
+
+
+class FindNeighborPairsTests(unittest.TestCase):
+    def test_find_neighbor_pairs(self):
+        rng = np.random.RandomState(7)
+        coords1 = rng.uniform(-20, 20, size=(150, 3))
+        coords2 = rng.uniform(-15, 25, size=(200, 3))
+        i, j = find_neighbor_pairs(coords1, coords2, 3.5)
+
+        distances = np.linalg.norm(
+            coords1[:, np.newaxis] - coords2[np.newaxis], axis=2)
+        expected_i, expected_j = np.nonzero(distances <= 3.5)
+        self.assertTrue(len(expected_i) > 0)
+        self.assertEqual(expected_i.tolist(), i.tolist())
+        self.assertEqual(expected_j.tolist(), j.tolist())
+
+    def test_find_neighbor_pairs_includes_cutoff(self):
+        i, j = find_neighbor_pairs([[0, 0, 0]], [[0, 0, 2], [0, 2.1, 0]], 2)
+        self.assertEqual([0], i.tolist())
+        self.assertEqual([0], j.tolist())
+
+    def test_find_neighbor_pairs_with_no_points(self):
+        i, j = find_neighbor_pairs([], [[0, 0, 0]], 2)
+        self.assertEqual(0, len(i))
+        self.assertEqual(0, len(j))
+
+    def test_find_neighbor_pairs_with_invalid_cutoff(self):
+        with self.assertRaises(ValueError):
+            find_neighbor_pairs([[0, 0, 0]], [[0, 0, 1]], 0)
+
+
+class FindBatchNeighborPairsTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        self.coords = rng.uniform(-10, 10, size=(40, 3))
+        self.poses = rng.uniform(-10, 10, size=(5, 30, 3))
+
+    def expected_pairs(self, coords1, coords2, cutoff):
+        poses, idxs1, idxs2 = [], [], []
+        for k, (xyz1, xyz2) in enumerate(zip(coords1, coords2)):
+            i, j = find_neighbor_pairs(xyz1, xyz2, cutoff)
+            poses.extend([k] * len(i))
+            idxs1.extend(i.tolist())
+            idxs2.extend(j.tolist())
+        return poses, idxs1, idxs2
+
+    def assertPairsEqual(self, expected, pairs):
+        self.assertTrue(len(expected[0]) > 0)
+        for expected_idxs, idxs in zip(expected, pairs):
+            self.assertEqual(expected_idxs, idxs.tolist())
+
+    def test_find_batch_neighbor_pairs_with_poses_in_second_set(self):
+        pairs = find_batch_neighbor_pairs(self.coords, self.poses, 3)
+        expected = self.expected_pairs(
+            [self.coords] * len(self.poses), self.poses, 3)
+        self.assertPairsEqual(expected, pairs)
+
+    def test_find_batch_neighbor_pairs_with_poses_in_first_set(self):
+        pairs = find_batch_neighbor_pairs(self.poses, self.coords, 3)
+        expected = self.expected_pairs(
+            self.poses, [self.coords] * len(self.poses), 3)
+        self.assertPairsEqual(expected, pairs)
+
+    def test_find_batch_neighbor_pairs_with_poses_in_both_sets(self):
+        poses2 = self.poses[::-1]
+        pairs = find_batch_neighbor_pairs(self.poses, poses2, 3)
+        self.assertPairsEqual(self.expected_pairs(self.poses, poses2, 3),
+                              pairs)
+        with self.assertRaises(ValueError):
+            find_batch_neighbor_pairs(self.poses, poses2[:2], 3)
+
+    def test_find_batch_neighbor_pairs_without_poses(self):
+        poses, i, j = find_batch_neighbor_pairs(self.coords, self.coords, 3)
+        expected_i, expected_j = find_neighbor_pairs(
+            self.coords, self.coords, 3)
+        self.assertEqual([0] * len(i), poses.tolist())
+        self.assertEqual(expected_i.tolist(), i.tolist())
+        self.assertEqual(expected_j.tolist(), j.tolist())
+
+    def test_gather_points(self):
+        np.testing.assert_array_equal(
+            self.poses[[1, 3], [2, 4]],
+            gather_points(self.poses, [1, 3], [2, 4]))
+        np.testing.assert_array_equal(
+            self.coords[[2, 4]], gather_points(self.coords, [1, 3], [2, 4]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -244,6 +244,25 @@ class PluralizationTests(unittest.TestCase):
         self.assertEqual('posts', inflection.pluralize('post', count=0))
         self.assertEqual('posts', inflection.pluralize('posts', count=0))
 
+    def test_pluralize_after_adding_irregular(self):
+        self.assertEqual('octopi', inflection.pluralize('octopus'))
+        plurals, singulars = (list(inflection.PLURALS),
+                              list(inflection.SINGULARS))
+        try:
+            inflection.add_irregular('octopus', 'octopuses')
+            self.assertEqual('octopuses', inflection.pluralize('octopus'))
+            self.assertEqual('octopus', inflection.singularize('octopuses'))
+        finally:
+            inflection.PLURALS[:], inflection.SINGULARS[:] = plurals, singulars
+            inflection._clear_rule_caches()
+        self.assertEqual('octopi', inflection.pluralize('octopus'))
+
+    def test_pluralize_is_cached(self):
+        inflection.pluralize.cache_clear()
+        inflection.pluralize('post')
+        inflection.pluralize('post')
+        self.assertEqual((1, 1), inflection.pluralize.cache_info()[:2])
+
     def test_singularize_plural(self):
         for singular, plural in SINGULAR_TO_PLURAL:
             self.assertEqual(singular, inflection.singularize(plural))
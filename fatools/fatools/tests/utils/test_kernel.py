@@ -6,8 +6,8 @@ from fatools.utils.kernel import (FormattedError, InvalidArgumentError,
                                   InvalidTypeError, KeypathGetter,
                                   MissingArgumentError, ensure_type,
                                   getattrnames, getclassname, getqual,
-                                  isiterable, redirect_stream, reraise,
-                                  suppress)
+                                  getter, isiterable, parse_keypath,
+                                  redirect_stream, reraise, suppress)
 
 
 class EnsureTypeTests(unittest.TestCase):
@@ -263,6 +263,48 @@ class KeypathGetterTests(unittest.TestCase):
         getter = KeypathGetter('key.1')
         self.assertEqual(('key', 1), getter._items)
 
+    def test_parsing_keypath_is_cached(self):
+        self.assertIs(parse_keypath('key.key2[2]'),
+                      parse_keypath('key.key2[2]'))
+
+    def test_parsing_keypath_invalid(self):
+        self.assertRaises(InvalidArgumentError, KeypathGetter, 'key.k-y')
+
+    def test_get_attributes_and_items_mixed(self):
+        getter = KeypathGetter('residues[0].name')
+        C = type('C', (), {})
+        value = C()
+        value.residues = [dict(name='ASP'), C()]
+        value.residues[1].name = 'LYS'
+        self.assertEqual('ASP', getter(value))  # falls back to items
+        value.residues.reverse()
+        self.assertEqual('LYS', getter(value))
+
+    def test_get_item_after_attribute_fallback(self):
+        getter = KeypathGetter('count')
+        self.assertEqual(3, getter(dict(count=3)))
+        self.assertEqual(5, getter(dict(count=5)))
+        self.assertRaises(AttributeError, getter, dict(other=5))
+
+
+class GetterTests(unittest.TestCase):
+    def test_single_keypath(self):
+        self.assertEqual(2, getter('entries[1]')(dict(entries=[1, 2])))
+
+    def test_many_keypaths(self):
+        self.assertEqual((0.0, 3.0), getter('real', 'imag')(3j))
+        self.assertEqual((1, 2, 3), getter(0, 1, 2)([1, 2, 3, 4]))
+
+    def test_cached(self):
+        self.assertIs(getter('a.b', 'c'), getter('a.b', 'c'))
+
+    def test_map(self):
+        values = [3j, dict(real=1, imag=2), 4]
+        self.assertEqual([0.0, 1, 4], getter('real').map(values))
+        self.assertEqual([(0.0, 3.0), (1, 2), (4, 0)],
+                         getter('real', 'imag').map(values))
+        self.assertEqual([], getter('real', 'imag').map([]))
+
 class MissingArgumentErrorTests(unittest.TestCase):
     def test_creation(self):
         err = MissingArgumentError('silent')
@@ -0,0 +1,93 @@
+import unittest
+from fractions import Fraction
+
+import numpy as np
+from fatools.utils.statistics import (RunningStats, StatisticsError, mean,
+                                      pvariance, stdev, variance)
+
+
+class FloatStatisticsTests(unittest.TestCase):
+    def setUp(self):
+        self.data = [2.75, 1.75, 1.25, 0.25, 0.5, 1.25, 3.5]
+
+    def test_mean(self):
+        self.assertEqual(1.6071428571428572, mean(self.data))
+        self.assertAlmostEqual(1.6071428571428572,
+                               mean(np.array(self.data)))
+        self.assertAlmostEqual(1.6071428571428572,
+                               mean(np.array(self.data, dtype=np.float32)))
+
+    def test_mean_is_accurate(self):
+        self.assertEqual(1., mean([1e50, 1., -1e50] * 1000) * 3)
+
+    def test_variance(self):
+        self.assertAlmostEqual(1.3720238095238095, variance(self.data))
+        self.assertAlmostEqual(1.3720238095238095,
+                               variance(np.array(self.data)))
+        self.assertAlmostEqual(1.3720238095238095 ** 0.5, stdev(self.data))
+        self.assertAlmostEqual(1.25, pvariance(
+            [0.0, 0.25, 0.25, 1.25, 1.5, 1.75, 2.75, 3.25]))
+
+    def test_exact_path_for_other_types(self):
+        self.assertEqual(Fraction(13, 21), mean(
+            [Fraction(3, 7), Fraction(1, 21), Fraction(5, 3),
+             Fraction(1, 3)]))
+        self.assertEqual(Fraction(67, 108), variance(
+            [Fraction(1, 6), Fraction(1, 2), Fraction(5, 3)]))
+
+    def test_empty_data(self):
+        with self.assertRaises(StatisticsError):
+            mean(np.array([]))
+        with self.assertRaises(StatisticsError):
+            variance([1.])
+
+
+class RunningStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.data = np.random.RandomState(0).normal(-7.5, 2., 1000)
+
+    def assertStatsEqual(self, stats, data):
+        self.assertEqual(len(data), len(stats))
+        self.assertAlmostEqual(np.mean(data), stats.mean)
+        self.assertAlmostEqual(np.var(data, ddof=1), stats.variance)
+        self.assertAlmostEqual(np.var(data), stats.pvariance)
+        self.assertAlmostEqual(np.std(data, ddof=1), stats.stdev)
+        self.assertEqual(np.min(data), stats.min)
+        self.assertEqual(np.max(data), stats.max)
+
+    def test_add(self):
+        stats = RunningStats()
+        for x in self.data:
+            stats.add(x)
+        self.assertStatsEqual(stats, self.data)
+
+    def test_update(self):
+        self.assertStatsEqual(RunningStats(self.data), self.data)
+        self.assertStatsEqual(
+            RunningStats().update(iter(self.data.tolist())), self.data)
+
+        stats = RunningStats(self.data[:10])
+        stats.update(self.data[10:500]).update(list(self.data[500:]))
+        self.assertStatsEqual(stats, self.data)
+
+    def test_merge(self):
+        chunks = [RunningStats(self.data[i:i + 300])
+                  for i in range(0, len(self.data), 300)]
+        stats = RunningStats()
+        for chunk in chunks:
+            stats.merge(chunk)
+        stats.merge(RunningStats())
+        self.assertStatsEqual(stats, self.data)
+
+    def test_empty(self):
+        stats = RunningStats()
+        self.assertEqual(0, len(stats))
+        self.assertIsNone(stats.min)
+        with self.assertRaises(StatisticsError):
+            stats.mean
+        with self.assertRaises(StatisticsError):
+            stats.add(1.).variance
+
+
+if __name__ == '__main__':
+    unittest.main()
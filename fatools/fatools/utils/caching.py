@@ -1,3 +1,14 @@
+import threading
+from collections import namedtuple
+from functools import wraps
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+_KWARGS_MARK = object()
+_MISSING = object()
+_PREV, _NEXT, _KEY, _VALUE = range(4)
+
+
 class cached_property(object):
     """Provide caching for the given (calculated) property.
 
@@ -7,6 +18,10 @@ class cached_property(object):
     Optional ``name`` argument allows you to make cached properties of other
     methods. (e.g.  url = cached_property(get_absolute_url, name='url'))
 
+    Instances without a ``__dict__`` (i.e., classes using ``__slots__``) must
+    have a ``_cache`` slot, initially None, where a dict of cached values is
+    created on first use.
+
     """
     def __init__(self, func, name=None):
         self.func = func
@@ -16,5 +31,195 @@ class cached_property(object):
     def __get__(self, instance, cls=None):
         if instance is None:
             return self
-        val = instance.__dict__[self.name] = self.func(instance)
+        try:
+            cache = instance.__dict__
+        except AttributeError:
+            cache = instance._cache
+            if cache is None:
+                cache = instance._cache = {}
+            elif self.name in cache:
+                return cache[self.name]
+        val = cache[self.name] = self.func(instance)
         return val
+
+
+class LRUCache(object):
+    """Bounded mapping that discards the least recently used items first.
+
+    Hits and misses are counted on every lookup done through :meth:`get`, so
+    the effectiveness of the cache can be inspected via :meth:`info`. It is
+    safe to share an instance between threads.
+
+    Parameters
+    ----------
+    maxsize : int or None, optional
+        Maximum number of items to be stored. If None, the cache can grow
+        without bound. Defaults to 128.
+
+    Examples
+    --------
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache['a'], cache['b'] = 1, 2
+    >>> cache.get('a')
+    1
+    >>> cache['c'] = 3  # 'b' is the least recently used item
+    >>> 'b' in cache
+    False
+    >>> cache.info()
+    CacheInfo(hits=1, misses=0, maxsize=2, currsize=2)
+
+    """
+    def __init__(self, maxsize=128):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('invalid cache size: {}'.format(maxsize))
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._links = dict()
+        self._root = []  # circular doubly linked list: [prev, next, key, val]
+        self._root[:] = [self._root, self._root, None, None]
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._links
+
+    def __len__(self):
+        return len(self._links)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            link = self._links.get(key)
+            if link is not None:
+                link[_VALUE] = value
+                self._move_to_front(link)
+                return
+            root = self._root
+            last = root[_PREV]
+            link = last[_NEXT] = root[_PREV] = self._links[key] = \
+                [last, root, key, value]
+            if self.maxsize is not None and len(self._links) > self.maxsize:
+                oldest = root[_NEXT]
+                self._unlink(oldest)
+                del self._links[oldest[_KEY]]
+
+    def clear(self):
+        """Remove all items and reset the statistics."""
+        with self._lock:
+            self._links.clear()
+            self._root[:] = [self._root, self._root, None, None]
+            self.hits = self.misses = 0
+
+    def discard(self, key):
+        """Remove the item stored under `key`, if any."""
+        with self._lock:
+            link = self._links.pop(key, None)
+            if link is not None:
+                self._unlink(link)
+
+    def get(self, key, default=None):
+        """Return the value for `key` marking it as recently used.
+
+        If `key` is not present, `default` is returned and the lookup is
+        counted as a miss.
+
+        """
+        with self._lock:
+            link = self._links.get(key)
+            if link is None:
+                self.misses += 1
+                return default
+            prev_link, next_link, _, value = link
+            prev_link[_NEXT], next_link[_PREV] = next_link, prev_link
+            root = self._root
+            last = root[_PREV]
+            last[_NEXT] = root[_PREV] = link
+            link[_PREV], link[_NEXT] = last, root
+            self.hits += 1
+            return value
+
+    def info(self):
+        """Return cache statistics as a :class:`CacheInfo` named tuple."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def keys(self):
+        """Return the stored keys, from the least to the most recently
+        used."""
+        with self._lock:
+            keys, link = [], self._root[_NEXT]
+            while link is not self._root:
+                keys.append(link[_KEY])
+                link = link[_NEXT]
+            return keys
+
+    def _move_to_front(self, link):
+        self._unlink(link)
+        root = self._root
+        last = root[_PREV]
+        last[_NEXT] = root[_PREV] = link
+        link[_PREV], link[_NEXT] = last, root
+
+    @staticmethod
+    def _unlink(link):
+        prev_link, next_link = link[_PREV], link[_NEXT]
+        prev_link[_NEXT], next_link[_PREV] = next_link, prev_link
+
+
+def lru_cache(maxsize=128, typed=False):
+    """Memoize a function with a bounded least-recently-used cache.
+
+    Backport of :func:`functools.lru_cache` from Python 3. Arguments must be
+    hashable, otherwise the function is called without caching. The
+    decorated function exposes the ``cache_info()`` and ``cache_clear()``
+    functions, and the original function as ``__wrapped__``.
+
+    Parameters
+    ----------
+    maxsize : int or None, optional
+        Maximum number of results to be cached. If None, the cache can grow
+        without bound. Defaults to 128.
+    typed : bool, optional
+        If True, arguments of different types are cached separately
+        (e.g., ``'a'`` and ``u'a'``). Defaults to False.
+
+    Examples
+    --------
+    >>> @lru_cache(maxsize=32)
+    ... def square(x):
+    ...     return x * x
+    ...
+    >>> square(3), square(3)
+    (9, 9)
+    >>> square.cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=32, currsize=1)
+
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed)
+            try:
+                value = cache.get(key, _MISSING)
+            except TypeError:  # unhashable arguments
+                return func(*args, **kwargs)
+            if value is _MISSING:
+                value = cache[key] = func(*args, **kwargs)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_info = cache.info
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
+
+
+def _make_key(args, kwargs, typed):
+    key = args
+    if kwargs:
+        items = tuple(sorted(kwargs.items()))
+        key += (_KWARGS_MARK,) + items
+    if typed:
+        key += tuple(map(type, args))
+        if kwargs:
+            key += tuple(type(value) for _, value in items)
+    return key
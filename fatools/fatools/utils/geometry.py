@@ -39,11 +39,35 @@ def measure_angle(a, b, c):
     return measure_angle(a - b, c - b)
 
 
+def measure_angles(a, b, c):
+    """Measure the angles a-b-c (in degrees) for arrays of points.
+
+    Coordinates are given along the last axis, so any leading dimensions
+    are broadcast against each other. Angles involving NaN coordinates are
+    NaN.
+
+    """
+    a, b, c = map(np.asarray, (a, b, c))
+    v1, v2 = a - b, c - b
+    normal_norm = np.sqrt((np.cross(v1, v2) ** 2).sum(axis=-1))
+    return np.degrees(np.arctan2(normal_norm, (v1 * v2).sum(axis=-1)))
+
+
 # TODO add docstring
 def measure_distance(a, b):
     return np.linalg.norm(np.array(a) - np.array(b))
 
 
+def measure_distances(a, b):
+    """Measure the distances between arrays of points.
+
+    Coordinates are given along the last axis, so any leading dimensions
+    are broadcast against each other.
+
+    """
+    return np.sqrt(((np.asarray(a) - np.asarray(b)) ** 2).sum(axis=-1))
+
+
 # TODO add docstring
 @dispatch(Iterable, Iterable, Iterable)
 def measure_dihedral_angle(v1, v2, v3):
@@ -70,3 +94,198 @@ def measure_plane_angle(plane1, plane2):
 @dispatch(Iterable, Iterable)
 def measure_plane_angle(a, b):
     return measure_plane_angle(Plane(*a), Plane(*b))
+
+
+class CellList(object):
+    """Spatial index of points binned into cubic cells.
+
+    Points are hashed into a grid of cubic cells with side `cell_size`, so
+    neighbors within that distance are searched only in the same or the
+    26 adjacent cells instead of among all indexed points. The index is
+    built once and can be queried repeatedly, e.g., a receptor against many
+    ligand poses.
+
+    Parameters
+    ----------
+    coords : array_like
+        Cartesian coordinates with shape (n, 3).
+    cell_size : float
+        Side of the cells, which is the largest cutoff that can be queried.
+
+    """
+    def __init__(self, coords, cell_size):
+        if cell_size <= 0:
+            raise ValueError('cell size must be greater than 0')
+        self._coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        self._cell_size = float(cell_size)
+        keys = self._cell_keys(self._coords)
+        self._order = np.argsort(keys, kind='mergesort')
+        self._keys = keys[self._order]
+    cell_size = property(lambda self: self._cell_size)
+    coords = property(lambda self: self._coords)
+
+    def __len__(self):
+        return len(self._coords)
+
+    def query_pairs(self, coords, cutoff=None):
+        """Find the pairs between the given and the indexed points.
+
+        Parameters
+        ----------
+        coords : array_like
+            Cartesian coordinates of the query points with shape (m, 3).
+        cutoff : float, optional
+            Maximum distance (inclusive) between two points of a pair. It
+            cannot be larger than the cell size, which is the default.
+
+        Returns
+        -------
+        tuple of ndarray
+            Indexes ``(i, j)`` into `coords` and the indexed points,
+            respectively, of every pair within `cutoff`, sorted by `i` and
+            then by `j`.
+
+        """
+        cutoff = self._cell_size if cutoff is None else cutoff
+        if not 0 < cutoff <= self._cell_size:
+            raise ValueError('cutoff must be greater than 0 and not larger '
+                             'than the cell size')
+        coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        if not len(coords) or not len(self._coords):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        query_keys = self._cell_keys(coords)
+        all_i, all_j = [], []
+        for offset in _NEIGHBOR_CELL_OFFSETS:
+            keys = query_keys + offset
+            start = np.searchsorted(self._keys, keys, side='left')
+            counts = np.searchsorted(self._keys, keys, side='right') - start
+            total = counts.sum()
+            if not total:
+                continue
+            # position of every candidate within its own cell run
+            run = np.arange(total) - np.repeat(np.cumsum(counts) - counts,
+                                               counts)
+            all_i.append(np.repeat(np.arange(len(coords)), counts))
+            all_j.append(self._order[np.repeat(start, counts) + run])
+        if not all_i:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        i, j = np.concatenate(all_i), np.concatenate(all_j)
+        sqdist = ((coords[i] - self._coords[j]) ** 2).sum(axis=1)
+        mask = sqdist <= cutoff * cutoff
+        i, j = i[mask], j[mask]
+        pair_order = np.lexsort((j, i))
+        return i[pair_order], j[pair_order]
+
+    def query_points(self, coords, cutoff=None):
+        """Return the sorted indexes of the indexed points within `cutoff`
+        of any of the given points."""
+        return np.unique(self.query_pairs(coords, cutoff)[1])
+
+    def _cell_keys(self, coords):
+        # pack the three cell indexes into a single integer (21 bits each)
+        cells = np.floor(coords / self._cell_size).astype(np.int64)
+        cells += _CELL_KEY_BIAS
+        return cells.dot(_CELL_KEY_STRIDES)
+
+
+def find_neighbor_pairs(coords1, coords2, cutoff):
+    """Find the pairs of points closer than a cutoff distance.
+
+    The points in `coords2` are indexed in a `CellList`, so only points in
+    the same or adjacent cells are compared instead of every possible pair.
+
+    Parameters
+    ----------
+    coords1, coords2 : array_like
+        Cartesian coordinates with shape (n, 3) and (m, 3).
+    cutoff : float
+        Maximum distance (inclusive) between two points of a pair.
+
+    Returns
+    -------
+    tuple of ndarray
+        Indexes ``(i, j)`` into `coords1` and `coords2`, respectively, of
+        every pair within `cutoff`, sorted by `i` and then by `j`.
+
+    """
+    if cutoff <= 0:
+        raise ValueError('cutoff must be greater than 0')
+    return CellList(coords2, cutoff).query_pairs(coords1)
+
+
+def find_batch_neighbor_pairs(coords1, coords2, cutoff):
+    """Find the pairs of points closer than a cutoff distance in a batch
+    of poses.
+
+    Either set of points may be given for several poses with shape
+    (p, n, 3), e.g., the docking poses of a ligand against a rigid
+    receptor. The set given once is indexed a single time and queried with
+    the points of every pose at once. When both sets are given per pose,
+    pairs are only searched within the same pose.
+
+    Parameters
+    ----------
+    coords1, coords2 : array_like
+        Cartesian coordinates with shape (n, 3) or (p, n, 3) and (m, 3) or
+        (p, m, 3).
+    cutoff : float
+        Maximum distance (inclusive) between two points of a pair.
+
+    Returns
+    -------
+    tuple of ndarray
+        Pose indexes (0 when neither set has poses) and indexes ``(i, j)``
+        into the points of a pose of `coords1` and `coords2`, respectively,
+        sorted by pose, `i` and then `j`.
+
+    """
+    if cutoff <= 0:
+        raise ValueError('cutoff must be greater than 0')
+    coords1, coords2 = _as_points(coords1), _as_points(coords2)
+    if coords1.ndim == 3 and coords2.ndim == 3:
+        if len(coords1) != len(coords2):
+            raise ValueError('both sets must have the same number of poses')
+        pairs = [find_neighbor_pairs(xyz1, xyz2, cutoff)
+                 for xyz1, xyz2 in zip(coords1, coords2)]
+        poses = np.repeat(np.arange(len(pairs)), [len(i) for i, _ in pairs])
+        i = np.concatenate([i for i, _ in pairs] or [poses])
+        j = np.concatenate([j for _, j in pairs] or [poses])
+        return poses.astype(np.intp), i.astype(np.intp), j.astype(np.intp)
+    elif coords2.ndim == 3:
+        npoints = max(coords2.shape[1], 1)
+        i, j = find_neighbor_pairs(coords1, coords2.reshape(-1, 3), cutoff)
+        poses, j = np.divmod(j, npoints)
+    elif coords1.ndim == 3:
+        npoints = max(coords1.shape[1], 1)
+        i, j = find_neighbor_pairs(coords1.reshape(-1, 3), coords2, cutoff)
+        poses, i = np.divmod(i, npoints)
+    else:
+        i, j = find_neighbor_pairs(coords1, coords2, cutoff)
+        poses = np.zeros(len(i), dtype=np.intp)
+    order = np.lexsort((j, i, poses))
+    return poses[order], i[order], j[order]
+
+
+def gather_points(coords, poses, idxs):
+    """Return the points at `idxs` of the given poses.
+
+    `coords` has shape (n, 3), shared by all poses, or (p, n, 3), as for
+    `find_batch_neighbor_pairs`.
+
+    """
+    coords = _as_points(coords)
+    return coords[poses, idxs] if coords.ndim == 3 else coords[idxs]
+
+
+def _as_points(coords):
+    coords = np.asarray(coords, dtype=float)
+    return coords if coords.ndim == 3 else coords.reshape(-1, 3)
+
+
+_CELL_KEY_BIAS = 1 << 20
+_CELL_KEY_STRIDES = np.array([1 << 42, 1 << 21, 1], dtype=np.int64)
+_NEIGHBOR_CELL_OFFSETS = np.array(
+    [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)],
+    dtype=np.int64).dot(_CELL_KEY_STRIDES)
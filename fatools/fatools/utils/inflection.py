@@ -5,6 +5,11 @@
 It singularizes and pluralizes English words, and transforms strings from
 CamelCase to underscored_string.
 
+Since these functions are usually called over and over with a small
+vocabulary (e.g., attribute names, energy terms), the most expensive ones are
+memoized with bounded LRU caches. Caches of rule-based functions are
+invalidated when the rules change through :func:`add_irregular`.
+
 \* Adaptation from ``inflection`` module created by Janne Vanhala available at
 `GitHub <https://github.com/jpvanhal/inflection>`_.
 
@@ -12,6 +17,10 @@ CamelCase to underscored_string.
 import re
 import unicodedata
 
+from fatools.utils.caching import lru_cache
+
+INFLECTION_CACHE_SIZE = 512
+
 PLURALS = [
     (r'(?i)(quiz)$', r'\1zes'),
     (r'(?i)^(oxen)$', r'\1'),
@@ -113,8 +122,10 @@ def add_irregular(singular, plural):
         SINGULARS.insert(0, (
             r"%s%s$" % (plural[0].lower(), caseinsensitive(plural[1:])),
             singular[0].lower() + singular[1:]))
+    _clear_rule_caches()
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def camelize(sentence, upcase_first_letter=True):
     """Convert a string into *CamelCase* form.
 
@@ -173,6 +184,7 @@ def downcase(sentence):
     return sentence.lower()
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def humanize(word, capitalized=True, acronyms=()):
     """Transform an underscored string into a human readable form.
 
@@ -354,6 +366,7 @@ def ordinalize(num):
     return '{}{}'.format(num, ordinal(num))
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def parameterize(sentence, sep='-'):
     """Return a safe representation with a given word separator.
 
@@ -384,6 +397,7 @@ def parameterize(sentence, sep='-'):
     return downcase(sentence)
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def pluralize(word, count=None):
     """Return the plural form of a word.
 
@@ -426,6 +440,7 @@ def pluralize(word, count=None):
     return word
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def singularize(word):
     """Return the singular form of a word, the reverse of :func:`pluralize`.
 
@@ -453,6 +468,7 @@ def singularize(word):
     return word
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def titleize(sentence):
     """Return a pretty representation of the sentence suitable for titles.
 
@@ -498,6 +514,7 @@ def upcase(sentence):
     return sentence.upper()
 
 
+@lru_cache(INFLECTION_CACHE_SIZE, typed=True)
 def underscore(sentence):
     """Make an underscored, lowercase form from the sentence.
 
@@ -520,6 +537,12 @@ def underscore(sentence):
     sentence = sentence.replace(' ', '_')
     return downcase(sentence)
 
+
+def _clear_rule_caches():
+    """Invalidate cached results that depend on the inflection rules."""
+    for func in (pluralize, singularize):
+        func.cache_clear()
+
 add_irregular('person', 'people')
 add_irregular('man', 'men')
 add_irregular('child', 'children')
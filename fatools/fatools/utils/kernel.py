@@ -2,8 +2,11 @@ import inspect
 import re
 import sys
 from contextlib import contextmanager
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from types import MethodType
 
+from fatools.utils.caching import lru_cache
 from fatools.utils.inflection import underscore
 
 
@@ -61,14 +64,51 @@ class InvalidTypeError(FormattedError):
         super(InvalidTypeError, self).__init__(template, **kwargs)
 
 
-# TODO add docstring
 class KeypathGetter(object):
+    """Callable that fetches the value at a keypath of an object.
+
+    A keypath is a sequence of attribute names, mapping keys and indexes,
+    e.g. ``'residues[0].name'`` or ``'entries.1'``. Every name is first
+    looked up as an attribute and then, if missing, as an item.
+
+    Keypaths are parsed once (see `parse_keypath`) and compiled into a
+    chain of `operator.attrgetter` and `operator.itemgetter` calls that
+    assumes names are attributes. Whenever that fails for an object, the
+    keypath is interpreted step by step, and objects of the same type go
+    straight to the step-by-step path afterwards.
+
+    """
+    __slots__ = ('_items', '_fast', '_slow_types')
+
     def __init__(self, *keys_and_idxs):
         if len(keys_and_idxs) == 1 and isinstance(keys_and_idxs[0], str):
-            keys_and_idxs = KeypathGetter._parse_keypath(keys_and_idxs[0])
+            keys_and_idxs = parse_keypath(keys_and_idxs[0])
         self._items = tuple(keys_and_idxs)
+        self._fast = _compile_keypath(self._items)
+        self._slow_types = set()
 
     def __call__(self, obj):
+        if type(obj) not in self._slow_types:
+            try:
+                return self._fast(obj)
+            except (AttributeError, KeyError, TypeError):
+                self._slow_types.add(type(obj))
+        return self._interpret(obj)
+
+    def map(self, objs):
+        """Return the value for every object in `objs` as a list.
+
+        When the compiled chain works for all objects, the whole list is
+        computed by `map` without calling back into Python code.
+
+        """
+        objs = objs if isinstance(objs, (list, tuple)) else list(objs)
+        try:
+            return map(self._fast, objs)
+        except (AttributeError, KeyError, TypeError):
+            return map(self, objs)
+
+    def _interpret(self, obj):
         for key_or_idx in self._items:
             if isinstance(key_or_idx, int):
                 obj = obj[key_or_idx]
@@ -85,18 +125,74 @@ class KeypathGetter(object):
 
     @staticmethod
     def _parse_keypath(keypath):
-        items = []
-        for item in re.split(r'\.|\[|\]\.?', keypath):
-            if item == '':
-                continue
-            try:
-                items.append(int(item))
-            except ValueError:  # it a string
-                if not re.match(r'^\w+$', item):
-                    template = 'invalid keypath: {value}'
-                    raise InvalidArgumentError('keypath', keypath, template)
-                items.append(item)
-        return items
+        return list(parse_keypath(keypath))
+
+
+class MultiKeypathGetter(object):
+    """Callable that fetches the values at several keypaths as a tuple."""
+    __slots__ = ('_getters', )
+
+    def __init__(self, *keypaths):
+        self._getters = tuple(KeypathGetter(keypath) for keypath in keypaths)
+
+    def __call__(self, obj):
+        return tuple([getter(obj) for getter in self._getters])
+
+    def map(self, objs):
+        """Return the tuple of values for every object in `objs`."""
+        objs = objs if isinstance(objs, (list, tuple)) else list(objs)
+        return zip(*[getter.map(objs) for getter in self._getters]) \
+            if objs else []
+
+
+@lru_cache(maxsize=1024)
+def parse_keypath(keypath):
+    """Split `keypath` into a tuple of names and indexes (cached).
+
+    Examples
+    --------
+    >>> parse_keypath('entries[1].count')
+    ('entries', 1, 'count')
+    >>> parse_keypath('key.1')
+    ('key', 1)
+
+    """
+    items = []
+    for item in re.split(r'\.|\[|\]\.?', keypath):
+        if item == '':
+            continue
+        try:
+            items.append(int(item))
+        except ValueError:  # it a string
+            if not re.match(r'^\w+$', item):
+                template = 'invalid keypath: {value}'
+                raise InvalidArgumentError('keypath', keypath, template)
+            items.append(item)
+    return tuple(items)
+
+
+def _compile_keypath(items):
+    # consecutive names are merged into a single dotted attrgetter
+    getters = []
+    is_name = lambda item: isinstance(item, str)
+    for names, group in groupby(items, key=is_name):
+        if names:
+            getters.append(attrgetter('.'.join(group)))
+        else:
+            getters.extend(itemgetter(idx) for idx in group)
+    if not getters:
+        return lambda obj: obj
+    elif len(getters) == 1:
+        return getters[0]
+    elif len(getters) == 2:
+        first, second = getters
+        return lambda obj: second(first(obj))
+
+    def get(obj):
+        for getter in getters:
+            obj = getter(obj)
+        return obj
+    return get
 
 
 # TODO add docstring
@@ -209,13 +305,25 @@ def getqualifier(instance_or_cls, prefix='', suffix=''):
 getqual = getqualifier
 
 
-# TODO add docstring
-# TODO add tests
+@lru_cache(maxsize=256)
 def getter(*items):
+    """Return a callable fetching the given keypath(s) from an object.
+
+    With more than one keypath, the callable returns a tuple of values.
+    Getters are cached, so calling this repeatedly with the same keypaths
+    is cheap.
+
+    Examples
+    --------
+    >>> getter('real')(2)
+    2
+    >>> getter('real', 'imag')(3j)
+    (0.0, 3.0)
+
+    """
     if len(items) == 1:
         return KeypathGetter(items[0])
-    getters = tuple(map(KeypathGetter, items))
-    return lambda obj: tuple(getter(obj) for getter in getters)
+    return MultiKeypathGetter(*items)
 
 
 def isiterable(obj, classinfo=None, of_type=None):
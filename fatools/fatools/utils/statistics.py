@@ -99,7 +99,7 @@ A single exception is defined: StatisticsError is a subclass of ValueError.
 __all__ = ['StatisticsError',
            'pstdev', 'pvariance', 'stdev', 'variance',
            'median',  'median_low', 'median_high', 'median_grouped',
-           'mean', 'mode']
+           'mean', 'mode', 'RunningStats']
 
 
 import collections
@@ -108,6 +108,8 @@ import math
 from fractions import Fraction
 from decimal import Decimal
 
+import numpy as np
+
 
 # === Exceptions ===
 
@@ -256,6 +258,23 @@ def _decimal_to_ratio(d):
     return (num, den)
 
 
+def _is_float_data(data):
+    # Float data (NumPy float arrays or sequences of floats) take the fast
+    # path: exact Fraction arithmetic is orders of magnitude slower and the
+    # result is rounded to a float anyway.
+    if isinstance(data, np.ndarray):
+        return data.dtype.kind == 'f'
+    return all(isinstance(x, float) for x in data)
+
+
+def _float_sum(data):
+    # math.fsum is correctly rounded like _sum; NumPy arrays use NumPy's
+    # pairwise summation instead of iterating over the values.
+    if isinstance(data, np.ndarray):
+        return float(np.sum(data, dtype=np.float64))
+    return math.fsum(data)
+
+
 def _counts(data):
     # Generate a table of sorted (value, frequency) pairs.
     table = collections.Counter(iter(data)).most_common()
@@ -286,6 +305,9 @@ def mean(data):
     >>> mean([D("0.5"), D("0.75"), D("0.625"), D("0.375")])
     Decimal('0.5625')
 
+    Float data (a sequence of floats or a NumPy float array) is summed with
+    ``math.fsum`` or NumPy instead of exact fractions.
+
     If ``data`` is empty, StatisticsError will be raised.
     """
     if iter(data) is data:
@@ -293,6 +315,8 @@ def mean(data):
     n = len(data)
     if n < 1:
         raise StatisticsError('mean requires at least one data point')
+    if _is_float_data(data):
+        return _float_sum(data)/n
     return _sum(data)/n
 
 
@@ -462,6 +486,12 @@ def _ss(data, c=None):
     """
     if c is None:
         c = mean(data)
+    if _is_float_data(data):
+        deviations = np.asarray(data, dtype=np.float64) - c
+        ss = float(np.dot(deviations, deviations))
+        ss -= float(deviations.sum())**2/len(data)
+        assert not ss < 0, 'negative sum of square deviations: %f' % ss
+        return ss
     ss = _sum((x-c)**2 for x in data)
     # The following sum should mathematically equal zero, but due to rounding
     # error may not.
@@ -595,3 +625,119 @@ def pstdev(data, mu=None):
         return var.sqrt()
     except AttributeError:
         return math.sqrt(var)
+
+
+# === Streaming statistics ===
+
+class RunningStats(object):
+    """Running mean, variance, minimum and maximum of a stream of values.
+
+    Values are consumed one at a time (or one array at a time) with
+    Welford's algorithm, so memory does not depend on the number of values
+    and the variance does not suffer from the cancellation of the naive
+    sum of squares. Accumulators filled by parallel workers can be
+    combined with `merge`.
+
+    >>> stats = RunningStats()
+    >>> stats.update([2.75, 1.75, 1.25, 0.25, 0.5, 1.25, 3.5])
+    RunningStats(n=7, mean=1.6071428571428572, min=0.25, max=3.5)
+    >>> stats.variance  #doctest: +ELLIPSIS
+    1.37202380952...
+
+    """
+    __slots__ = ('_n', '_mean', '_m2', '_min', '_max')
+
+    def __init__(self, data=()):
+        self._n = 0
+        self._mean = self._m2 = 0.
+        self._min = self._max = None
+        self.update(data)
+
+    def __len__(self):
+        return self._n
+
+    def __repr__(self):
+        return '{}(n={}, mean={!r}, min={!r}, max={!r})'.format(
+            self.__class__.__name__, self._n, self._mean, self._min,
+            self._max)
+
+    n = property(lambda self: self._n)
+    min = property(lambda self: self._min)
+    max = property(lambda self: self._max)
+
+    @property
+    def mean(self):
+        if self._n < 1:
+            raise StatisticsError('mean requires at least one data point')
+        return self._mean
+
+    @property
+    def pvariance(self):
+        if self._n < 1:
+            raise StatisticsError('pvariance requires at least one data '
+                                  'point')
+        return self._m2/self._n
+
+    @property
+    def variance(self):
+        if self._n < 2:
+            raise StatisticsError('variance requires at least two data '
+                                  'points')
+        return self._m2/(self._n - 1)
+
+    pstdev = property(lambda self: math.sqrt(self.pvariance))
+    stdev = property(lambda self: math.sqrt(self.variance))
+
+    def add(self, x):
+        """Add a single value."""
+        x = float(x)
+        self._n += 1
+        delta = x - self._mean
+        self._mean += delta/self._n
+        self._m2 += delta*(x - self._mean)
+        if self._min is None or x < self._min:
+            self._min = x
+        if self._max is None or x > self._max:
+            self._max = x
+        return self
+
+    def merge(self, other):
+        """Add the statistics of another accumulator to this one."""
+        return self._combine(other._n, other._mean, other._m2, other._min,
+                             other._max)
+
+    def update(self, data):
+        """Add many values.
+
+        NumPy arrays (and sequences of values) are summarized with NumPy
+        and combined in one step; other iterables are consumed one value at
+        a time.
+
+        """
+        if not isinstance(data, (np.ndarray, list, tuple)):
+            for x in data:
+                self.add(x)
+            return self
+        values = np.asarray(data, dtype=np.float64).ravel()
+        if not len(values):
+            return self
+        batch_mean = values.mean()
+        deviations = values - batch_mean
+        return self._combine(len(values), float(batch_mean),
+                             float(np.dot(deviations, deviations)),
+                             float(values.min()), float(values.max()))
+
+    def _combine(self, n, mean, m2, min_value, max_value):
+        # parallel variant of Welford's algorithm (Chan et al.)
+        if not n:
+            return self
+        total = self._n + n
+        delta = mean - self._mean
+        self._mean += delta*n/total
+        self._m2 += m2 + delta**2*self._n*n/total
+        self._n = total
+        if self._min is None or min_value < self._min:
+            self._min = min_value
+        if self._max is None or max_value > self._max:
+            self._max = max_value
+        return self